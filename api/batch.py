@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, NamedTuple, Optional
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+# Incremental decoding of /v1/process:batch bodies. The body is either NDJSON (one envelope
+# per line) or a single JSON array, told apart by its first non-whitespace byte. Items are
+# produced as each body chunk arrives, so memory is bounded by the largest item, not the body.
+
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+class BatchItem(NamedTuple):
+    """One decoded item: value is the parsed JSON, or error says why it could not be parsed."""
+
+    value: Any = None
+    error: Optional[str] = None
+
+
+class BatchFormatError(ValueError):
+    """The body cannot be decoded any further; items already produced stand."""
+
+
+async def _next(it: AsyncIterator[bytes]) -> Optional[bytes]:
+    try:
+        return await it.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def iter_batch_items(chunks: AsyncIterator[bytes], max_item_bytes: int) -> AsyncIterator[list[BatchItem]]:
+    """
+    Yield the items decoded from each received chunk (possibly an empty list).
+
+    A malformed or oversized NDJSON line becomes an error item and decoding resumes at the next
+    line. A JSON array has no such resync point, so a malformed or oversized element raises
+    BatchFormatError.
+    """
+    it = chunks.__aiter__()
+    head = b""
+    while not head.strip():
+        chunk = await _next(it)
+        if chunk is None:
+            return
+        head += chunk
+    decode = _iter_json_array if head.lstrip()[:1] == b"[" else _iter_ndjson
+    async for items in decode(head, it, max_item_bytes):
+        yield items
+
+
+def _ndjson_item(line: bytes) -> BatchItem:
+    try:
+        return BatchItem(json.loads(line))
+    except ValueError as exc:
+        return BatchItem(error=f"invalid JSON: {exc}")
+
+
+async def _iter_ndjson(head: bytes, it: AsyncIterator[bytes], max_item_bytes: int) -> AsyncIterator[list[BatchItem]]:
+    too_large = BatchItem(error=f"item exceeds {max_item_bytes} bytes")
+    buf = b""
+    skipping = False  # inside an oversized line that was already reported
+    chunk: Optional[bytes] = head
+    while chunk is not None:
+        items: list[BatchItem] = []
+        buf += chunk
+        start = 0
+        nl = buf.find(b"\n")
+        while nl >= 0:
+            line = buf[start:nl]
+            if skipping:
+                skipping = False
+            elif len(line) > max_item_bytes:
+                items.append(too_large)
+            elif line.strip():
+                items.append(_ndjson_item(line))
+            start = nl + 1
+            nl = buf.find(b"\n", start)
+        buf = buf[start:]
+        if len(buf) > max_item_bytes:
+            if not skipping:
+                items.append(too_large)
+            skipping, buf = True, b""
+        yield items
+        chunk = await _next(it)
+    if buf.strip() and not skipping:
+        yield [_ndjson_item(buf)]
+
+
+async def _iter_json_array(
+    head: bytes, it: AsyncIterator[bytes], max_item_bytes: int
+) -> AsyncIterator[list[BatchItem]]:
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buf = text.decode(head)
+    pos = buf.index("[") + 1
+    expect_value = True  # after "[" or ","; otherwise after a value, expecting "," or "]"
+    first = True
+    eof = False
+    while True:
+        items: list[BatchItem] = []
+        while True:
+            pos = _WS.match(buf, pos).end()  # type: ignore[union-attr]
+            if pos == len(buf):
+                break
+            ch = buf[pos]
+            if not expect_value or (first and ch == "]"):
+                if ch == "]":
+                    if items:
+                        yield items
+                    return
+                if ch != "," or first:
+                    raise BatchFormatError(f"expected ',' or ']' at offset {pos}")
+                pos += 1
+                expect_value = True
+                continue
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as exc:
+                if eof:
+                    raise BatchFormatError(f"invalid JSON array element: {exc.msg}") from None
+                if len(buf) - pos > max_item_bytes:
+                    raise BatchFormatError(f"array element exceeds {max_item_bytes} bytes") from None
+                break  # most likely cut off by the chunk boundary
+            if end == len(buf) and not eof:
+                break  # a number may continue in the next chunk
+            items.append(BatchItem(value))
+            pos, expect_value, first = end, False, False
+        yield items
+        if eof:
+            raise BatchFormatError("unexpected end of JSON array")
+        chunk = await _next(it)
+        buf = buf[pos:] + (text.decode(b"", final=True) if chunk is None else text.decode(chunk))
+        pos = 0
+        eof = chunk is None
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator consumes the request body as it goes.
+
+    The stock response listens for http.disconnect on receive() while streaming, which would
+    steal the request body messages from the iterator; here the iterator is the only reader
+    and a disconnect surfaces through request.stream() instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
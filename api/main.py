@@ -1,18 +1,51 @@
 ﻿from __future__ import annotations
 
+import json
 import os
+import threading
+import time
 import uuid
-from typing import Any, Optional
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from typing import Any, AsyncIterator, Optional, Sequence, Union
 
-from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi import Body, FastAPI, Header, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
-from audit_log import AuditPolicy
+from audit_log import (
+    AsyncAuditSink,
+    AuditPolicy,
+    AuditQueueFull,
+    AuditSink,
+    AuditWriterConfig,
+    BackpressureMode,
+    ChainPolicy,
+    FsyncPolicy,
+    RotationPolicy,
+    build_audit_event,
+    open_audit_sink,
+)
 from contracts.schemas import ArtifactEnvelope, JurisdictionTags, ProvenanceRef
 from delivery_action import DeliveryPolicy
-from orchestrator import OrchestratorPolicy, process_envelope
+from orchestrator import (
+    DecisionCache,
+    LatencyHistogram,
+    OrchestratorPolicy,
+    OrchestratorResult,
+    PipelineMetrics,
+    add_stage_hook,
+    process_envelope,
+    process_envelopes,
+    remove_stage_hook,
+)
+from orchestrator.metrics import render_histogram
 from sovereignty_compliance import SovereigntyPolicy
 
+from .batch import BatchFormatError, BodyStreamingResponse, iter_batch_items
+from .registry import PolicyRegistry
+
 
 class ProcessOptions(BaseModel):
     audit_log_path: Optional[str] = None
@@ -22,6 +55,8 @@ class ProcessOptions(BaseModel):
 
 class ProcessRequest(BaseModel):
     policy: dict[str, Any] = Field(default_factory=dict)
+    # Content hash returned by PUT /v1/policies; takes precedence over an inline policy.
+    policy_id: Optional[str] = None
     envelope: dict[str, Any] = Field(default_factory=dict)
     options: ProcessOptions = Field(default_factory=ProcessOptions)
 
@@ -33,7 +68,48 @@ def _bool_env(name: str, default: bool = False) -> bool:
     return v.strip().lower() in ("1", "true", "yes", "y", "on")
 
 
-def _build_policy(policy_raw: dict[str, Any], options: ProcessOptions) -> OrchestratorPolicy:
+_POLICY_LIST_FIELDS = {
+    "layer4": (
+        "allowed_jurisdictions",
+        "allowed_residency_classes",
+        "blocked_export_control_flags",
+        "blocked_sanctions_flags",
+    ),
+    "layer5": (
+        "blocked_export_control_flags",
+        "blocked_sanctions_flags",
+        "quarantine_export_control_flags",
+        "quarantine_sanctions_flags",
+    ),
+    "layer6": ("redact_payload_keys", "redact_payload_paths"),
+}
+
+
+def _validate_policy_raw(policy_raw: dict[str, Any]) -> list[str]:
+    errors: list[str] = []
+    for layer, names in _POLICY_LIST_FIELDS.items():
+        section = policy_raw.get(layer, {})
+        if not isinstance(section, dict):
+            errors.append(f"{layer}: expected object")
+            continue
+        for name in names:
+            value = section.get(name, [])
+            if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                errors.append(f"{layer}.{name}: expected list of strings")
+    layer6 = policy_raw.get("layer6", {})
+    max_snapshot_bytes = layer6.get("max_snapshot_bytes") if isinstance(layer6, dict) else None
+    if max_snapshot_bytes is not None and (type(max_snapshot_bytes) is not int or max_snapshot_bytes < 0):
+        errors.append("layer6.max_snapshot_bytes: expected non-negative integer")
+    payload_store = layer6.get("payload_store") if isinstance(layer6, dict) else None
+    if payload_store is not None and not isinstance(payload_store, str):
+        errors.append("layer6.payload_store: expected string")
+    audit_log_path = policy_raw.get("audit_log_path")
+    if audit_log_path is not None and not isinstance(audit_log_path, str):
+        errors.append("audit_log_path: expected string")
+    return errors
+
+
+def _parse_policy(policy_raw: dict[str, Any]) -> OrchestratorPolicy:
     layer4_raw = policy_raw.get("layer4", {})
     layer5_raw = policy_raw.get("layer5", {})
     layer6_raw = policy_raw.get("layer6", {})
@@ -54,9 +130,21 @@ def _build_policy(policy_raw: dict[str, Any], options: ProcessOptions) -> Orches
     layer6 = AuditPolicy(
         include_payload=bool(layer6_raw.get("include_payload", False)),
         redact_payload_keys=tuple(layer6_raw.get("redact_payload_keys", [])),
+        redact_payload_paths=tuple(layer6_raw.get("redact_payload_paths", [])),
+        max_snapshot_bytes=layer6_raw.get("max_snapshot_bytes"),
+        payload_store=layer6_raw.get("payload_store"),
     )
 
-    audit_log_path = options.audit_log_path if options.audit_log_path is not None else policy_raw.get("audit_log_path")
+    return OrchestratorPolicy(
+        layer4=layer4,
+        layer5=layer5,
+        layer6=layer6,
+        audit_log_path=policy_raw.get("audit_log_path"),
+    )
+
+
+def _apply_options(policy: OrchestratorPolicy, options: ProcessOptions) -> OrchestratorPolicy:
+    audit_log_path = options.audit_log_path if options.audit_log_path is not None else policy.audit_log_path
 
     # allow env overrides too
     env_audit = os.getenv("FUSIONINTEL_AUDIT_LOG_PATH")
@@ -66,16 +154,19 @@ def _build_policy(policy_raw: dict[str, Any], options: ProcessOptions) -> Orches
     enforce_layer4 = bool(options.enforce_layer4) or _bool_env("FUSIONINTEL_ENFORCE_L4", False)
     enforce_layer5 = bool(options.enforce_layer5) or _bool_env("FUSIONINTEL_ENFORCE_L5", False)
 
-    return OrchestratorPolicy(
-        layer4=layer4,
-        layer5=layer5,
-        layer6=layer6,
+    return replace(
+        policy,
         audit_log_path=audit_log_path,
         enforce_layer4=enforce_layer4,
         enforce_layer5=enforce_layer5,
+        decision_cache=_decision_cache,
     )
 
 
+def _build_policy(policy_raw: dict[str, Any], options: ProcessOptions) -> OrchestratorPolicy:
+    return _apply_options(_parse_policy(policy_raw), options)
+
+
 def _build_envelope(envelope_raw: dict[str, Any]) -> ArtifactEnvelope:
     tags_raw = envelope_raw.get("jurisdiction_tags", {}) or {}
     return ArtifactEnvelope(
@@ -94,15 +185,223 @@ def _build_envelope(envelope_raw: dict[str, Any]) -> ArtifactEnvelope:
     )
 
 
-app = FastAPI(title="FusionIntel Core API", version="0.2.2")
+_ENVELOPE_STR_FIELDS = ("artifact_id", "artifact_type", "producer_layer")
+_TAG_STR_FIELDS = ("jurisdiction", "residency_class")
+_TAG_LIST_FIELDS = ("export_control_flags", "sanctions_flags")
+
+
+def _validate_envelope_raw(envelope_raw: Any) -> list[str]:
+    # Only the fields the layers read; payload and metadata are passed through unwalked.
+    if not isinstance(envelope_raw, dict):
+        return ["envelope: expected object"]
+    errors = [
+        f"envelope.{name}: expected string"
+        for name in _ENVELOPE_STR_FIELDS
+        if not isinstance(envelope_raw.get(name, ""), str)
+    ]
+    tags_raw = envelope_raw.get("jurisdiction_tags") or {}
+    if not isinstance(tags_raw, dict):
+        return errors + ["envelope.jurisdiction_tags: expected object"]
+    for name in _TAG_STR_FIELDS:
+        if not isinstance(tags_raw.get(name, ""), str):
+            errors.append(f"envelope.jurisdiction_tags.{name}: expected string")
+    for name in _TAG_LIST_FIELDS:
+        value = tags_raw.get(name, [])
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            errors.append(f"envelope.jurisdiction_tags.{name}: expected list of strings")
+    return errors
+
+
+def _validate_process_raw(req: Any) -> list[str]:
+    """Targeted checks standing in for ProcessRequest validation on /v1/process:fast."""
+    if not isinstance(req, dict):
+        return ["body: expected object"]
+    errors: list[str] = []
+    policy_id = req.get("policy_id")
+    if policy_id is not None and not isinstance(policy_id, str):
+        errors.append("policy_id: expected string")
+    policy_raw = req.get("policy", {})
+    if not isinstance(policy_raw, dict):
+        errors.append("policy: expected object")
+    elif policy_id is None:
+        errors.extend(f"policy.{e}" for e in _validate_policy_raw(policy_raw))
+    options = req.get("options", {})
+    if not isinstance(options, dict):
+        errors.append("options: expected object")
+    else:
+        if not isinstance(options.get("audit_log_path", ""), (str, type(None))):
+            errors.append("options.audit_log_path: expected string")
+        for name in ("enforce_layer4", "enforce_layer5"):
+            if not isinstance(options.get(name, False), bool):
+                errors.append(f"options.{name}: expected boolean")
+    return errors + _validate_envelope_raw(req.get("envelope", {}))
+
+
+def _batch_envelope(value: Any) -> Union[ArtifactEnvelope, str]:
+    """ArtifactEnvelope for one batch item, or the reason it is not one."""
+    if not isinstance(value, dict):
+        return "expected a JSON object"
+    errors = _validate_envelope_raw(value)
+    if errors:
+        return "invalid envelope: " + "; ".join(errors)
+    return _build_envelope(value)
+
+
+def _result_body(result: OrchestratorResult) -> dict[str, Any]:
+    return {
+        "layer4": {"allow": result.layer4.allow, "reasons": list(result.layer4.reasons)},
+        "layer5": {"allow": result.layer5.allow, "action": result.layer5.action.value, "reasons": list(result.layer5.reasons)},
+        "audit_written": result.audit_written,
+        "audit_reasons": list(result.audit_reasons),
+        "enforcement_error": result.enforcement_error,
+    }
+
+
+def _audit_rotation() -> Optional[RotationPolicy]:
+    max_bytes = os.getenv("FUSIONINTEL_AUDIT_ROTATE_BYTES", "")
+    interval_s = os.getenv("FUSIONINTEL_AUDIT_ROTATE_INTERVAL_S", "")
+    if not max_bytes and not interval_s:
+        return None
+    return RotationPolicy(
+        max_bytes=int(max_bytes) if max_bytes else None,
+        interval_s=float(interval_s) if interval_s else None,
+        compression=os.getenv("FUSIONINTEL_AUDIT_COMPRESSION") or None,
+    )
+
+
+def _audit_chain() -> Optional[ChainPolicy]:
+    key = os.getenv("FUSIONINTEL_AUDIT_CHAIN_KEY", "")
+    if not key and not _bool_env("FUSIONINTEL_AUDIT_CHAIN", False):
+        return None
+    return ChainPolicy(
+        checkpoint_every=int(os.getenv("FUSIONINTEL_AUDIT_CHAIN_CHECKPOINT", "1024")),
+        key=key.encode("utf-8") or None,
+    )
+
+
+def _audit_writer_config() -> AuditWriterConfig:
+    latency_ms = os.getenv("FUSIONINTEL_AUDIT_MAX_LATENCY_MS", "")
+    return AuditWriterConfig(
+        max_latency_s=(float(latency_ms) / 1000.0) if latency_ms else AuditWriterConfig.max_latency_s,
+        fsync=FsyncPolicy(os.getenv("FUSIONINTEL_AUDIT_FSYNC", FsyncPolicy.NONE.value)),
+        rotation=_audit_rotation(),
+        index=_bool_env("FUSIONINTEL_AUDIT_INDEX", False),
+        # one file per uvicorn/gunicorn worker process; merge with `python -m audit_log.merge`
+        per_worker=_bool_env("FUSIONINTEL_AUDIT_PER_WORKER", False),
+        chain=_audit_chain(),
+        rollups=_bool_env("FUSIONINTEL_AUDIT_ROLLUPS", False),
+    )
+
+
+# One shared writer for the deployment-wide audit path, reused across requests and closed on
+# shutdown. Paths sent by clients (options/policy audit_log_path) get no persistent writer:
+# each would hold file handles, sidecars and a flush timer for the life of the process.
+_audit_writers: dict[str, AuditSink] = {}
+_audit_writers_lock = threading.Lock()
+
+
+def _get_audit_writer(path: Optional[str]) -> Optional[AuditSink]:
+    if not path or path != os.getenv("FUSIONINTEL_AUDIT_LOG_PATH"):
+        return None
+    with _audit_writers_lock:
+        writer = _audit_writers.get(path)
+        if writer is None or writer.closed:
+            # FUSIONINTEL_AUDIT_SINK=jsonl|sqlite; a "sqlite:" path selects SQLite on its own.
+            writer = open_audit_sink(path, _audit_writer_config(), kind=os.getenv("FUSIONINTEL_AUDIT_SINK") or None)
+            _audit_writers[path] = writer
+        return writer
+
+
+def _close_audit_writers() -> None:
+    with _audit_writers_lock:
+        for writer in _audit_writers.values():
+            writer.close()
+        _audit_writers.clear()
+
+
+def _build_decision_cache() -> Optional[DecisionCache]:
+    size = int(os.getenv("FUSIONINTEL_DECISION_CACHE_SIZE", "0") or 0)
+    return DecisionCache(size) if size > 0 else None
+
+
+_decision_cache = _build_decision_cache()
+
+# Process-local metrics for /metrics (FUSIONINTEL_METRICS=0 disables them and the endpoint).
+_metrics_enabled = _bool_env("FUSIONINTEL_METRICS", True)
+_pipeline_metrics = PipelineMetrics()
+_request_latency: dict[tuple[str, str, str], LatencyHistogram] = {}
+_request_latency_lock = threading.Lock()
+
+
+def _observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    key = (method, route, str(status))
+    hist = _request_latency.get(key)
+    if hist is None:
+        with _request_latency_lock:
+            hist = _request_latency.setdefault(key, LatencyHistogram())
+    hist.observe(seconds)
+
+
+_policy_registry = PolicyRegistry(maxsize=int(os.getenv("FUSIONINTEL_POLICY_REGISTRY_SIZE", "256")))
+
+# /v1/process:batch: items evaluated per threadpool hop, and the largest single item accepted.
+_batch_chunk_size = int(os.getenv("FUSIONINTEL_BATCH_CHUNK_SIZE", "256"))
+_batch_max_item_bytes = int(os.getenv("FUSIONINTEL_BATCH_MAX_ITEM_BYTES", str(8 * 1024 * 1024)))
+
+
+def _build_audit_sink() -> Optional[AsyncAuditSink]:
+    # Async audit is opt-in and bound to the deployment-wide audit path.
+    path = os.getenv("FUSIONINTEL_AUDIT_LOG_PATH")
+    if not path or not _bool_env("FUSIONINTEL_AUDIT_ASYNC", False):
+        return None
+    writer = _get_audit_writer(path)
+    assert writer is not None
+    return AsyncAuditSink(
+        writer,
+        max_queue=int(os.getenv("FUSIONINTEL_AUDIT_QUEUE_SIZE", "10000")),
+        max_batch=int(os.getenv("FUSIONINTEL_AUDIT_BATCH_SIZE", "256")),
+        backpressure=BackpressureMode(os.getenv("FUSIONINTEL_AUDIT_BACKPRESSURE", BackpressureMode.BLOCK.value)),
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Open the deployment audit writer up front: a bad FUSIONINTEL_AUDIT_* setting (or one the
+    # selected sink does not support) fails startup instead of every request.
+    _get_audit_writer(os.getenv("FUSIONINTEL_AUDIT_LOG_PATH"))
+    sink = _build_audit_sink()
+    app.state.audit_sink = sink
+    if sink is not None:
+        await sink.start()
+    if _metrics_enabled:
+        # stage hooks are process-wide; only a running app should feed its /metrics
+        add_stage_hook(_pipeline_metrics)
+    try:
+        yield
+    finally:
+        remove_stage_hook(_pipeline_metrics)
+        if sink is not None:
+            await sink.stop()
+        app.state.audit_sink = None
+        _close_audit_writers()
+
+
+app = FastAPI(title="FusionIntel Core API", version="0.2.2", lifespan=lifespan)
 
 
 @app.middleware("http")
 async def add_request_id(request: Request, call_next):
     rid = request.headers.get("x-request-id") or str(uuid.uuid4())
     request.state.request_id = rid
+    t0 = time.perf_counter()
     response = await call_next(request)
+    elapsed = time.perf_counter() - t0
     response.headers["x-request-id"] = rid
+    if _metrics_enabled:
+        # route templates, not raw paths, keep the label set bounded
+        route = getattr(request.scope.get("route"), "path", "<unmatched>")
+        _observe_request(request.method, route, response.status_code, elapsed)
+        response.headers["server-timing"] = f"app;dur={elapsed * 1000.0:.3f}"
     return response
 
 
@@ -120,37 +419,214 @@ def healthz() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics(request: Request) -> PlainTextResponse:
+    if not _metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics disabled")
+    with _request_latency_lock:
+        requests = sorted(_request_latency.items())
+    lines = _pipeline_metrics.render()
+    lines += render_histogram(
+        "fusionintel_http_request_seconds",
+        [((("method", m), ("route", r), ("status", c)), hist) for (m, r, c), hist in requests],
+        "HTTP request latency measured by the x-request-id middleware",
+    )
+    sink: Optional[AsyncAuditSink] = getattr(request.app.state, "audit_sink", None)
+    if sink is not None:
+        lines += [
+            "# HELP fusionintel_audit_failed_events_total Audit events dropped because their batch write failed",
+            "# TYPE fusionintel_audit_failed_events_total counter",
+            f"fusionintel_audit_failed_events_total {sink.failed_events}",
+            "# HELP fusionintel_audit_rejected_events_total Audit events refused because the queue was full",
+            "# TYPE fusionintel_audit_rejected_events_total counter",
+            f"fusionintel_audit_rejected_events_total {sink.rejected_events}",
+            "# HELP fusionintel_audit_queue_depth Audit events waiting in the background queue",
+            "# TYPE fusionintel_audit_queue_depth gauge",
+            f"fusionintel_audit_queue_depth {sink.qsize()}",
+        ]
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _run_pipeline(envelope: ArtifactEnvelope, policy: OrchestratorPolicy) -> OrchestratorResult:
+    return process_envelope(
+        envelope=envelope,
+        policy=policy,
+        audit_log_path=policy.audit_log_path,
+        enforce_layer4=policy.enforce_layer4,
+        enforce_layer5=policy.enforce_layer5,
+        raise_on_deny=False,
+    )
+
+
+async def _run_pipeline_with_sink(
+    envelope: ArtifactEnvelope, policy: OrchestratorPolicy, sink: AsyncAuditSink
+) -> OrchestratorResult:
+    # Evaluate without inline audit, then hand the event to the background sink.
+    result = _run_pipeline(envelope, replace(policy, audit_log_path=None, audit_writer=None))
+    event = build_audit_event(envelope, result.layer4, result.layer5, policy.layer6)
+    try:
+        await sink.submit(event)
+    except AuditQueueFull:
+        raise HTTPException(status_code=503, detail="Audit queue full") from None
+    return replace(result, audit_written=True, audit_reasons=("audit_enqueued",))
+
+
+@app.put("/v1/policies")
+def put_policy(policy_raw: dict[str, Any] = Body(...), x_api_key: Optional[str] = Header(default=None)) -> dict[str, Any]:
+    _require_api_key(x_api_key)
+
+    errors = _validate_policy_raw(policy_raw)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    policy = _parse_policy(policy_raw)
+    policy_id = _policy_registry.put(policy)
+    return {"policy_id": policy_id, "fingerprint": policy.fingerprint()}
+
+
+async def _process_one(
+    request: Request,
+    policy_id: Optional[str],
+    policy_raw: dict[str, Any],
+    options: ProcessOptions,
+    envelope: ArtifactEnvelope,
+    inline: bool = False,
+) -> OrchestratorResult:
+    if policy_id is not None:
+        registered = _policy_registry.get(policy_id)
+        if registered is None:
+            raise HTTPException(status_code=404, detail="Unknown policy_id")
+        policy = _apply_options(registered, options)
+    else:
+        policy = _build_policy(policy_raw, options)
+
+    sink: Optional[AsyncAuditSink] = getattr(request.app.state, "audit_sink", None)
+    if sink is not None and sink.running and policy.audit_log_path == sink.writer.path:
+        return await _run_pipeline_with_sink(envelope, policy, sink)
+    writer = _get_audit_writer(policy.audit_log_path)
+    if inline and writer is None and not policy.audit_log_path:
+        # nothing to write: evaluation is microseconds, cheaper than a threadpool hop
+        return _run_pipeline(envelope, policy)
+    return await run_in_threadpool(_run_pipeline, envelope, replace(policy, audit_writer=writer))
+
+
 @app.post("/v1/process")
-def process(request: Request, req: ProcessRequest, x_api_key: Optional[str] = Header(default=None)) -> dict[str, Any]:
+async def process(request: Request, req: ProcessRequest, x_api_key: Optional[str] = Header(default=None)) -> dict[str, Any]:
     _require_api_key(x_api_key)
+    result = await _process_one(request, req.policy_id, req.policy, req.options, _build_envelope(req.envelope))
+    return {"request_id": getattr(request.state, "request_id", None), **_result_body(result)}
 
-    policy = _build_policy(req.policy, req.options)
-    envelope = _build_envelope(req.envelope)
 
-    enforcement_error = False
+@app.post("/v1/process:fast")
+async def process_fast(request: Request, x_api_key: Optional[str] = Header(default=None)) -> Response:
+    """
+    /v1/process without pydantic: same request and response bodies, but the raw body is decoded
+    once and only the fields the layers read are validated, so payload and metadata are never
+    walked. The response is serialised straight to bytes.
+    """
+    _require_api_key(x_api_key)
     try:
-        result = process_envelope(
-            envelope=envelope,
-            policy=policy,
-            audit_log_path=policy.audit_log_path,
-            enforce_layer4=policy.enforce_layer4,
-            enforce_layer5=policy.enforce_layer5,
-        )
-    except PermissionError:
-        enforcement_error = True
-        result = process_envelope(
-            envelope=envelope,
-            policy=policy,
-            audit_log_path=policy.audit_log_path,
-            enforce_layer4=False,
-            enforce_layer5=False,
-        )
+        req = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=422, detail=["body: invalid JSON"]) from None
+    errors = _validate_process_raw(req)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    options = ProcessOptions.model_construct(**req.get("options", {}))
+    envelope = _build_envelope(req.get("envelope", {}))
+    result = await _process_one(request, req.get("policy_id"), req.get("policy", {}), options, envelope, inline=True)
+    body = {"request_id": getattr(request.state, "request_id", None), **_result_body(result)}
+    return Response(content=json.dumps(body, separators=(",", ":")).encode("utf-8"), media_type="application/json")
 
-    return {
-        "request_id": getattr(request.state, "request_id", None),
-        "layer4": {"allow": result.layer4.allow, "reasons": list(result.layer4.reasons)},
-        "layer5": {"allow": result.layer5.allow, "action": result.layer5.action.value, "reasons": list(result.layer5.reasons)},
-        "audit_written": result.audit_written,
-        "audit_reasons": list(result.audit_reasons),
-        "enforcement_error": enforcement_error,
-    }
+
+def _process_chunk(envelopes: Sequence[ArtifactEnvelope], policy: OrchestratorPolicy) -> list[Any]:
+    # One compiled evaluator per chunk; an envelope that raises is recorded and the rest resume.
+    out: list[Any] = []
+    while len(out) < len(envelopes):
+        try:
+            for result in process_envelopes(envelopes[len(out):], policy, raise_on_deny=False):
+                out.append(result)
+        except Exception as exc:  # noqa: BLE001 - isolated to this item
+            out.append(exc)
+    return out
+
+
+def _batch_line(index: int, outcome: Union[OrchestratorResult, str]) -> bytes:
+    body = {"index": index, "error": outcome} if isinstance(outcome, str) else {"index": index, **_result_body(outcome)}
+    return json.dumps(body, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+@app.post("/v1/process:batch")
+async def process_batch(
+    request: Request,
+    policy_id: str,
+    audit_log_path: Optional[str] = None,
+    enforce_layer4: bool = False,
+    enforce_layer5: bool = False,
+    x_api_key: Optional[str] = Header(default=None),
+) -> BodyStreamingResponse:
+    """
+    Evaluate a body of envelopes (NDJSON, or one JSON array) against a registered policy.
+
+    Results stream back as NDJSON in input order, one {"index": i, ...} line per item, while
+    the body is still being read. An item that cannot be decoded or evaluated gets an
+    {"index": i, "error": ...} line and the batch continues; a malformed JSON array ends the
+    stream with a final {"index": i, "error": ..., "fatal": true} line.
+    """
+    _require_api_key(x_api_key)
+    registered = _policy_registry.get(policy_id)
+    if registered is None:
+        raise HTTPException(status_code=404, detail="Unknown policy_id")
+    options = ProcessOptions(
+        audit_log_path=audit_log_path, enforce_layer4=enforce_layer4, enforce_layer5=enforce_layer5
+    )
+    policy = _apply_options(registered, options)
+    sink: Optional[AsyncAuditSink] = getattr(request.app.state, "audit_sink", None)
+    use_sink = sink is not None and sink.running and policy.audit_log_path == sink.writer.path
+    if not use_sink:
+        policy = replace(policy, audit_writer=_get_audit_writer(policy.audit_log_path))
+
+    async def evaluate(start: int, envelopes: list[Union[ArtifactEnvelope, str]]) -> bytes:
+        valid = [e for e in envelopes if not isinstance(e, str)]
+        if use_sink:
+            results: list[Any] = []
+            for envelope in valid:
+                try:
+                    results.append(await _run_pipeline_with_sink(envelope, policy, sink))  # type: ignore[arg-type]
+                except HTTPException as exc:
+                    results.append(str(exc.detail))
+                except Exception as exc:  # noqa: BLE001 - isolated to this item, as in _process_chunk
+                    results.append(exc)
+        else:
+            results = await run_in_threadpool(_process_chunk, valid, policy) if valid else []
+        ready = iter(results)
+        lines = []
+        for i, item in enumerate(envelopes, start):
+            outcome = item if isinstance(item, str) else next(ready)
+            if isinstance(outcome, Exception):
+                outcome = f"processing failed: {type(outcome).__name__}"
+            lines.append(_batch_line(i, outcome))
+        return b"".join(lines)
+
+    async def stream() -> AsyncIterator[bytes]:
+        index = 0
+        pending: list[Union[ArtifactEnvelope, str]] = []
+        try:
+            async for items in iter_batch_items(request.stream(), _batch_max_item_bytes):
+                for item in items:
+                    pending.append(_batch_envelope(item.value) if item.error is None else item.error)
+                    if len(pending) >= _batch_chunk_size:
+                        yield await evaluate(index, pending)
+                        index, pending = index + len(pending), []
+                # flush what this body chunk completed so results keep pace with a slow producer
+                if pending:
+                    yield await evaluate(index, pending)
+                    index, pending = index + len(pending), []
+        except BatchFormatError as exc:
+            if pending:
+                yield await evaluate(index, pending)
+                index += len(pending)
+            fatal = {"index": index, "error": str(exc), "fatal": True}
+            yield json.dumps(fatal, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    return BodyStreamingResponse(stream(), media_type="application/x-ndjson")
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Optional
+
+from orchestrator import OrchestratorPolicy, compile_layers
+
+
+def policy_content_hash(policy: OrchestratorPolicy) -> str:
+    doc = {
+        "decisions": policy.fingerprint(),
+        "layer6": {
+            "include_payload": bool(policy.layer6.include_payload),
+            "redact_payload_keys": [str(k) for k in policy.layer6.redact_payload_keys],
+            "redact_payload_paths": [str(p) for p in policy.layer6.redact_payload_paths],
+            "max_snapshot_bytes": policy.layer6.max_snapshot_bytes,
+            "payload_store": policy.layer6.payload_store,
+        },
+        "audit_log_path": policy.audit_log_path,
+    }
+    canonical = json.dumps(doc, sort_keys=True, separators=(",", ":"))
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PolicyRegistry:
+    """
+    In-memory, content-addressed store of parsed and compiled OrchestratorPolicies.
+
+    put() compiles the fused evaluator up front and stores it on the policy (its evaluator
+    field), so requests by policy_id never recompile, however much inline policies churn the
+    shared compile_layers cache. It returns the policy's content hash, which clients pass
+    back as policy_id; get() is then a dict lookup. Least recently used policies are
+    evicted past maxsize. Thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, OrchestratorPolicy] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, policy: OrchestratorPolicy) -> str:
+        policy = replace(policy, evaluator=compile_layers(policy.layer4, policy.layer5))
+        policy_id = policy_content_hash(policy)
+        with self._lock:
+            self._entries[policy_id] = policy
+            self._entries.move_to_end(policy_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return policy_id
+
+    def get(self, policy_id: str) -> Optional[OrchestratorPolicy]:
+        with self._lock:
+            policy = self._entries.get(policy_id)
+            if policy is not None:
+                self._entries.move_to_end(policy_id)
+            return policy
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -1,3 +1,58 @@
-from .audit import AuditEvent, AuditPolicy, build_audit_event, write_audit_event
+from .async_sink import AsyncAuditSink, AuditQueueFull, BackpressureMode
+from .audit import AuditEvent, AuditPolicy, build_audit_event, serialize_audit_event, write_audit_event
+from .chain import ChainPolicy, ChainReport, verify_audit_chain
+from .index import find_artifact, find_time_range, rebuild_index
+from .payload_store import PayloadResolver, PayloadStore, open_payload_store, rehydrate_records
+from .rollup import query_rollups, rebuild_rollups
+from .segments import (
+    RotationPolicy,
+    iter_audit_lines,
+    iter_audit_records,
+    iter_segment_paths,
+    worker_log_path,
+    worker_log_paths,
+)
+from .serializer import AuditEventSerializer, CoarseClock
+from .sink import AuditSink, open_audit_sink
+from .sqlite_sink import SqliteAuditSink, iter_sqlite_records
+from .writer import AuditObserver, AuditWriter, AuditWriterConfig, FsyncPolicy, open_audit_writer
 
-__all__ = ["AuditEvent", "AuditPolicy", "build_audit_event", "write_audit_event"]
+__all__ = [
+    "AsyncAuditSink",
+    "AuditEvent",
+    "AuditEventSerializer",
+    "AuditObserver",
+    "AuditPolicy",
+    "AuditQueueFull",
+    "AuditSink",
+    "AuditWriter",
+    "AuditWriterConfig",
+    "BackpressureMode",
+    "ChainPolicy",
+    "ChainReport",
+    "CoarseClock",
+    "FsyncPolicy",
+    "PayloadResolver",
+    "PayloadStore",
+    "RotationPolicy",
+    "SqliteAuditSink",
+    "build_audit_event",
+    "find_artifact",
+    "find_time_range",
+    "iter_audit_lines",
+    "iter_audit_records",
+    "iter_segment_paths",
+    "iter_sqlite_records",
+    "open_audit_sink",
+    "open_audit_writer",
+    "open_payload_store",
+    "query_rollups",
+    "rebuild_index",
+    "rebuild_rollups",
+    "rehydrate_records",
+    "serialize_audit_event",
+    "verify_audit_chain",
+    "worker_log_path",
+    "worker_log_paths",
+    "write_audit_event",
+]
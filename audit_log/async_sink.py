@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from enum import Enum
+from typing import Optional
+
+from .audit import AuditEvent
+from .sink import AuditSink
+
+logger = logging.getLogger(__name__)
+
+
+class BackpressureMode(str, Enum):
+    BLOCK = "block"
+    REJECT = "reject"
+
+
+class AuditQueueFull(RuntimeError):
+    pass
+
+
+class AsyncAuditSink:
+    """
+    Background asyncio audit sink.
+
+    Producers enqueue AuditEvents onto a bounded queue; a single consumer task drains it in
+    batches and hands each batch to the AuditSink on a worker thread, so request handlers
+    only pay for the enqueue. When the queue is full, BLOCK waits for room and REJECT raises
+    AuditQueueFull. stop() drains everything already enqueued before returning.
+    """
+
+    def __init__(
+        self,
+        writer: AuditSink,
+        *,
+        max_queue: int = 10_000,
+        max_batch: int = 256,
+        backpressure: BackpressureMode = BackpressureMode.BLOCK,
+    ) -> None:
+        self.writer = writer
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.backpressure = BackpressureMode(backpressure)
+        self._queue: Optional[asyncio.Queue[Optional[AuditEvent]]] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._stopping = False
+        # Events whose batch write raised (logged; the consumer keeps going so producers never
+        # wedge) and events refused by REJECT backpressure. Both are exported on /metrics.
+        self.failed_events = 0
+        self.rejected_events = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def qsize(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(self, event: AuditEvent) -> None:
+        if self._queue is None or self._stopping:
+            raise RuntimeError("audit sink is not running")
+        if self.backpressure == BackpressureMode.REJECT:
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.rejected_events += 1
+                raise AuditQueueFull(f"audit queue full ({self.max_queue})") from None
+        else:
+            await self._queue.put(event)
+
+    async def stop(self) -> None:
+        if self._queue is None or self._task is None:
+            return
+        self._stopping = True
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._queue = None
+        await asyncio.to_thread(self.writer.flush)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        done = False
+        while not done:
+            batch: list[AuditEvent] = []
+            item = await queue.get()
+            while True:
+                if item is None:
+                    done = True
+                else:
+                    batch.append(item)
+                if done or len(batch) >= self.max_batch or queue.empty():
+                    break
+                item = queue.get_nowait()
+
+            if batch:
+                try:
+                    await asyncio.to_thread(self._write_batch, batch)
+                except Exception:
+                    self.failed_events += len(batch)
+                    logger.exception(
+                        "audit batch write to %s failed; %d events dropped (%d total)",
+                        getattr(self.writer, "path", self.writer),
+                        len(batch),
+                        self.failed_events,
+                    )
+
+    def _write_batch(self, batch: list[AuditEvent]) -> None:
+        self.writer.write_many(batch)
+        self.writer.flush()
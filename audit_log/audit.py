@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Any, Iterable, Tuple
+from typing import Any, Iterable, Optional, Tuple
 
 from contracts.schemas import ArtifactEnvelope
 from sovereignty_compliance import GateDecision as Layer4Decision
 from delivery_action import DeliveryDecision as Layer5Decision
 
+from .payload_store import open_payload_store
+from .redaction import PayloadRedactor, compile_redactor
+from .serializer import AuditEventSerializer, Clock, utc_now_iso
+
 
 def _unique_sorted(items: Iterable[str]) -> Tuple[str, ...]:
     return tuple(sorted({s for s in items if isinstance(s, str) and s.strip()}))
@@ -17,6 +20,18 @@ def _unique_sorted(items: Iterable[str]) -> Tuple[str, ...]:
 class AuditPolicy:
     include_payload: bool = True
     redact_payload_keys: Tuple[str, ...] = ()
+    # Dotted paths into the payload; "*" matches any key or list element ("contacts.*.phone").
+    redact_payload_paths: Tuple[str, ...] = ()
+    # Snapshots serializing larger than this are replaced by {"_truncated": true, "_bytes": n}.
+    max_snapshot_bytes: Optional[int] = None
+    # Content-addressed payload store ("sqlite:<db>" or a directory); when set, audit lines
+    # carry payload_digest instead of the snapshot. See audit_log.payload_store.
+    payload_store: Optional[str] = None
+
+    def redactor(self) -> PayloadRedactor:
+        return compile_redactor(
+            tuple(self.redact_payload_keys), tuple(self.redact_payload_paths), self.max_snapshot_bytes
+        )
 
 
 @dataclass(frozen=True)
@@ -32,9 +47,10 @@ class AuditEvent:
     layer5_allow: bool
     layer5_reasons: Tuple[str, ...]
     payload_snapshot: dict[str, Any] | None
+    payload_digest: Optional[str] = None
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        d: dict[str, Any] = {
             "ts_utc": self.ts_utc,
             "artifact_id": self.artifact_id,
             "producer_layer": self.producer_layer,
@@ -44,6 +60,9 @@ class AuditEvent:
             "layer5": {"allow": self.layer5_allow, "action": self.layer5_action, "reasons": list(self.layer5_reasons)},
             "payload_snapshot": self.payload_snapshot,
         }
+        if self.payload_digest is not None:
+            d["payload_digest"] = self.payload_digest
+        return d
 
 
 def build_audit_event(
@@ -51,15 +70,21 @@ def build_audit_event(
     layer4: Layer4Decision,
     layer5: Layer5Decision,
     policy: AuditPolicy = AuditPolicy(),
+    clock: Optional[Clock] = None,
 ) -> AuditEvent:
-    ts = datetime.now(timezone.utc).isoformat()
+    # clock: optional ts_utc source (e.g. a CoarseClock in batch mode); defaults to now().
+    ts = clock() if clock is not None else utc_now_iso()
 
     jt = envelope.jurisdiction_tags
     payload_snapshot: dict[str, Any] | None = None
+    payload_digest: Optional[str] = None
     if policy.include_payload:
+        # The snapshot shares every branch redaction leaves untouched (often the whole payload).
         raw = envelope.payload if isinstance(envelope.payload, dict) else {}
-        redactions = {k for k in policy.redact_payload_keys if isinstance(k, str) and k}
-        payload_snapshot = {k: v for k, v in raw.items() if str(k) not in redactions}
+        payload_snapshot = policy.redactor().apply(raw)
+        if policy.payload_store:
+            payload_digest = open_payload_store(policy.payload_store).put(payload_snapshot)
+            payload_snapshot = None
 
     return AuditEvent(
         ts_utc=ts,
@@ -73,11 +98,26 @@ def build_audit_event(
         layer5_allow=bool(layer5.allow),
         layer5_reasons=_unique_sorted(layer5.reasons),
         payload_snapshot=payload_snapshot,
+        payload_digest=payload_digest,
     )
 
 
+_serializer = AuditEventSerializer()
+
+
+def serialize_audit_event(event: AuditEvent) -> str:
+    """Canonical audit line; byte-identical to json.dumps(event.to_dict(), sort_keys=True)."""
+    return _serializer.serialize(event)
+
+
 def write_audit_event(path: str, event: AuditEvent) -> None:
-    import json
-    line = json.dumps(event.to_dict(), sort_keys=True)
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    if path.startswith("sqlite:"):
+        from .sqlite_sink import shared_sqlite_sink
+
+        # Reuses one connection per database instead of reopening it (and its schema) per event.
+        shared_sqlite_sink(path).write(event)
+        return
+    # One unbuffered O_APPEND write per line, so concurrent processes never interleave a line.
+    data = (serialize_audit_event(event) + "\n").encode("utf-8")
+    with open(path, "ab", buffering=0) as f:
+        f.write(data)
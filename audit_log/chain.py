@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+# Hash chain sidecar: <file>.chain holds one JSON record per line:
+#   {"type": "open", "alg": ..., "prev": <hash the file's chain starts from>, "lines": 0, "offset": 0}
+#   {"type": "checkpoint", "hash": <chain hash after `lines` lines>, "lines": n, "offset": bytes}
+#   {"type": "seal", ...same fields as a checkpoint, covering the whole file}
+# The chain runs h_i = H(h_{i-1} || line_i) over the raw lines (newline included) and continues
+# across rotation: a segment's "open" prev is the previous segment's "seal" hash. Each file is
+# therefore verifiable on its own and the files are stitched by comparing prev/seal hashes.
+# A log written by `audit_log.merge` opens with "merged_from": the heads of the merged inputs,
+# which its prev is derived from (merged_prev).
+
+import hashlib
+import hmac
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from .audit import AuditEvent
+from .index import index_base
+from .segments import iter_segment_paths, open_segment
+
+CHAIN_SUFFIX = ".chain"
+GENESIS = "0" * 64
+
+
+@dataclass(frozen=True)
+class ChainPolicy:
+    """
+    Hash chain over the audit log:
+      - checkpoint_every: append a checkpoint to the sidecar after this many lines
+      - key: optional secret; links become HMAC-SHA256 so the chain cannot be recomputed without it
+    """
+
+    checkpoint_every: int = 1024
+    key: Optional[bytes] = None
+
+
+def _alg(key: Optional[bytes]) -> str:
+    return "hmac-sha256" if key else "sha256"
+
+
+def _link(key: Optional[bytes], prev: bytes, line: bytes) -> bytes:
+    if key:
+        return hmac.new(key, prev + line, hashlib.sha256).digest()
+    return hashlib.sha256(prev + line).digest()
+
+
+def chain_path(data_path: str) -> str:
+    return index_base(data_path) + CHAIN_SUFFIX
+
+
+def _read_records(path: str) -> list[dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+class AuditChainer:
+    """
+    AuditWriter observer that extends the hash chain over every committed line and appends
+    a checkpoint to the sidecar once checkpoint_every lines have accumulated (checked at
+    group-commit boundaries). On open it re-hashes any tail written after the last
+    checkpoint; a sidecar that claims more data than the file holds raises ValueError.
+    """
+
+    def __init__(self, path: str, policy: ChainPolicy = ChainPolicy()) -> None:
+        self.path = path
+        self.checkpoint_every = max(1, policy.checkpoint_every)
+        self.key = policy.key
+        self._open(self._previous_seal())
+
+    def _previous_seal(self) -> str:
+        # prev of a fresh active file: the seal hash of the newest sealed segment, if any
+        sealed = list(iter_segment_paths(self.path, include_active=False))
+        if sealed:
+            records = _read_records(chain_path(sealed[-1]))
+            if records and records[-1]["type"] == "seal":
+                return records[-1]["hash"]
+        return GENESIS
+
+    def _open(self, prev: str) -> None:
+        sidecar = chain_path(self.path)
+        records = _read_records(sidecar)
+        self._fh = open(sidecar, "a", encoding="utf-8")
+        if not records:
+            self._emit({"type": "open", "alg": _alg(self.key), "prev": prev, "lines": 0, "offset": 0})
+            records = [{"hash": prev, "lines": 0, "offset": 0}]
+        last = records[-1]
+        self._hash = bytes.fromhex(last.get("hash", last.get("prev", GENESIS)))
+        self._lines = last["lines"]
+        self._offset = last["offset"]
+        self._since_checkpoint = 0
+
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if self._offset > size:
+            raise ValueError(f"audit chain {sidecar} covers {self._offset} bytes but {self.path} has {size}")
+        if self._offset < size:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                while True:
+                    lines = f.readlines(1 << 20)
+                    if not lines:
+                        break
+                    self._extend(lines)
+            self._checkpoint("checkpoint")
+
+    def _emit(self, record: dict[str, Any]) -> None:
+        self._fh.write(json.dumps(record, sort_keys=True, separators=(",", ":")) + "\n")
+        self._fh.flush()
+
+    def _extend(self, lines: Sequence[bytes]) -> None:
+        h, key = self._hash, self.key
+        for line in lines:
+            h = _link(key, h, line)
+            self._offset += len(line)
+        self._hash = h
+        self._lines += len(lines)
+        self._since_checkpoint += len(lines)
+
+    def _checkpoint(self, kind: str) -> None:
+        self._emit({"type": kind, "hash": self._hash.hex(), "lines": self._lines, "offset": self._offset})
+        self._since_checkpoint = 0
+
+    @property
+    def head(self) -> str:
+        return self._hash.hex()
+
+    def on_commit(self, offset: int, lines: Sequence[bytes], events: Sequence[AuditEvent]) -> None:
+        self._extend(lines)
+        if self._since_checkpoint >= self.checkpoint_every:
+            self._checkpoint("checkpoint")
+
+    def on_seal(self, sealed_path: str) -> None:
+        self._checkpoint("seal")
+        self._fh.close()
+        os.replace(chain_path(self.path), chain_path(sealed_path))
+        self._open(self._hash.hex())
+
+    def close(self) -> None:
+        if self._since_checkpoint:
+            self._checkpoint("checkpoint")
+        self._fh.close()
+
+
+def recover_sealed_chain(active_path: str, sealed_path: str, policy: ChainPolicy) -> None:
+    """
+    Finish on_seal for a segment whose writer died between the rename and the seal record:
+    move the active sidecar over, chain any lines it had not covered and append the seal.
+    """
+    records = _read_records(chain_path(sealed_path))
+    if records and records[-1]["type"] == "seal":
+        return
+    if not records and os.path.exists(chain_path(active_path)):
+        os.replace(chain_path(active_path), chain_path(sealed_path))
+    chainer = AuditChainer(sealed_path, policy)
+    chainer._checkpoint("seal")
+    chainer._fh.close()
+
+
+def chain_head(path: str) -> Optional[str]:
+    """Last hash recorded for path's chain (newest chained segment or active file); None if unchained."""
+    for data_path in reversed(list(iter_segment_paths(path))):
+        records = _read_records(chain_path(data_path))
+        if records:
+            return records[-1].get("hash", records[-1].get("prev"))
+    return None
+
+
+def merged_prev(heads: Sequence[str], key: Optional[bytes] = None) -> str:
+    """
+    prev for a log merged from chained inputs: a single input's head carries straight over,
+    several are chained from GENESIS in merge order so the result commits to all of them.
+    """
+    if len(heads) == 1:
+        return heads[0]
+    h = bytes.fromhex(GENESIS)
+    for head in heads:
+        h = _link(key, h, bytes.fromhex(head))
+    return h.hex()
+
+
+def chain_merged_log(data_path: str, heads: Sequence[str], policy: ChainPolicy = ChainPolicy()) -> str:
+    """
+    Hash-chain a freshly merged log whose inputs ended at heads; returns its prev.
+
+    The open record lists the heads ("merged_from"), so verify_audit_chain accepts the log's
+    first file starting from merged_prev(heads) instead of GENESIS.
+    """
+    prev = merged_prev(heads, policy.key)
+    opening = {"type": "open", "alg": _alg(policy.key), "prev": prev, "lines": 0, "offset": 0}
+    opening["merged_from"] = list(heads)
+    with open(chain_path(data_path), "w", encoding="utf-8") as f:
+        f.write(json.dumps(opening, sort_keys=True, separators=(",", ":")) + "\n")
+    AuditChainer(data_path, policy).close()
+    return prev
+
+
+@dataclass(frozen=True)
+class SegmentVerification:
+    path: str
+    prev: Optional[str]
+    head: Optional[str]
+    lines: int
+    # hash recorded by the seal record, which the next segment chains from; None while active
+    seal: Optional[str] = None
+    # lines after the last checkpoint of an active file; chained but not yet attested
+    unchecked_lines: int = 0
+    errors: tuple[str, ...] = ()
+    # input heads of a merged log (see chain_merged_log)
+    merged_from: tuple[str, ...] = ()
+
+
+@dataclass
+class ChainReport:
+    segments: list[SegmentVerification] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def lines(self) -> int:
+        return sum(s.lines for s in self.segments)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "segments": len(self.segments),
+            "lines": self.lines,
+            "unchecked_lines": sum(s.unchecked_lines for s in self.segments),
+            "head": self.segments[-1].head if self.segments else None,
+            "errors": list(self.errors),
+        }
+
+
+def verify_segment(data_path: str, key: Optional[bytes] = None) -> SegmentVerification:
+    """Re-hash one data file (plain or compressed) against its sidecar's checkpoints."""
+    records = _read_records(chain_path(data_path))
+    if not records or records[0]["type"] != "open":
+        return SegmentVerification(data_path, None, None, 0, errors=(f"{data_path}: missing chain sidecar",))
+    opening, checkpoints = records[0], records[1:]
+    errors: list[str] = []
+    if opening.get("alg") != _alg(key):
+        errors.append(f"{data_path}: chain uses {opening.get('alg')}, verifier {_alg(key)}")
+
+    h = bytes.fromhex(opening["prev"])
+    lines = offset = 0
+    pending = iter(checkpoints)
+    expected = next(pending, None)
+    last_checked = 0
+    with open_segment(data_path) as f:
+        for line in f:
+            h = _link(key, h, line)
+            lines += 1
+            offset += len(line)
+            # a seal usually repeats the checkpoint of the same commit
+            while expected is not None and lines == expected["lines"]:
+                if expected["hash"] != h.hex() or expected["offset"] != offset:
+                    errors.append(f"{data_path}: mismatch at {expected['type']} line {lines}")
+                last_checked = lines
+                expected = next(pending, None)
+    if expected is not None:
+        errors.append(f"{data_path}: {expected['type']} at line {expected['lines']} but file has {lines} lines")
+
+    seal = checkpoints[-1]["hash"] if checkpoints and checkpoints[-1]["type"] == "seal" else None
+    sealed = seal is not None
+    if sealed and lines != last_checked:
+        errors.append(f"{data_path}: {lines - last_checked} lines after the seal record")
+    return SegmentVerification(
+        path=data_path,
+        prev=opening["prev"],
+        head=h.hex(),
+        lines=lines,
+        seal=seal,
+        unchecked_lines=0 if sealed else lines - last_checked,
+        errors=tuple(errors),
+        merged_from=tuple(opening.get("merged_from", ())),
+    )
+
+
+def verify_audit_chain(path: str, workers: Optional[int] = None, key: Optional[bytes] = None) -> ChainReport:
+    """
+    Verify every segment of an audit log and the links between them.
+
+    Segments are re-hashed independently across a process pool (workers=1 stays in
+    process); the results are then stitched in manifest order: each segment must start
+    from the previous segment's seal hash and the first one from the genesis hash, or for
+    a merged log from the hash of the inputs' heads it records.
+    """
+    files = list(iter_segment_paths(path))
+    if workers == 1 or len(files) <= 1:
+        results = [verify_segment(f, key) for f in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(verify_segment, files, [key] * len(files)))
+
+    report = ChainReport(segments=results)
+    expected_prev: Optional[str] = GENESIS
+    if results and results[0].merged_from:
+        expected_prev = merged_prev(results[0].merged_from, key)
+    for i, result in enumerate(results):
+        report.errors.extend(result.errors)
+        if result.prev is not None and expected_prev is not None and result.prev != expected_prev:
+            report.errors.append(f"{result.path}: chain does not continue from the previous segment")
+        if i < len(results) - 1 and result.seal is None:
+            report.errors.append(f"{result.path}: sealed segment has no seal record")
+        expected_prev = result.seal
+    return report
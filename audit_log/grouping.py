@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Tuple
+
+# Group key used once max_groups distinct groups exist.
+OTHER = "<other>"
+
+
+def normalise_ts(value: str) -> str:
+    """ISO timestamp as UTC in ts_utc's spelling; naive values are read as UTC."""
+    ts = datetime.fromisoformat(value)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc).isoformat()
+
+
+@dataclass(frozen=True)
+class GroupCounts:
+    group_by: Tuple[str, ...]
+    counts: dict[Tuple[Any, ...], int]
+    scanned: int
+    matched: int
+    # Records folded into the OTHER group because max_groups was reached.
+    overflow: int
+
+    def to_dict(self) -> dict[str, Any]:
+        rows = sorted(self.counts.items(), key=lambda kv: (-kv[1], json.dumps(kv[0])))
+        return {
+            "group_by": list(self.group_by),
+            "scanned": self.scanned,
+            "matched": self.matched,
+            "overflow": self.overflow,
+            "groups": [{"key": dict(zip(self.group_by, k)), "count": c} for k, c in rows],
+        }
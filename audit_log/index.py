@@ -0,0 +1,424 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional, Sequence
+
+from .audit import AuditEvent
+from .segments import _COMPRESSION_EXT, iter_segment_paths, open_segment
+
+# Sidecar files next to every audit data file (active log or sealed segment):
+#   <file>.aidx  16-byte records (artifact hash, line offset), sorted by hash so lookups can
+#                bisect it.
+#   <file>.atail the active file's newest .aidx records, appended unsorted. The writer merges
+#                it into .aidx once it holds max(TAIL_MIN_RECORDS, 1/64 of .aidx) records, on
+#                close and on seal, so a lookup on the active file bisects .aidx and scans a
+#                bounded tail; each merge rewrites .aidx, which amortizes to 64 record writes
+#                per indexed line. An active .aidx without an .atail predates the tail and is
+#                scanned linearly until the writer reopens it or the index is rebuilt.
+#   <file>.tidx  24-byte records (bucket start epoch, first line offset, end offset); one record
+#                per time bucket per group commit, so it stays sparse.
+# Offsets are into the uncompressed stream. The index may lag the data after a crash; readers
+# scan anything past the last indexed offset linearly, and
+# `python -m audit_log.lookup rebuild` regenerates it. A lookup hit in a gzip/lzma segment
+# still decompresses the segment from its start up to the hit's offset, since neither format
+# can seek: the index saves the parse, not the decompression, so the cost per matching segment
+# is linear in the uncompressed bytes before the last hit.
+ARTIFACT_SUFFIX = ".aidx"
+ARTIFACT_TAIL_SUFFIX = ".atail"
+TIME_SUFFIX = ".tidx"
+BUCKET_S = 60
+TAIL_MIN_RECORDS = 1 << 14
+
+_ARTIFACT_REC = struct.Struct("<QQ")
+_TIME_REC = struct.Struct("<qQQ")
+
+
+def artifact_hash(artifact_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(artifact_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def ts_epoch(ts_utc: str) -> float:
+    # A bound without an offset means UTC, as everywhere else in the log, not local time.
+    ts = datetime.fromisoformat(ts_utc)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def index_base(data_path: str) -> str:
+    """Sidecar prefix for a data file; compressed segments keep their uncompressed name's index."""
+    for ext in _COMPRESSION_EXT.values():
+        if data_path.endswith(ext):
+            return data_path[: -len(ext)]
+    return data_path
+
+
+class _Bucketer:
+    # ts_utc values from build_audit_event share a minute prefix, so parse once per minute.
+    def __init__(self) -> None:
+        self._prefix: Optional[str] = None
+        self._bucket = 0
+
+    def __call__(self, ts_utc: str) -> int:
+        prefix = ts_utc[:16]
+        if prefix != self._prefix or not ts_utc.endswith("+00:00"):
+            self._bucket = int(ts_epoch(ts_utc) // BUCKET_S) * BUCKET_S
+            self._prefix = prefix
+        return self._bucket
+
+
+def _index_records(
+    offset: int, lines: Sequence[bytes], keys: Sequence[tuple[str, str]], bucketer: _Bucketer
+) -> tuple[bytes, bytes]:
+    artifact_recs = bytearray()
+    spans: dict[int, list[int]] = {}
+    for line, (artifact_id, ts_utc) in zip(lines, keys):
+        end = offset + len(line)
+        artifact_recs += _ARTIFACT_REC.pack(artifact_hash(artifact_id), offset)
+        bucket = bucketer(ts_utc)
+        span = spans.get(bucket)
+        if span is None:
+            spans[bucket] = [offset, end]
+        else:
+            span[1] = end
+        offset = end
+    time_recs = b"".join(_TIME_REC.pack(b, s, e) for b, (s, e) in spans.items())
+    return bytes(artifact_recs), time_recs
+
+
+def _line_keys(line: bytes) -> Optional[tuple[str, str]]:
+    try:
+        record = json.loads(line)
+        return str(record["artifact_id"]), str(record["ts_utc"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _read_time_index(base: str) -> list[tuple[int, int, int]]:
+    try:
+        with open(base + TIME_SUFFIX, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    usable = len(data) - len(data) % _TIME_REC.size
+    return list(_TIME_REC.iter_unpack(data[:usable]))
+
+
+def _indexed_extent(base: str) -> int:
+    return max((end for _, _, end in _read_time_index(base)), default=0)
+
+
+def _iter_artifact_records(path: str) -> Iterator[tuple[int, int]]:
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        while True:
+            chunk = f.read(_ARTIFACT_REC.size << 16)
+            usable = len(chunk) - len(chunk) % _ARTIFACT_REC.size
+            if not usable:
+                return
+            yield from _ARTIFACT_REC.iter_unpack(chunk[:usable])
+
+
+def _merge_artifact_index(base: str, tail: str, dst: str) -> int:
+    """Write the sorted base merged with the unsorted tail to dst; returns the records written."""
+    merged = heapq.merge(_iter_artifact_records(base), sorted(_iter_artifact_records(tail)))
+    tmp = dst + ".tmp"
+    n = 0
+    last = None
+    with open(tmp, "wb") as f:
+        for rec in merged:
+            if rec != last:  # a crash between replace and truncate leaves the tail in both
+                f.write(_ARTIFACT_REC.pack(*rec))
+                n += 1
+            last = rec
+    os.replace(tmp, dst)
+    return n
+
+
+def _sort_artifact_index(src: str, dst: str) -> None:
+    with open(src, "rb") as f:
+        data = f.read()
+    usable = len(data) - len(data) % _ARTIFACT_REC.size
+    records = sorted(_ARTIFACT_REC.iter_unpack(data[:usable]))
+    tmp = dst + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(_ARTIFACT_REC.pack(h, o) for h, o in records))
+    os.replace(tmp, dst)
+
+
+class AuditIndexer:
+    """
+    AuditWriter observer that maintains the sidecar index of the active file.
+
+    On open it indexes any tail the previous writer did not get to; artifact records go to the
+    unsorted .atail and are merged into the sorted .aidx as it grows (see the module comment).
+    On seal the merged artifact index becomes the sealed segment's sidecar and a fresh one starts.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._bucketer = _Bucketer()
+        self._open()
+
+    def _open(self) -> None:
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        covered = _indexed_extent(self.path)
+        if covered > size:
+            # Stale sidecars from a data file that has since been replaced.
+            covered = 0
+            for suffix in (ARTIFACT_SUFFIX, ARTIFACT_TAIL_SUFFIX, TIME_SUFFIX):
+                open(self.path + suffix, "wb").close()
+        if not os.path.exists(self.path + ARTIFACT_TAIL_SUFFIX):
+            if os.path.exists(self.path + ARTIFACT_SUFFIX):
+                # written before the tail existed, so unsorted: merge it in as the tail
+                os.replace(self.path + ARTIFACT_SUFFIX, self.path + ARTIFACT_TAIL_SUFFIX)
+            else:
+                open(self.path + ARTIFACT_TAIL_SUFFIX, "wb").close()
+        self._merge_tail()
+        self._tidx = open(self.path + TIME_SUFFIX, "ab")
+        if covered < size:
+            self._catch_up(covered)
+
+    def _catch_up(self, offset: int) -> None:
+        lines: list[bytes] = []
+        keys: list[tuple[str, str]] = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            start = pos = offset
+            for line in f:
+                pos += len(line)
+                parsed = _line_keys(line)
+                if parsed is None:
+                    if lines:
+                        self._append(start, lines, keys)
+                    start, lines, keys = pos, [], []
+                    continue
+                lines.append(line)
+                keys.append(parsed)
+        if lines:
+            self._append(start, lines, keys)
+
+    def _merge_tail(self) -> None:
+        # Order matters to readers, which read the tail before .aidx: .aidx gains the records
+        # before the tail loses them.
+        aidx, tail = self.path + ARTIFACT_SUFFIX, self.path + ARTIFACT_TAIL_SUFFIX
+        if os.path.exists(aidx) and os.path.getsize(tail) == 0:
+            self._sorted_records = os.path.getsize(aidx) // _ARTIFACT_REC.size
+        else:
+            self._sorted_records = _merge_artifact_index(aidx, tail, aidx)
+        self._aidx = open(tail, "wb")
+        self._tail_records = 0
+
+    def _append(self, offset: int, lines: Sequence[bytes], keys: Sequence[tuple[str, str]]) -> None:
+        artifact_recs, time_recs = _index_records(offset, lines, keys, self._bucketer)
+        self._aidx.write(artifact_recs)
+        self._aidx.flush()
+        self._tidx.write(time_recs)
+        self._tidx.flush()
+        self._tail_records += len(artifact_recs) // _ARTIFACT_REC.size
+        if self._tail_records >= max(TAIL_MIN_RECORDS, self._sorted_records // 64):
+            self._aidx.close()
+            self._merge_tail()
+
+    def on_commit(self, offset: int, lines: Sequence[bytes], events: Sequence[AuditEvent]) -> None:
+        self._append(offset, lines, [(e.artifact_id, e.ts_utc) for e in events])
+
+    def on_seal(self, sealed_path: str) -> None:
+        self._aidx.close()
+        self._tidx.close()
+        _merge_artifact_index(
+            self.path + ARTIFACT_SUFFIX, self.path + ARTIFACT_TAIL_SUFFIX, sealed_path + ARTIFACT_SUFFIX
+        )
+        os.replace(self.path + TIME_SUFFIX, sealed_path + TIME_SUFFIX)
+        os.remove(self.path + ARTIFACT_SUFFIX)
+        os.remove(self.path + ARTIFACT_TAIL_SUFFIX)
+        self._open()
+
+    def close(self) -> None:
+        self._aidx.close()
+        self._tidx.close()
+        if self._tail_records:
+            self._merge_tail()
+            self._aidx.close()
+
+
+def recover_sealed_index(active_path: str, sealed_path: str) -> None:
+    """
+    Finish on_seal for a segment whose writer died between the rename and the index move.
+
+    The active sidecars describe the renamed file and are dropped; the sealed ones are kept
+    if the move completed (the time index moves last) and otherwise rebuilt from the data.
+    """
+    if not os.path.exists(sealed_path + TIME_SUFFIX) and os.path.exists(sealed_path + ARTIFACT_SUFFIX):
+        os.remove(sealed_path + ARTIFACT_SUFFIX)
+    for suffix in (ARTIFACT_SUFFIX, ARTIFACT_TAIL_SUFFIX, TIME_SUFFIX):
+        if os.path.exists(active_path + suffix):
+            os.remove(active_path + suffix)
+    AuditIndexer(sealed_path).close()
+    os.remove(sealed_path + ARTIFACT_TAIL_SUFFIX)
+
+
+def _artifact_offsets(base: str, h: int, is_active: bool) -> Optional[list[int]]:
+    if not is_active:
+        return _bisect_artifact_index(base + ARTIFACT_SUFFIX, h)
+    if not os.path.exists(base + ARTIFACT_TAIL_SUFFIX):
+        # an unsorted .aidx from before the tail existed
+        return _scan_artifact_index(base + ARTIFACT_SUFFIX, h)
+    # tail first: a concurrent merge extends .aidx before it truncates the tail
+    tail = _scan_artifact_index(base + ARTIFACT_TAIL_SUFFIX, h) or []
+    offsets = _bisect_artifact_index(base + ARTIFACT_SUFFIX, h)
+    if offsets is None:
+        return None
+    return sorted(set(offsets).union(tail))
+
+
+def _scan_artifact_index(path: str, h: int) -> Optional[list[int]]:
+    if not os.path.exists(path):
+        return None
+    return [o for ah, o in _iter_artifact_records(path) if ah == h]
+
+
+def _bisect_artifact_index(path: str, h: int) -> Optional[list[int]]:
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        n = size // _ARTIFACT_REC.size
+        if n == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lo, hi = 0, n
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if _ARTIFACT_REC.unpack_from(mm, mid * _ARTIFACT_REC.size)[0] < h:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            out: list[int] = []
+            while lo < n:
+                ah, off = _ARTIFACT_REC.unpack_from(mm, lo * _ARTIFACT_REC.size)
+                if ah != h:
+                    break
+                out.append(off)
+                lo += 1
+            return sorted(out)
+
+
+def _read_at(data_path: str, offsets: Sequence[int]) -> Iterator[dict[str, Any]]:
+    with open_segment(data_path) as f:
+        for off in offsets:
+            f.seek(off)
+            line = f.readline()
+            if line.strip():
+                yield json.loads(line)
+
+
+def _scan_range(data_path: str, start: int, end: Optional[int]) -> Iterator[dict[str, Any]]:
+    with open_segment(data_path) as f:
+        f.seek(start)
+        pos = start
+        for line in f:
+            if end is not None and pos >= end:
+                break
+            pos += len(line)
+            if line.strip():
+                yield json.loads(line)
+
+
+def _data_files(path: str, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[tuple[str, bool]]:
+    active = os.path.abspath(path)
+    for data_path in iter_segment_paths(path, since=since, until=until):
+        yield data_path, os.path.abspath(data_path) == active
+
+
+def find_artifact(path: str, artifact_id: str) -> Iterator[dict[str, Any]]:
+    """All audit records for artifact_id, oldest segment first, via the sidecar index."""
+    h = artifact_hash(artifact_id)
+    for data_path, is_active in _data_files(path):
+        base = index_base(data_path)
+        offsets = _artifact_offsets(base, h, is_active)
+        if offsets is None:
+            candidates: Iterator[dict[str, Any]] = _scan_range(data_path, 0, None)
+        else:
+            candidates = _read_at(data_path, offsets)
+        for record in candidates:
+            if record.get("artifact_id") == artifact_id:
+                yield record
+        if offsets is not None and is_active:
+            for record in _scan_range(data_path, _indexed_extent(base), None):
+                if record.get("artifact_id") == artifact_id:
+                    yield record
+
+
+def ts_in_window(ts_utc: Any, lo: float, hi: float) -> bool:
+    try:
+        t = ts_epoch(str(ts_utc))
+    except ValueError:
+        return False
+    return lo <= t <= hi
+
+
+def find_time_range(path: str, start: str, end: str) -> Iterator[dict[str, Any]]:
+    """Audit records with start <= ts_utc <= end (ISO-8601), reading only the indexed byte spans."""
+    lo, hi = ts_epoch(start), ts_epoch(end)
+    first_bucket = int(lo // BUCKET_S) * BUCKET_S
+
+    for data_path, is_active in _data_files(path, since=start, until=end):
+        base = index_base(data_path)
+        buckets = _read_time_index(base)
+        if not buckets and not os.path.exists(base + TIME_SUFFIX):
+            records: Iterator[dict[str, Any]] = _scan_range(data_path, 0, None)
+        else:
+            spans = [(s, e) for b, s, e in buckets if first_bucket <= b <= hi]
+            covered = max((e for _, _, e in buckets), default=0)
+            records = _chain(
+                _scan_range(data_path, min(s for s, _ in spans), max(e for _, e in spans)) if spans else iter(()),
+                _scan_range(data_path, covered, None) if is_active else iter(()),
+            )
+        for record in records:
+            if ts_in_window(record.get("ts_utc"), lo, hi):
+                yield record
+
+
+def _chain(*its: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    for it in its:
+        yield from it
+
+
+def rebuild_index(path: str) -> int:
+    """
+    Regenerate the sidecars for every segment and the active file; returns lines indexed.
+    Run it while no writer has the log open.
+    """
+    total = 0
+    for data_path, is_active in _data_files(path):
+        base = index_base(data_path)
+        bucketer = _Bucketer()
+        aidx_tmp, tidx_tmp = base + ARTIFACT_SUFFIX + ".build", base + TIME_SUFFIX + ".build"
+        with open_segment(data_path) as f, open(aidx_tmp, "wb") as aidx, open(tidx_tmp, "wb") as tidx:
+            offset = 0
+            for line in f:
+                parsed = _line_keys(line)
+                if parsed is not None:
+                    artifact_recs, time_recs = _index_records(offset, [line], [parsed], bucketer)
+                    aidx.write(artifact_recs)
+                    tidx.write(time_recs)
+                    total += 1
+                offset += len(line)
+        _sort_artifact_index(aidx_tmp, base + ARTIFACT_SUFFIX)
+        os.remove(aidx_tmp)
+        if is_active:
+            open(base + ARTIFACT_TAIL_SUFFIX, "wb").close()
+        os.replace(tidx_tmp, base + TIME_SUFFIX)
+    return total
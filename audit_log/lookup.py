@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from .index import ts_in_window, find_artifact, find_time_range, rebuild_index, ts_epoch
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="audit_log.lookup", description="FusionIntel audit log sidecar index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = sub.add_parser("rebuild", help="regenerate the index for an existing log and its segments")
+    rebuild.add_argument("path")
+
+    lookup = sub.add_parser("lookup", help="print matching audit records as JSON lines")
+    lookup.add_argument("path")
+    lookup.add_argument("--artifact-id")
+    lookup.add_argument("--since", help="ISO-8601 lower bound on ts_utc")
+    lookup.add_argument("--until", help="ISO-8601 upper bound on ts_utc")
+
+    args = parser.parse_args(argv)
+    if args.command == "rebuild":
+        n = rebuild_index(args.path)
+        print(json.dumps({"path": args.path, "lines_indexed": n}, sort_keys=True))
+        return 0
+
+    if args.artifact_id:
+        records = find_artifact(args.path, args.artifact_id)
+        if args.since or args.until:
+            lo = args.since or "0001-01-01T00:00:00+00:00"
+            hi = args.until or "9999-12-31T23:59:59+00:00"
+            records = (r for r in records if ts_in_window(r.get("ts_utc"), ts_epoch(lo), ts_epoch(hi)))
+    elif args.since and args.until:
+        records = find_time_range(args.path, args.since, args.until)
+    else:
+        parser.error("lookup needs --artifact-id or both --since and --until")
+    for record in records:
+        sys.stdout.write(json.dumps(record, sort_keys=True) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import IO, Any, Iterator, Optional
+
+from .chain import CHAIN_SUFFIX, ChainPolicy, chain_head, chain_merged_log, chain_path, verify_audit_chain
+from .index import ARTIFACT_SUFFIX, ARTIFACT_TAIL_SUFFIX, TIME_SUFFIX, index_base, ts_epoch
+from .rollup import Rollups, write_compacted, load_rollups, rollup_path
+from .scan import raw_ts
+from .segments import iter_audit_lines, iter_segment_paths, manifest_path, worker_log_paths
+
+
+@dataclass
+class MergeStats:
+    sources: int = 0
+    lines: int = 0
+    # lines without a readable ts_utc; they keep their position relative to their own file
+    untimed: int = 0
+    # prev of the output's hash chain when the inputs were chained (see chain_merged_log)
+    chain_prev: Optional[str] = None
+
+
+def _keyed_lines(path: str, rank: int, stats: MergeStats) -> Iterator[tuple[float, int, int, bytes]]:
+    last = float("-inf")
+    for seq, line in enumerate(iter_audit_lines(path)):
+        raw = raw_ts(line)
+        try:
+            last = ts_epoch(raw.decode("ascii")) if raw is not None else last
+        except ValueError:
+            raw = None
+        if raw is None:
+            stats.untimed += 1
+        if not line.endswith(b"\n"):
+            line += b"\n"
+        yield last, rank, seq, line
+
+
+def merge_sources(path: str, include_base: bool = True) -> list[str]:
+    """The per-worker logs of path, preceded by path itself when it has data of its own."""
+    sources = []
+    if include_base and (os.path.exists(path) or os.path.exists(manifest_path(path))):
+        sources.append(path)
+    return sources + worker_log_paths(path)
+
+
+def iter_merged_lines(
+    path: str, include_base: bool = True, stats: Optional[MergeStats] = None
+) -> Iterator[bytes]:
+    """
+    Lines of every source (sealed segments included) in ts_utc order via a k-way merge.
+
+    Each worker file is already in write order, so the merge streams with one pending line
+    per source; ties keep source order, then line order.
+    """
+    stats = stats if stats is not None else MergeStats()
+    sources = merge_sources(path, include_base)
+    stats.sources = len(sources)
+    for _, _, _, line in heapq.merge(*(_keyed_lines(src, rank, stats) for rank, src in enumerate(sources))):
+        stats.lines += 1
+        yield line
+
+
+def merge_audit_logs(
+    path: str,
+    output: str,
+    include_base: bool = True,
+    remove_inputs: bool = False,
+    chain_key: Optional[bytes] = None,
+) -> MergeStats:
+    """
+    Write the time-ordered merge of path's per-worker logs to output (atomically).
+
+    remove_inputs compacts: after output is in place the merged worker files, their sealed
+    segments, manifests and index and chain sidecars are deleted. Only run it once the
+    workers that own those files have stopped.
+
+    If the inputs are hash-chained, output gets a chain sidecar of its own that starts from
+    the inputs' heads (see chain_merged_log), written with chain_key. Compaction first
+    verifies the inputs' chains and raises ValueError, deleting nothing, if one fails.
+    """
+    sources = merge_sources(path, include_base)
+    if os.path.abspath(output) in {os.path.abspath(s) for s in sources}:
+        raise ValueError(f"output must not be one of the merged logs: {output}")
+
+    chained = {src: head for src, head in ((src, chain_head(src)) for src in sources) if head is not None}
+    heads = list(chained.values())
+    if remove_inputs:
+        for src in chained:
+            report = verify_audit_chain(src, workers=1, key=chain_key)
+            if not report.ok:
+                raise ValueError(f"refusing to compact {src}: hash chain does not verify: {report.errors[0]}")
+
+    stats = MergeStats()
+    tmp = output + ".tmp"
+    with open(tmp, "wb") as out:
+        _write_lines(out, iter_merged_lines(path, include_base, stats))
+        out.flush()
+        os.fsync(out.fileno())
+    if os.path.exists(chain_path(output)):
+        os.remove(chain_path(output))
+    os.replace(tmp, output)
+    if heads:
+        stats.chain_prev = chain_merged_log(output, heads, ChainPolicy(key=chain_key))
+
+    if sources and all(os.path.exists(rollup_path(src)) for src in sources):
+        # rollups are additive, so the merged log inherits the sum of its inputs'
+        totals = Rollups()
+        for src in sources:
+            totals.update(load_rollups(src)[0])
+        write_compacted(output, totals, os.path.getsize(output))
+
+    if remove_inputs:
+        for src in sources:
+            _remove_log(src)
+    return stats
+
+
+def _write_lines(out: IO[bytes], lines: Iterator[bytes], chunk: int = 1 << 20) -> None:
+    buffer: list[bytes] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk:
+            out.write(b"".join(buffer))
+            buffer.clear()
+            size = 0
+    out.write(b"".join(buffer))
+
+
+def _remove_log(path: str) -> None:
+    data = list(iter_segment_paths(path))
+    files = data + [manifest_path(path), rollup_path(path)]
+    sidecars = (ARTIFACT_SUFFIX, ARTIFACT_TAIL_SUFFIX, TIME_SUFFIX, CHAIN_SUFFIX)
+    files += [index_base(f) + suffix for f in data for suffix in sidecars]
+    for f in files:
+        try:
+            os.remove(f)
+        except FileNotFoundError:
+            pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="audit_log.merge",
+        description="Merge per-worker FusionIntel audit logs (<path>.worker-<pid>) into one time-ordered log",
+    )
+    parser.add_argument("path", help="audit target the workers were configured with")
+    parser.add_argument("-o", "--output", help="write the merged log here instead of stdout")
+    parser.add_argument("--workers-only", action="store_true", help="leave path itself out of the merge")
+    parser.add_argument(
+        "--compact", action="store_true", help="delete the merged inputs once --output is written (workers stopped)"
+    )
+    parser.add_argument("--key-file", metavar="PATH", help="HMAC key the inputs' hash chains were written with")
+    parser.add_argument("--key-env", metavar="NAME", help="read the HMAC key from this environment variable")
+    args = parser.parse_args(argv)
+
+    if args.compact and not args.output:
+        parser.error("--compact requires --output")
+
+    key = None
+    if args.key_file:
+        with open(args.key_file, "rb") as f:
+            key = f.read()
+    elif args.key_env:
+        key = os.environ.get(args.key_env, "").encode("utf-8") or None
+
+    if args.output:
+        try:
+            stats = merge_audit_logs(
+                args.path,
+                args.output,
+                include_base=not args.workers_only,
+                remove_inputs=args.compact,
+                chain_key=key,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        summary: dict[str, Any] = {
+            "output": args.output,
+            "sources": stats.sources,
+            "lines": stats.lines,
+            "untimed": stats.untimed,
+        }
+        if stats.chain_prev is not None:
+            summary["chain_prev"] = stats.chain_prev
+        print(json.dumps(summary, sort_keys=True), file=sys.stderr)
+        return 0
+
+    _write_lines(sys.stdout.buffer, iter_merged_lines(args.path, include_base=not args.workers_only))
+    sys.stdout.buffer.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
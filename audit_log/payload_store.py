@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional
+
+from .sink import SQLITE_PREFIX
+
+DIGEST_PREFIX = "sha256:"
+
+
+def canonical_payload(payload: Any) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def payload_digest(body: bytes) -> str:
+    return DIGEST_PREFIX + hashlib.sha256(body).hexdigest()
+
+
+class PayloadStore(ABC):
+    """
+    Content-addressed store for audit payload snapshots. put() stores the canonical JSON
+    of a snapshot under its sha256 digest (once) and returns the digest; get() loads it.
+    Safe for concurrent writers: identical content always lands under the same key.
+    """
+
+    def __init__(self, recent: int = 4096) -> None:
+        # Digests known to be stored already, so re-sent payloads skip the existence check.
+        self._recent: OrderedDict[str, None] = OrderedDict()
+        self._recent_max = recent
+        self._lock = threading.Lock()
+
+    def put(self, payload: Any) -> str:
+        body = canonical_payload(payload)
+        digest = payload_digest(body)
+        with self._lock:
+            if digest in self._recent:
+                self._recent.move_to_end(digest)
+                return digest
+        self._put(digest, body)
+        with self._lock:
+            self._recent[digest] = None
+            if len(self._recent) > self._recent_max:
+                self._recent.popitem(last=False)
+        return digest
+
+    def get(self, digest: str) -> Any:
+        body = self._get(digest)
+        if body is None:
+            raise KeyError(digest)
+        return json.loads(body)
+
+    @abstractmethod
+    def _put(self, digest: str, body: bytes) -> None: ...
+
+    @abstractmethod
+    def _get(self, digest: str) -> Optional[bytes]: ...
+
+    def close(self) -> None:
+        pass
+
+
+class DirectoryPayloadStore(PayloadStore):
+    """Blobs as <root>/<aa>/<bb>/<hex>.json, written via temp file + os.replace."""
+
+    def __init__(self, root: str, recent: int = 4096) -> None:
+        super().__init__(recent)
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        hexdigest = digest[len(DIGEST_PREFIX) :]
+        if len(hexdigest) != 64 or not all(c in "0123456789abcdef" for c in hexdigest):
+            raise KeyError(digest)
+        return os.path.join(self.root, hexdigest[:2], hexdigest[2:4], hexdigest + ".json")
+
+    def _put(self, digest: str, body: bytes) -> None:
+        path = self._path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+    def _get(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self._path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+class SqlitePayloadStore(PayloadStore):
+    """Blobs in a payload_blobs(digest PRIMARY KEY, body) table of a WAL-mode database."""
+
+    def __init__(self, path: str, recent: int = 4096) -> None:
+        super().__init__(recent)
+        self.path = path[len(SQLITE_PREFIX) :] if path.startswith(SQLITE_PREFIX) else path
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=30)
+        self._db_lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS payload_blobs (digest TEXT PRIMARY KEY, body BLOB NOT NULL)")
+
+    def _put(self, digest: str, body: bytes) -> None:
+        with self._db_lock:
+            self._conn.execute("INSERT OR IGNORE INTO payload_blobs (digest, body) VALUES (?, ?)", (digest, body))
+
+    def _get(self, digest: str) -> Optional[bytes]:
+        with self._db_lock:
+            row = self._conn.execute("SELECT body FROM payload_blobs WHERE digest = ?", (digest,)).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._conn.close()
+
+
+def open_payload_store(target: str) -> PayloadStore:
+    """Shared store per target and process: "sqlite:<db path>" or a directory path."""
+    # Keyed by pid so forked pool workers never reuse the parent's SQLite connection.
+    return _open_payload_store(target, os.getpid())
+
+
+@lru_cache(maxsize=32)
+def _open_payload_store(target: str, pid: int) -> PayloadStore:
+    if target.startswith(SQLITE_PREFIX):
+        return SqlitePayloadStore(target)
+    return DirectoryPayloadStore(target)
+
+
+class PayloadResolver:
+    """Rehydrates payload digests through an LRU cache in front of a PayloadStore."""
+
+    def __init__(self, store: PayloadStore, cache_size: int = 1024) -> None:
+        self.store = store
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: str) -> Any:
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                self.hits += 1
+                return self._cache[digest]
+            self.misses += 1
+        payload = self.store.get(digest)
+        with self._lock:
+            self._cache[digest] = payload
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return payload
+
+    def rehydrate(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Copy of an audit record with payload_snapshot restored from payload_digest."""
+        digest = record.get("payload_digest")
+        if not digest:
+            return record
+        out = dict(record)
+        out["payload_snapshot"] = self.get(digest)
+        return out
+
+
+def rehydrate_records(
+    records: Iterable[dict[str, Any]], store: PayloadStore | str, cache_size: int = 1024
+) -> Iterator[dict[str, Any]]:
+    """
+    Audit records with snapshots restored. Cached snapshots are shared between records,
+    so treat them as read-only.
+    """
+    resolver = PayloadResolver(open_payload_store(store) if isinstance(store, str) else store, cache_size)
+    for record in records:
+        yield resolver.rehydrate(record)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+from .serializer import _dumps_sorted
+
+WILDCARD = "*"
+_MISSING = object()
+
+
+@dataclass(eq=False)
+class _Node:
+    # redact: remove the value that reached this node
+    redact: bool = False
+    children: dict[str, "_Node"] = field(default_factory=dict)
+    wildcard: Optional["_Node"] = None
+
+    def child(self, name: str) -> "_Node":
+        if name == WILDCARD:
+            if self.wildcard is None:
+                self.wildcard = _Node()
+            return self.wildcard
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = _Node()
+        return node
+
+
+@dataclass(frozen=True, eq=False)
+class PayloadRedactor:
+    """
+    Compiled form of an AuditPolicy's payload rules.
+
+    Paths are dot-separated keys ("customer.ssn"); "*" matches any key of a dict or any
+    element of a list at that level ("contacts.*.phone"). Keys are compared as str(key), so
+    an int key 1 matches the rule "1". Matching values are removed.
+    apply() rebuilds only the containers on a path to a removed value and returns the
+    input object itself when nothing matched, so the common case allocates nothing.
+    """
+
+    root: _Node
+    max_snapshot_bytes: Optional[int] = None
+
+    def apply(self, payload: dict[str, Any]) -> dict[str, Any]:
+        snapshot = _redact(payload, self.root)
+        if self.max_snapshot_bytes is not None:
+            size = len(_dumps_sorted(snapshot))
+            if size > self.max_snapshot_bytes:
+                return {"_truncated": True, "_bytes": size}
+        return snapshot
+
+
+def _redact(obj: Any, node: _Node) -> Any:
+    if isinstance(obj, dict):
+        if node.wildcard is None and all(isinstance(k, str) for k in obj):
+            # Only the named keys can change; probe them instead of walking the dict.
+            changed: Optional[dict[Any, Any]] = None
+            for name, child in node.children.items():
+                if name not in obj:
+                    continue
+                if child.redact:
+                    new = _MISSING
+                else:
+                    value = obj[name]
+                    new = _redact(value, child)
+                    if new is value:
+                        continue
+                if changed is None:
+                    changed = dict(obj)
+                if new is _MISSING:
+                    del changed[name]
+                else:
+                    changed[name] = new
+            return obj if changed is None else changed
+
+        out: dict[Any, Any] = {}
+        modified = False
+        for key, value in obj.items():
+            named = node.children.get(key if isinstance(key, str) else str(key))
+            new = value
+            for child in (named, node.wildcard):
+                if child is None or new is _MISSING:
+                    continue
+                new = _MISSING if child.redact else _redact(new, child)
+            if new is not value:
+                modified = True
+            if new is not _MISSING:
+                out[key] = new
+        return out if modified else obj
+
+    if isinstance(obj, list) and node.wildcard is not None:
+        child = node.wildcard
+        if child.redact:
+            return []
+        items = [_redact(v, child) for v in obj]
+        if all(a is b for a, b in zip(items, obj)):
+            return obj
+        return items
+
+    return obj
+
+
+@lru_cache(maxsize=256)
+def compile_redactor(
+    keys: tuple[str, ...], paths: tuple[str, ...] = (), max_snapshot_bytes: Optional[int] = None
+) -> PayloadRedactor:
+    """
+    keys: top-level keys, matched literally (dots are not path separators here)
+    paths: dotted key paths with optional "*" segments
+    """
+    root = _Node()
+    for key in keys:
+        if isinstance(key, str) and key:
+            root.children.setdefault(key, _Node()).redact = True
+    for path in _split(paths):
+        node = root
+        for part in path:
+            node = node.child(part)
+        node.redact = True
+    return PayloadRedactor(root=root, max_snapshot_bytes=max_snapshot_bytes)
+
+
+def _split(paths: Iterable[str]) -> Iterable[list[str]]:
+    for path in paths:
+        if not isinstance(path, str):
+            continue
+        parts = path.strip().split(".")
+        if parts and all(parts):
+            yield parts
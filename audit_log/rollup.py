@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+# Rollup sidecar: <file>.rollup holds JSON records, one per line, each a delta of per-minute
+# counters plus the data-file offset it covers:
+#   {"offset": bytes, "events": [[minute, action, jurisdiction, residency_class, n], ...],
+#    "reasons": [[minute, action, jurisdiction, residency_class, reason, n], ...]}
+# Totals are the sum of all records; the last offset says where replay resumes after a crash.
+# Minutes are ts_utc[:16] and reasons are "layer4:<r>" / "layer5:<r>", as in audit_log.scan.
+
+import json
+import os
+import time
+from collections import Counter
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+from .audit import AuditEvent
+from .grouping import OTHER, GroupCounts, normalise_ts
+from .segments import iter_audit_lines, iter_segment_paths, worker_log_paths
+
+ROLLUP_SUFFIX = ".rollup"
+ROLLUP_GROUP_FIELDS = ("action", "jurisdiction", "residency_class", "reason", "minute", "hour", "day")
+
+EventKey = Tuple[str, str, str, str]
+ReasonKey = Tuple[str, str, str, str, Optional[str]]
+
+
+def rollup_path(data_path: str) -> str:
+    return data_path + ROLLUP_SUFFIX
+
+
+class Rollups:
+    """Per-minute counters: events by (minute, action, jurisdiction, residency class), and reasons."""
+
+    def __init__(self) -> None:
+        self.events: Counter[EventKey] = Counter()
+        self.reasons: Counter[ReasonKey] = Counter()
+
+    def __bool__(self) -> bool:
+        return bool(self.events)
+
+    def add(
+        self,
+        ts_utc: str,
+        action: str,
+        jurisdiction: str,
+        residency_class: str,
+        layer4_reasons: Iterable[str],
+        layer5_reasons: Iterable[str],
+    ) -> None:
+        key = (ts_utc[:16], action, jurisdiction, residency_class)
+        self.events[key] += 1
+        reasons = [f"layer4:{r}" for r in layer4_reasons] + [f"layer5:{r}" for r in layer5_reasons]
+        for reason in reasons or (None,):
+            self.reasons[key + (reason,)] += 1
+
+    def add_event(self, event: AuditEvent) -> None:
+        self.add(
+            event.ts_utc,
+            event.layer5_action,
+            event.jurisdiction,
+            event.residency_class,
+            event.layer4_reasons,
+            event.layer5_reasons,
+        )
+
+    def add_line(self, line: bytes) -> bool:
+        try:
+            r = json.loads(line)
+            layer4, layer5 = r.get("layer4") or {}, r.get("layer5") or {}
+            self.add(
+                str(r.get("ts_utc", "")),
+                layer5.get("action"),
+                r.get("jurisdiction"),
+                r.get("residency_class"),
+                layer4.get("reasons", ()),
+                layer5.get("reasons", ()),
+            )
+        except (ValueError, AttributeError, TypeError):
+            return False
+        return True
+
+    def update(self, other: "Rollups") -> None:
+        self.events.update(other.events)
+        self.reasons.update(other.reasons)
+
+    def record(self, offset: int) -> dict[str, Any]:
+        return {
+            "offset": offset,
+            "events": [list(k) + [n] for k, n in sorted(self.events.items(), key=lambda kv: json.dumps(kv[0]))],
+            "reasons": [list(k) + [n] for k, n in sorted(self.reasons.items(), key=lambda kv: json.dumps(kv[0]))],
+        }
+
+    def add_record(self, record: dict[str, Any]) -> None:
+        for *key, n in record.get("events", ()):
+            self.events[tuple(key)] += n  # type: ignore[index]
+        for *key, n in record.get("reasons", ()):
+            self.reasons[tuple(key)] += n  # type: ignore[index]
+
+
+def load_rollups(data_path: str) -> tuple[Rollups, int, int]:
+    """(totals, offset covered in the active file, number of records) from one sidecar."""
+    totals = Rollups()
+    offset = records = 0
+    try:
+        with open(rollup_path(data_path), "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn tail of a crashed append; replay covers it
+                totals.add_record(record)
+                offset = record["offset"]
+                records += 1
+    except FileNotFoundError:
+        pass
+    return totals, offset, records
+
+
+def write_compacted(data_path: str, totals: Rollups, offset: int, sealed: Optional[str] = None) -> None:
+    """Atomically replace data_path's rollup sidecar with one compacted record covering offset bytes."""
+    record = totals.record(offset)
+    if sealed is not None:
+        record["sealed"] = sealed  # lets recover_sealed_rollups tell a finished seal apart
+    tmp = rollup_path(data_path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    os.replace(tmp, rollup_path(data_path))
+
+
+def _replay(path: str, offset: int, into: Rollups) -> None:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if line.strip():
+                into.add_line(line)
+
+
+class AuditRollup:
+    """
+    AuditWriter observer keeping per-minute rollup counters for the active log.
+
+    Counts accumulate in memory and are appended to the sidecar as a delta whenever a new
+    minute starts or checkpoint_s has passed, and on seal and close. On open the sidecar
+    is compacted to one record and any lines past its offset are replayed, so a crash
+    loses nothing that reached the data file.
+    """
+
+    def __init__(self, path: str, checkpoint_s: float = 10.0) -> None:
+        self.path = path
+        self.checkpoint_s = checkpoint_s
+        self._pending = Rollups()
+        self._minute: Optional[str] = None
+        self._last_checkpoint = time.monotonic()
+        self._open()
+
+    def _open(self) -> None:
+        totals, offset, _ = load_rollups(self.path)
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if offset > size:
+            # Crashed between sealing the active file and checkpointing the seal: the
+            # uncovered tail is in the newest (not yet compressed) segment.
+            sealed = list(iter_segment_paths(self.path, include_active=False))
+            if sealed and os.path.exists(sealed[-1]) and os.path.getsize(sealed[-1]) >= offset:
+                _replay(sealed[-1], offset, totals)
+            offset = 0
+        if offset < size:
+            _replay(self.path, offset, totals)
+        self._offset = size
+        write_compacted(self.path, totals, self._offset)
+        self._fh = open(rollup_path(self.path), "a", encoding="utf-8")
+
+    def _checkpoint(self) -> None:
+        self._fh.write(json.dumps(self._pending.record(self._offset), separators=(",", ":")) + "\n")
+        self._fh.flush()
+        self._pending = Rollups()
+        self._last_checkpoint = time.monotonic()
+
+    def on_commit(self, offset: int, lines: Sequence[bytes], events: Sequence[AuditEvent]) -> None:
+        rolled = False
+        for event in events:
+            minute = event.ts_utc[:16]
+            if minute != self._minute:
+                rolled = self._minute is not None
+                self._minute = minute
+            self._pending.add_event(event)
+        self._offset = offset + sum(len(line) for line in lines)
+        if rolled or time.monotonic() - self._last_checkpoint >= self.checkpoint_s:
+            self._checkpoint()
+
+    def on_seal(self, sealed_path: str) -> None:
+        self._checkpoint()
+        self._fh.close()
+        totals, _, _ = load_rollups(self.path)
+        self._offset = 0
+        write_compacted(self.path, totals, 0, sealed=os.path.basename(sealed_path))
+        self._fh = open(rollup_path(self.path), "a", encoding="utf-8")
+
+    def close(self) -> None:
+        if self._pending:
+            self._checkpoint()
+        self._fh.close()
+
+
+def recover_sealed_rollups(active_path: str, sealed_path: str) -> None:
+    """
+    Finish on_seal for a segment whose writer died before the rollups were checkpointed over
+    it: count the sealed file's lines past the covered offset and restart the active at 0.
+    """
+    try:
+        with open(rollup_path(active_path), "r", encoding="utf-8") as f:
+            first = json.loads(f.readline() or "{}")
+    except (FileNotFoundError, ValueError):
+        first = {}
+    if first.get("sealed") == os.path.basename(sealed_path):
+        return
+    totals, offset, _ = load_rollups(active_path)
+    _replay(sealed_path, offset, totals)
+    write_compacted(active_path, totals, 0, sealed=os.path.basename(sealed_path))
+
+
+def rebuild_rollups(path: str) -> int:
+    """
+    Recompute path's rollup sidecar from every segment and the active file (for logs
+    written before rollups were enabled). Run it while no writer has the log open.
+    """
+    totals = Rollups()
+    n = 0
+    for line in iter_audit_lines(path):
+        n += totals.add_line(line)
+    write_compacted(path, totals, os.path.getsize(path) if os.path.exists(path) else 0)
+    return n
+
+
+def _rollup_sources(path: str) -> list[str]:
+    return [p for p in [path] + worker_log_paths(path) if os.path.exists(rollup_path(p))]
+
+
+def query_rollups(
+    path: str,
+    group_by: Sequence[str] = ("action",),
+    actions: Sequence[str] = (),
+    jurisdictions: Sequence[str] = (),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    max_groups: int = 100_000,
+) -> GroupCounts:
+    """
+    Counts from the rollup sidecars of path and its per-worker logs, without reading the log.
+
+    Cost is proportional to the number of stored buckets. since/until select whole minutes
+    (a minute is included when it overlaps the window). With "reason" in group_by an event
+    counts once per reason, as in audit_log.scan.group_counts; scanned reports the number
+    of buckets read and matched the total counted into groups.
+    """
+    unknown = [g for g in group_by if g not in ROLLUP_GROUP_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown rollup group-by field(s): {', '.join(unknown)}")
+    group_by = tuple(group_by)
+    lo = normalise_ts(since)[:16] if since else None
+    hi = normalise_ts(until)[:16] if until else None
+    by_reason = "reason" in group_by
+
+    totals = Rollups()
+    for source in _rollup_sources(path):
+        totals.update(load_rollups(source)[0])
+
+    other = tuple(OTHER for _ in group_by)
+    counts: dict[Tuple[Any, ...], int] = {}
+    scanned = matched = overflow = 0
+    for key, n in (totals.reasons if by_reason else totals.events).items():
+        scanned += 1
+        minute, action, jurisdiction, residency_class = key[:4]
+        if (lo is not None and minute < lo) or (hi is not None and minute > hi):
+            continue
+        if (actions and action not in actions) or (jurisdictions and jurisdiction not in jurisdictions):
+            continue
+        values = {
+            "action": action,
+            "jurisdiction": jurisdiction,
+            "residency_class": residency_class,
+            "reason": key[4] if by_reason else None,
+            "minute": minute,
+            "hour": minute[:13],
+            "day": minute[:10],
+        }
+        group = tuple(values[g] for g in group_by)
+        if group not in counts and len(counts) >= max_groups:
+            group = other
+            overflow += n
+        counts[group] = counts.get(group, 0) + n
+        matched += n
+    return GroupCounts(group_by=group_by, counts=counts, scanned=scanned, matched=matched, overflow=overflow)
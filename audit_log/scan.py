@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional, Sequence, Tuple
+
+from .grouping import OTHER, GroupCounts, normalise_ts
+from .rollup import query_rollups, rebuild_rollups
+from .segments import iter_segment_paths, open_segment
+
+# Audit lines are json.dumps(..., sort_keys=True), so the top-level fields have a fixed
+# spelling in the raw bytes and ts_utc is always the last key. Filters test those byte
+# patterns first and only decode lines that can still match; the decoded record is then
+# checked exactly, since a payload_snapshot may contain look-alike keys.
+_TS_KEY = b'"ts_utc": "'
+
+GROUP_FIELDS = (
+    "action",
+    "jurisdiction",
+    "layer4_allow",
+    "layer5_allow",
+    "producer_layer",
+    "residency_class",
+    "reason",
+    "minute",
+    "hour",
+    "day",
+)
+
+
+def raw_ts(line: bytes) -> Optional[bytes]:
+    """ts_utc of a serialized audit line as raw bytes, without decoding the JSON."""
+    i = line.rfind(_TS_KEY)
+    if i < 0:
+        return None
+    i += len(_TS_KEY)
+    j = line.find(b'"', i)
+    return line[i:j] if j > 0 else None
+
+
+@dataclass(frozen=True)
+class ScanFilter:
+    """
+    Conjunction of audit line predicates; empty/None fields do not filter.
+      - actions: Layer 5 actions (deliver / quarantine / block)
+      - jurisdictions: exact jurisdiction values as recorded
+      - layer4_allow: Layer 4 outcome
+      - since / until: inclusive ts_utc window (ISO-8601; naive values are taken as UTC)
+    """
+
+    actions: Tuple[str, ...] = ()
+    jurisdictions: Tuple[str, ...] = ()
+    layer4_allow: Optional[bool] = None
+    since: Optional[str] = None
+    until: Optional[str] = None
+
+    _action_needles: Tuple[bytes, ...] = field(init=False, repr=False, compare=False)
+    _jurisdiction_needles: Tuple[bytes, ...] = field(init=False, repr=False, compare=False)
+    _layer4_needle: Optional[bytes] = field(init=False, repr=False, compare=False)
+    _since: Optional[bytes] = field(init=False, repr=False, compare=False)
+    _until: Optional[bytes] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        set_ = object.__setattr__
+        set_(self, "_action_needles", tuple(b'"layer5": {"action": ' + _json(a) for a in self.actions))
+        set_(self, "_jurisdiction_needles", tuple(b'"jurisdiction": ' + _json(j) for j in self.jurisdictions))
+        set_(
+            self,
+            "_layer4_needle",
+            None if self.layer4_allow is None else b'"layer4": {"allow": ' + _json(self.layer4_allow),
+        )
+        set_(self, "_since", normalise_ts(self.since).encode() if self.since else None)
+        set_(self, "_until", normalise_ts(self.until).encode() if self.until else None)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.actions or self.jurisdictions or self.since or self.until) and self.layer4_allow is None
+
+    def matches_raw(self, line: bytes) -> bool:
+        """Cheap byte-level pre-filter; False means the line certainly does not match."""
+        if self._action_needles and not any(n in line for n in self._action_needles):
+            return False
+        if self._jurisdiction_needles and not any(n in line for n in self._jurisdiction_needles):
+            return False
+        if self._layer4_needle is not None and self._layer4_needle not in line:
+            return False
+        if self._since is not None or self._until is not None:
+            # ts_utc values are UTC isoformat, which orders correctly as bytes.
+            ts = raw_ts(line)
+            if ts is None:
+                return False
+            if self._since is not None and ts < self._since:
+                return False
+            if self._until is not None and ts > self._until:
+                return False
+        return True
+
+    def matches(self, record: dict[str, Any]) -> bool:
+        layer4 = record.get("layer4") or {}
+        layer5 = record.get("layer5") or {}
+        if self.actions and layer5.get("action") not in self.actions:
+            return False
+        if self.jurisdictions and record.get("jurisdiction") not in self.jurisdictions:
+            return False
+        if self.layer4_allow is not None and layer4.get("allow") is not self.layer4_allow:
+            return False
+        if self._since is not None or self._until is not None:
+            ts = str(record.get("ts_utc", "")).encode()
+            if (self._since is not None and ts < self._since) or (self._until is not None and ts > self._until):
+                return False
+        return True
+
+
+def _json(value: Any) -> bytes:
+    return json.dumps(value).encode("utf-8")
+
+
+def _iter_mmap_lines(data_path: str) -> Iterator[bytes]:
+    with open(data_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos, end = 0, len(mm)
+            while pos < end:
+                nl = mm.find(b"\n", pos)
+                if nl < 0:
+                    nl = end
+                if nl > pos:
+                    yield mm[pos:nl]
+                pos = nl + 1
+
+
+def iter_raw_lines(path: str, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[bytes]:
+    """
+    Raw lines of the log and its sealed segments. Plain files are memory-mapped; gzip/lzma
+    segments are streamed. Segments outside since/until are skipped via the manifest.
+    """
+    for data_path in iter_segment_paths(path, since=since, until=until):
+        if data_path.endswith((".gz", ".xz")):
+            with open_segment(data_path) as f:
+                for line in f:
+                    yield line.rstrip(b"\n")
+        else:
+            yield from _iter_mmap_lines(data_path)
+
+
+def scan_records(
+    path: str, flt: ScanFilter = ScanFilter(), stats: Optional[Counter] = None
+) -> Iterator[dict[str, Any]]:
+    """Decoded records matching flt; stats (if given) counts scanned/decoded/matched lines."""
+    counts = stats if stats is not None else Counter()
+    raw_filter = not flt.empty
+    for line in iter_raw_lines(path, flt.since, flt.until):
+        if not line.strip():
+            continue
+        counts["scanned"] += 1
+        if raw_filter and not flt.matches_raw(line):
+            continue
+        counts["decoded"] += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            counts["malformed"] += 1
+            continue
+        if flt.matches(record):
+            counts["matched"] += 1
+            yield record
+
+
+def _group_values(record: dict[str, Any], name: str) -> Sequence[Any]:
+    layer4 = record.get("layer4") or {}
+    layer5 = record.get("layer5") or {}
+    if name == "action":
+        return (layer5.get("action"),)
+    if name == "layer4_allow":
+        return (layer4.get("allow"),)
+    if name == "layer5_allow":
+        return (layer5.get("allow"),)
+    if name == "reason":
+        reasons = [f"layer4:{r}" for r in layer4.get("reasons", ())]
+        reasons += [f"layer5:{r}" for r in layer5.get("reasons", ())]
+        return reasons or (None,)
+    if name in ("minute", "hour", "day"):
+        ts = str(record.get("ts_utc", ""))
+        return ({"minute": ts[:16], "hour": ts[:13], "day": ts[:10]}[name],)
+    return (record.get(name),)
+
+
+def _group_keys(record: dict[str, Any], group_by: Sequence[str]) -> list[Tuple[Any, ...]]:
+    keys: list[Tuple[Any, ...]] = [()]
+    for name in group_by:
+        keys = [k + (v,) for k in keys for v in _group_values(record, name)]
+    return keys
+
+
+def group_counts(
+    path: str, group_by: Sequence[str], flt: ScanFilter = ScanFilter(), max_groups: int = 100_000
+) -> GroupCounts:
+    """
+    Single streaming pass counting matching records per group. Memory is bounded by
+    max_groups; once reached, records for new groups are counted under (OTHER, ...).
+    With "reason" in group_by a record counts once per reason.
+    """
+    unknown = [g for g in group_by if g not in GROUP_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown group-by field(s): {', '.join(unknown)}")
+
+    group_by = tuple(group_by)
+    other = tuple(OTHER for _ in group_by)
+    counts: dict[Tuple[Any, ...], int] = {}
+    stats: Counter = Counter()
+    overflow = 0
+    for record in scan_records(path, flt, stats):
+        for key in _group_keys(record, group_by):
+            if key not in counts and len(counts) >= max_groups:
+                key = other
+                overflow += 1
+            counts[key] = counts.get(key, 0) + 1
+    return GroupCounts(
+        group_by=group_by,
+        counts=counts,
+        scanned=stats["scanned"],
+        matched=stats["matched"],
+        overflow=overflow,
+    )
+
+
+def _parse_bool(value: str) -> bool:
+    v = value.strip().lower()
+    if v in ("1", "true", "yes", "allow"):
+        return True
+    if v in ("0", "false", "no", "deny"):
+        return False
+    raise argparse.ArgumentTypeError(f"expected true/false, got {value!r}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="audit_log.scan", description="Scan and aggregate FusionIntel audit logs")
+    parser.add_argument("path", help="audit log path (sealed segments from its manifest are included)")
+    parser.add_argument("--action", action="append", default=[], help="Layer 5 action; repeatable")
+    parser.add_argument("--jurisdiction", action="append", default=[], help="repeatable")
+    parser.add_argument("--layer4-allow", type=_parse_bool)
+    parser.add_argument("--since", help="ISO-8601 lower bound on ts_utc")
+    parser.add_argument("--until", help="ISO-8601 upper bound on ts_utc")
+    parser.add_argument("--group-by", help=f"comma-separated subset of: {','.join(GROUP_FIELDS)}")
+    parser.add_argument("--max-groups", type=int, default=100_000)
+    parser.add_argument("--count", action="store_true", help="print only scanned/matched counts")
+    parser.add_argument(
+        "--rollups", action="store_true", help="answer --group-by from the per-minute rollup sidecars, not the log"
+    )
+    parser.add_argument("--rebuild-rollups", action="store_true", help="recompute the rollup sidecar from the log")
+    args = parser.parse_args(argv)
+
+    if args.rebuild_rollups:
+        n = rebuild_rollups(args.path)
+        sys.stdout.write(json.dumps({"path": args.path, "lines_rolled_up": n}, sort_keys=True) + "\n")
+        return 0
+    if args.rollups:
+        if not args.group_by or args.layer4_allow is not None:
+            parser.error("--rollups needs --group-by and does not support --layer4-allow")
+        try:
+            result = query_rollups(
+                args.path,
+                [f.strip() for f in args.group_by.split(",") if f.strip()],
+                actions=tuple(args.action),
+                jurisdictions=tuple(args.jurisdiction),
+                since=args.since,
+                until=args.until,
+                max_groups=args.max_groups,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        sys.stdout.write(json.dumps(result.to_dict(), sort_keys=True) + "\n")
+        return 0
+
+    try:
+        flt = ScanFilter(
+            actions=tuple(args.action),
+            jurisdictions=tuple(args.jurisdiction),
+            layer4_allow=args.layer4_allow,
+            since=args.since,
+            until=args.until,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.group_by:
+        fields = [f.strip() for f in args.group_by.split(",") if f.strip()]
+        try:
+            result = group_counts(args.path, fields, flt, max_groups=args.max_groups)
+        except ValueError as e:
+            parser.error(str(e))
+        sys.stdout.write(json.dumps(result.to_dict(), sort_keys=True) + "\n")
+        return 0
+
+    stats: Counter = Counter()
+    out = sys.stdout
+    for record in scan_records(args.path, flt, stats):
+        if not args.count:
+            out.write(json.dumps(record, sort_keys=True) + "\n")
+    if args.count:
+        out.write(json.dumps({"scanned": stats["scanned"], "matched": stats["matched"]}, sort_keys=True) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
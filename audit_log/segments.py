@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import gzip
+import json
+import lzma
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import IO, Any, Iterator, Optional
+
+MANIFEST_SUFFIX = ".manifest.json"
+WORKER_INFIX = ".worker-"
+
+_COMPRESSION_EXT = {"gzip": ".gz", "lzma": ".xz"}
+
+
+@dataclass(frozen=True)
+class RotationPolicy:
+    """
+    Native audit log rotation:
+      - max_bytes: seal the active file once it reaches this size
+      - interval_s: seal the active file once it has been open this long (wall clock)
+      - compression: None | "gzip" | "lzma"; sealed segments are compressed on a background thread
+    """
+
+    max_bytes: Optional[int] = None
+    interval_s: Optional[float] = None
+    compression: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.compression is not None and self.compression not in _COMPRESSION_EXT:
+            raise ValueError(f"unsupported compression: {self.compression}")
+
+
+def manifest_path(path: str) -> str:
+    return path + MANIFEST_SUFFIX
+
+
+class SegmentManifest:
+    """
+    JSON manifest listing the sealed segments of one audit log, oldest first.
+
+    Segment names are stored relative to the log's directory. Every change is written to
+    a temp file and os.replace()d, so readers always see a complete manifest. An entry is
+    added with "pending": true before its file is renamed into place, so a crash mid-seal
+    never leaves a segment the manifest does not know about; readers skip it until the file
+    exists, and the next AuditWriter adopts or drops it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.log_path = path
+        self.path = manifest_path(path)
+        self._lock = threading.Lock()
+        self.segments: list[dict[str, Any]] = []
+        self.active_started_at: Optional[float] = None
+        self.reload()
+
+    @property
+    def directory(self) -> str:
+        return os.path.dirname(os.path.abspath(self.log_path))
+
+    def reload(self) -> None:
+        with self._lock:
+            doc = load_manifest(self.log_path)
+            self.segments = list(doc.get("segments", []))
+            self.active_started_at = doc.get("active_started_at")
+
+    def next_seq(self) -> int:
+        return (self.segments[-1]["seq"] + 1) if self.segments else 1
+
+    def save(self) -> None:
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        doc = {"version": 1, "active_started_at": self.active_started_at, "segments": self.segments}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(doc, f, sort_keys=True, indent=1)
+        os.replace(tmp, self.path)
+
+    def add_segment(self, entry: dict[str, Any], active_started_at: float) -> None:
+        with self._lock:
+            self.segments.append(entry)
+            self.active_started_at = active_started_at
+            self._save_locked()
+
+    def commit_segment(self, seq: int, active_started_at: float) -> None:
+        """Clear the pending mark add_segment() was given before the rename."""
+        with self._lock:
+            for entry in self.segments:
+                if entry["seq"] == seq:
+                    entry.pop("pending", None)
+            self.active_started_at = active_started_at
+            self._save_locked()
+
+    def drop_segment(self, seq: int) -> None:
+        with self._lock:
+            self.segments = [entry for entry in self.segments if entry["seq"] != seq]
+            self._save_locked()
+
+    def update_segment(self, seq: int, **changes: Any) -> None:
+        with self._lock:
+            for entry in self.segments:
+                if entry["seq"] == seq:
+                    entry.update(changes)
+            self._save_locked()
+
+    def segment_file(self, entry: dict[str, Any]) -> str:
+        return os.path.join(self.directory, entry["name"])
+
+
+def worker_log_path(path: str, pid: Optional[int] = None) -> str:
+    """Per-process audit file `<path>.worker-<pid>` used when several workers share one target."""
+    return f"{path}{WORKER_INFIX}{os.getpid() if pid is None else pid}"
+
+
+def worker_log_paths(path: str) -> list[str]:
+    """Per-worker audit files of path (active file or manifest present), ordered by pid."""
+    directory = os.path.dirname(os.path.abspath(path))
+    prefix = re.escape(os.path.basename(path) + WORKER_INFIX)
+    pattern = re.compile(prefix + r"(\d+)(?:" + re.escape(MANIFEST_SUFFIX) + ")?$")
+    pids = set()
+    for name in os.listdir(directory):
+        m = pattern.match(name)
+        if m:
+            pids.add(int(m.group(1)))
+    return [worker_log_path(path, pid) for pid in sorted(pids)]
+
+
+def load_manifest(path: str) -> dict[str, Any]:
+    try:
+        with open(manifest_path(path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"version": 1, "segments": []}
+
+
+def compress_segment(src: str, compression: str) -> str:
+    """Compress src next to itself (atomically via a temp name) and return the new path."""
+    dst = src + _COMPRESSION_EXT[compression]
+    tmp = dst + ".tmp"
+    opener = gzip.open if compression == "gzip" else lzma.open
+    with open(src, "rb") as fin, opener(tmp, "wb") as fout:
+        shutil.copyfileobj(fin, fout, 1 << 20)
+    os.replace(tmp, dst)
+    return dst
+
+
+def open_segment(path: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    if path.endswith(".xz"):
+        return lzma.open(path, "rb")  # type: ignore[return-value]
+    return open(path, "rb")
+
+
+def _resolve_segment(directory: str, entry: dict[str, Any]) -> Optional[str]:
+    # The manifest may lag a background compression by one rename; try the other spelling.
+    candidate = os.path.join(directory, entry["name"])
+    if os.path.exists(candidate):
+        return candidate
+    for ext in _COMPRESSION_EXT.values():
+        if candidate.endswith(ext) and os.path.exists(candidate[: -len(ext)]):
+            return candidate[: -len(ext)]
+        if os.path.exists(candidate + ext):
+            return candidate + ext
+    return None
+
+
+def _utc(ts: str) -> datetime:
+    parsed = datetime.fromisoformat(ts)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def _overlaps(entry: dict[str, Any], since: Optional[str], until: Optional[str]) -> bool:
+    first_ts, last_ts = entry.get("first_ts"), entry.get("last_ts")
+    if not first_ts or not last_ts:
+        return True
+    if since is not None and _utc(last_ts) < _utc(since):
+        return False
+    return until is None or _utc(first_ts) <= _utc(until)
+
+
+def iter_segment_paths(
+    path: str, include_active: bool = True, since: Optional[str] = None, until: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Sealed segments oldest first, then the active file. With since/until (ISO-8601), sealed
+    segments whose recorded ts range falls entirely outside the window are skipped.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    for entry in load_manifest(path).get("segments", []):
+        if (since is not None or until is not None) and not _overlaps(entry, since, until):
+            continue
+        resolved = _resolve_segment(directory, entry)
+        if resolved is not None:
+            yield resolved
+    if include_active and os.path.exists(path):
+        yield path
+
+
+def iter_audit_lines(path: str) -> Iterator[bytes]:
+    """Every audit line across sealed (possibly compressed) segments and the active file."""
+    for segment in iter_segment_paths(path):
+        with open_segment(segment) as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+def iter_audit_records(path: str) -> Iterator[dict[str, Any]]:
+    for line in iter_audit_lines(path):
+        yield json.loads(line)
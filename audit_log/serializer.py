@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from json.encoder import encode_basestring_ascii
+from typing import TYPE_CHECKING, Any, Callable, Tuple
+
+if TYPE_CHECKING:
+    from .audit import AuditEvent
+
+# Same encoder json.dumps(..., sort_keys=True) builds on every call.
+_dumps_sorted = json.JSONEncoder(sort_keys=True).encode
+
+
+def _reference(event: "AuditEvent") -> str:
+    return json.dumps(event.to_dict(), sort_keys=True)
+
+
+def _bool(value: Any) -> str:
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    raise TypeError("non-bool allow flag")
+
+
+class AuditEventSerializer:
+    """
+    Writes the canonical audit line straight from AuditEvent fields.
+
+    The output is byte-identical to json.dumps(event.to_dict(), sort_keys=True): the key
+    fragments are emitted in sorted order as constants, and low-cardinality strings
+    (jurisdiction, residency class, producer, action) and reason tuples are escaped once
+    and cached. Events with values that are not plain str/bool fall back to the reference
+    encoder, so odd hand-built events still serialize exactly as before.
+    """
+
+    def __init__(self, max_cached: int = 4096) -> None:
+        self.max_cached = max_cached
+        self._strings: dict[str, str] = {}
+        self._reasons: dict[Tuple[str, ...], str] = {}
+
+    def _string(self, value: str) -> str:
+        enc = self._strings.get(value)
+        if enc is None:
+            enc = encode_basestring_ascii(value)
+            if len(self._strings) < self.max_cached:
+                self._strings[value] = enc
+        return enc
+
+    def _reason_list(self, reasons: Tuple[str, ...]) -> str:
+        enc = self._reasons.get(reasons)
+        if enc is None:
+            enc = "[" + ", ".join(encode_basestring_ascii(r) for r in reasons) + "]"
+            if len(self._reasons) < self.max_cached:
+                self._reasons[reasons] = enc
+        return enc
+
+    def serialize(self, event: "AuditEvent") -> str:
+        try:
+            payload = event.payload_snapshot
+            digest = event.payload_digest
+            return "".join(
+                (
+                    '{"artifact_id": ',
+                    encode_basestring_ascii(event.artifact_id),
+                    ', "jurisdiction": ',
+                    self._string(event.jurisdiction),
+                    ', "layer4": {"allow": ',
+                    _bool(event.layer4_allow),
+                    ', "reasons": ',
+                    self._reason_list(event.layer4_reasons),
+                    '}, "layer5": {"action": ',
+                    self._string(event.layer5_action),
+                    ', "allow": ',
+                    _bool(event.layer5_allow),
+                    ', "reasons": ',
+                    self._reason_list(event.layer5_reasons),
+                    "}" if digest is None else '}, "payload_digest": ' + encode_basestring_ascii(digest),
+                    ', "payload_snapshot": ',
+                    "null" if payload is None else _dumps_sorted(payload),
+                    ', "producer_layer": ',
+                    self._string(event.producer_layer),
+                    ', "residency_class": ',
+                    self._string(event.residency_class),
+                    ', "ts_utc": ',
+                    encode_basestring_ascii(event.ts_utc),
+                    "}",
+                )
+            )
+        except TypeError:
+            return _reference(event)
+
+
+class CoarseClock:
+    """
+    ts_utc source for batch mode: re-reads the wall clock every call but only formats a
+    new isoformat string once per resolution_s, so consecutive events share a timestamp.
+    """
+
+    def __init__(self, resolution_s: float = 0.001) -> None:
+        self.resolution_s = resolution_s
+        self._lock = threading.Lock()
+        self._until = 0.0
+        self._value = ""
+
+    def __call__(self) -> str:
+        now = time.time()
+        if now < self._until:
+            return self._value
+        with self._lock:
+            if now >= self._until:
+                self._value = datetime.fromtimestamp(now, timezone.utc).isoformat()
+                self._until = now + self.resolution_s
+            return self._value
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+Clock = Callable[[], str]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    from .audit import AuditEvent
+    from .writer import AuditWriterConfig
+
+# Audit targets spelled "sqlite:<path>" select the SQLite sink wherever a path is accepted.
+SQLITE_PREFIX = "sqlite:"
+SINK_KINDS = ("jsonl", "sqlite")
+
+
+class AuditSink(ABC):
+    """
+    Destination for Layer 6 audit events. Implementations may buffer; flush() makes
+    everything written so far durable to the configured degree and close() flushes.
+    """
+
+    path: str
+
+    @abstractmethod
+    def write(self, event: "AuditEvent") -> None: ...
+
+    def write_many(self, events: Iterable["AuditEvent"]) -> None:
+        for event in events:
+            self.write(event)
+
+    @abstractmethod
+    def flush(self) -> None: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+    @property
+    @abstractmethod
+    def closed(self) -> bool: ...
+
+    def __enter__(self) -> "AuditSink":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def sink_kind(path: str, kind: Optional[str] = None) -> str:
+    if kind:
+        if kind not in SINK_KINDS:
+            raise ValueError(f"unknown audit sink: {kind}")
+        return kind
+    return "sqlite" if path.startswith(SQLITE_PREFIX) else "jsonl"
+
+
+def open_audit_sink(
+    path: Optional[str], config: Optional["AuditWriterConfig"] = None, kind: Optional[str] = None
+) -> Optional[AuditSink]:
+    """
+    Open the sink for an audit target: JSONL AuditWriter by default, SqliteAuditSink for
+    kind="sqlite" or a "sqlite:" path. Returns None when no target is configured.
+    """
+    if not path:
+        return None
+    from .writer import AuditWriter, AuditWriterConfig
+
+    cfg = config if config is not None else AuditWriterConfig()
+    if sink_kind(path, kind) == "sqlite":
+        from .sqlite_sink import SqliteAuditSink
+
+        return SqliteAuditSink(path, cfg)
+    return AuditWriter(path, cfg)
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional
+
+from .audit import AuditEvent
+from .sink import SQLITE_PREFIX, AuditSink
+from .writer import AuditWriterConfig, FsyncPolicy
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_events (
+    id INTEGER PRIMARY KEY,
+    ts_utc TEXT NOT NULL,
+    artifact_id TEXT NOT NULL,
+    producer_layer TEXT NOT NULL,
+    jurisdiction TEXT NOT NULL,
+    residency_class TEXT NOT NULL,
+    layer4_allow INTEGER NOT NULL,
+    layer4_reasons TEXT NOT NULL,
+    layer5_action TEXT NOT NULL,
+    layer5_allow INTEGER NOT NULL,
+    layer5_reasons TEXT NOT NULL,
+    payload_snapshot TEXT,
+    payload_digest TEXT
+);
+CREATE INDEX IF NOT EXISTS audit_events_artifact_id ON audit_events (artifact_id);
+CREATE INDEX IF NOT EXISTS audit_events_ts_utc ON audit_events (ts_utc);
+CREATE INDEX IF NOT EXISTS audit_events_layer5_action ON audit_events (layer5_action);
+CREATE INDEX IF NOT EXISTS audit_events_jurisdiction ON audit_events (jurisdiction);
+"""
+
+_COLUMNS = (
+    "ts_utc",
+    "artifact_id",
+    "producer_layer",
+    "jurisdiction",
+    "residency_class",
+    "layer4_allow",
+    "layer4_reasons",
+    "layer5_action",
+    "layer5_allow",
+    "layer5_reasons",
+    "payload_snapshot",
+    "payload_digest",
+)
+_INSERT = f"INSERT INTO audit_events ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+def sqlite_db_path(path: str) -> str:
+    return path[len(SQLITE_PREFIX) :] if path.startswith(SQLITE_PREFIX) else path
+
+
+def _row(event: AuditEvent) -> tuple[Any, ...]:
+    return (
+        event.ts_utc,
+        event.artifact_id,
+        event.producer_layer,
+        event.jurisdiction,
+        event.residency_class,
+        int(event.layer4_allow),
+        json.dumps(list(event.layer4_reasons)),
+        event.layer5_action,
+        int(event.layer5_allow),
+        json.dumps(list(event.layer5_reasons)),
+        None if event.payload_snapshot is None else json.dumps(event.payload_snapshot, sort_keys=True),
+        event.payload_digest,
+    )
+
+
+class SqliteAuditSink(AuditSink):
+    """
+    Layer 6 audit sink backed by a stdlib sqlite3 database in WAL mode.
+
+    Events are buffered and inserted in one transaction per group commit, using the same
+    AuditWriterConfig batching knobs as the JSONL writer. fsync maps to PRAGMA synchronous
+    (none => NORMAL, batch/event => FULL; event also commits every row). artifact_id,
+    ts_utc, layer5_action and jurisdiction are indexed; reasons and payload_snapshot are
+    stored as JSON text. Rotation, the sidecar index, the hash chain and rollups are JSONL
+    features and are rejected; per_worker is ignored because SQLite already serializes writers from several
+    processes (each commit waits up to 30s for the database lock).
+    """
+
+    def __init__(self, path: str, config: AuditWriterConfig = AuditWriterConfig()) -> None:
+        if config.rotation is not None or config.index or config.chain is not None or config.rollups:
+            raise ValueError("rotation, index, chain and rollups apply to JSONL audit logs only")
+        self.path = path
+        self.db_path = sqlite_db_path(path)
+        self.config = config
+        self._lock = threading.RLock()
+        self._buffer: list[tuple[Any, ...]] = []
+        self._first_buffered_at: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        synchronous = "NORMAL" if config.fsync == FsyncPolicy.NONE else "FULL"
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(audit_events)")}
+        if "payload_digest" not in columns:
+            # databases created before content-addressed payloads
+            self._conn.execute("ALTER TABLE audit_events ADD COLUMN payload_digest TEXT")
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, event: AuditEvent) -> None:
+        row = _row(event)
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"audit sink is closed: {self.path}")
+            self._buffer.append(row)
+            if self._first_buffered_at is None:
+                self._first_buffered_at = time.monotonic()
+
+            cfg = self.config
+            if (
+                cfg.fsync == FsyncPolicy.EVENT
+                or len(self._buffer) >= cfg.max_batch_events
+                or cfg.max_latency_s <= 0
+                or time.monotonic() - self._first_buffered_at >= cfg.max_latency_s
+            ):
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(cfg.max_latency_s, self._flush_due)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def write_many(self, events: Iterable[AuditEvent]) -> None:
+        with self._lock:
+            for event in events:
+                self.write(event)
+
+    def _flush_due(self) -> None:
+        with self._lock:
+            self._timer = None
+            if not self._closed:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        conn = self._conn
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(_INSERT, self._buffer)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self._buffer.clear()
+        self._first_buffered_at = None
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._conn.close()
+            self._closed = True
+
+
+def shared_sqlite_sink(path: str) -> SqliteAuditSink:
+    """Write-through sink shared per database and process, for one-off write_audit_event calls."""
+    # Keyed by pid so forked pool workers never reuse the parent's SQLite connection.
+    return _shared_sqlite_sink(sqlite_db_path(path), os.getpid())
+
+
+@lru_cache(maxsize=32)
+def _shared_sqlite_sink(db_path: str, pid: int) -> SqliteAuditSink:
+    return SqliteAuditSink(db_path, AuditWriterConfig(max_latency_s=0))
+
+
+def iter_sqlite_records(path: str, where: str = "", params: Iterable[Any] = ()) -> Iterator[dict[str, Any]]:
+    """
+    Rows of an SQLite audit database in insertion order, shaped like AuditEvent.to_dict().
+    where is an optional SQL condition over the audit_events columns, e.g. "layer5_action = ?".
+    """
+    conn = sqlite3.connect(sqlite_db_path(path))
+    try:
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM audit_events"
+        if where:
+            sql += f" WHERE {where}"
+        for row in conn.execute(sql + " ORDER BY id", tuple(params)):
+            r = dict(zip(_COLUMNS, row))
+            record = {
+                "ts_utc": r["ts_utc"],
+                "artifact_id": r["artifact_id"],
+                "producer_layer": r["producer_layer"],
+                "jurisdiction": r["jurisdiction"],
+                "residency_class": r["residency_class"],
+                "layer4": {"allow": bool(r["layer4_allow"]), "reasons": json.loads(r["layer4_reasons"])},
+                "layer5": {
+                    "allow": bool(r["layer5_allow"]),
+                    "action": r["layer5_action"],
+                    "reasons": json.loads(r["layer5_reasons"]),
+                },
+                "payload_snapshot": (
+                    None if r["payload_snapshot"] is None else json.loads(r["payload_snapshot"])
+                ),
+            }
+            if r["payload_digest"] is not None:
+                record["payload_digest"] = r["payload_digest"]
+            yield record
+    finally:
+        conn.close()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+
+from .chain import verify_audit_chain
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="audit_log.verify", description="Verify the hash chain of a FusionIntel audit log and its segments"
+    )
+    parser.add_argument("path")
+    parser.add_argument("--workers", type=int, help="processes used to re-hash segments (default: CPU count)")
+    parser.add_argument("--key-file", metavar="PATH", help="HMAC key the chain was written with")
+    parser.add_argument("--key-env", metavar="NAME", help="read the HMAC key from this environment variable")
+    args = parser.parse_args(argv)
+
+    key = None
+    if args.key_file:
+        with open(args.key_file, "rb") as f:
+            key = f.read()
+    elif args.key_env:
+        key = os.environ.get(args.key_env, "").encode("utf-8") or None
+
+    report = verify_audit_chain(args.path, workers=args.workers, key=key)
+    print(json.dumps(report.to_dict(), sort_keys=True))
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
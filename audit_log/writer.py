@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Iterable, Optional, Protocol, Sequence
+
+from .audit import AuditEvent, serialize_audit_event
+from .chain import AuditChainer, ChainPolicy, recover_sealed_chain
+from .index import AuditIndexer, recover_sealed_index
+from .rollup import AuditRollup, recover_sealed_rollups
+from .segments import RotationPolicy, SegmentManifest, compress_segment, worker_log_path
+from .sink import AuditSink
+
+logger = logging.getLogger(__name__)
+
+
+class FsyncPolicy(str, Enum):
+    NONE = "none"
+    BATCH = "batch"
+    EVENT = "event"
+
+
+@dataclass(frozen=True)
+class AuditWriterConfig:
+    """
+    Group-commit knobs for AuditWriter:
+      - max_batch_events: flush once this many lines are buffered
+      - max_batch_bytes: flush once the buffered lines reach this size
+      - max_latency_s: flush at most this long after the first buffered line (0 => write through)
+      - fsync: none | batch (fsync after every group commit) | event (flush + fsync every line)
+      - rotation: optional size/interval rotation into sealed segments (see RotationPolicy)
+      - index: maintain the artifact_id / ts_utc sidecar index (see audit_log.index)
+      - chain: hash-chain every line with periodic checkpoints (see audit_log.chain)
+      - rollups: keep per-minute action/jurisdiction/reason counters (see audit_log.rollup)
+      - per_worker: append to `<path>.worker-<pid>` instead of path, so uvicorn/gunicorn workers
+        never share a file; `python -m audit_log.merge` combines them into one time-ordered log
+    """
+
+    max_batch_events: int = 256
+    max_batch_bytes: int = 1 << 20
+    max_latency_s: float = 1.0
+    fsync: FsyncPolicy = FsyncPolicy.NONE
+    rotation: Optional[RotationPolicy] = None
+    index: bool = False
+    per_worker: bool = False
+    chain: Optional[ChainPolicy] = None
+    rollups: bool = False
+
+
+class AuditObserver(Protocol):
+    """
+    Hook called by AuditWriter under its lock:
+      - on_commit: after a group commit hit the file; offset is where the first line starts
+      - on_seal: after the active file was renamed to sealed_path, before it is reopened
+    """
+
+    def on_commit(self, offset: int, lines: Sequence[bytes], events: Sequence[AuditEvent]) -> None: ...
+
+    def on_seal(self, sealed_path: str) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class AuditWriter(AuditSink):
+    """
+    Persistent JSONL audit writer.
+
+    Keeps one append handle open and buffers serialized lines, writing them out in group
+    commits. Thread-safe, so the CLI, the API threadpool and batch pipelines can share one
+    instance. Use as a context manager or call close() to flush the tail.
+
+    With a RotationPolicy the writer seals the active file itself: after a group commit
+    that crosses the size or age limit the file is renamed to `<path>.<seq>`, recorded in
+    `<path>.manifest.json`, and (optionally) compressed in the background.
+
+    path is the configured target; file_path is the file actually appended to, which differs
+    only in per_worker mode (rotation, manifest and index then follow the worker file).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        config: AuditWriterConfig = AuditWriterConfig(),
+        observers: Iterable[AuditObserver] = (),
+    ) -> None:
+        self.path = path
+        self.file_path = worker_log_path(path) if config.per_worker else path
+        self.config = config
+        self._lock = threading.RLock()
+        self._buffer: list[bytes] = []
+        self._buffered_events: list[AuditEvent] = []
+        self._buffered_bytes = 0
+        self._first_buffered_at: float | None = None
+        self._timer: threading.Timer | None = None
+        self._closed = False
+
+        self._manifest: Optional[SegmentManifest] = None
+        self._compressor: Optional[ThreadPoolExecutor] = None
+        self._active_lines = 0
+        self._active_first_ts: Optional[str] = None
+        self._active_last_ts: Optional[str] = None
+        rotation = config.rotation
+        if rotation is not None:
+            self._manifest = SegmentManifest(self.file_path)
+            self._recover_pending_segments()
+            if rotation.compression:
+                self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit-compress")
+
+        self._fh = open(self.file_path, "ab")
+        self._offset = self._fh.tell()
+        if self._manifest is not None:
+            if self._manifest.active_started_at is None or self._offset == 0:
+                self._manifest.active_started_at = time.time()
+                self._manifest.save()
+            if self._offset:
+                self._scan_active()
+
+        self._observers: list[AuditObserver] = list(observers)
+        if config.rollups:
+            self._observers.insert(0, AuditRollup(self.file_path))
+        if config.chain is not None:
+            self._observers.insert(0, AuditChainer(self.file_path, config.chain))
+        if config.index:
+            self._observers.insert(0, AuditIndexer(self.file_path))
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, event: AuditEvent) -> None:
+        line = (serialize_audit_event(event) + "\n").encode("utf-8")
+        with self._lock:
+            if self._manifest is not None:
+                if self._active_first_ts is None:
+                    self._active_first_ts = event.ts_utc
+                self._active_last_ts = event.ts_utc
+            self._append(line, event)
+
+    def write_many(self, events: Iterable[AuditEvent]) -> None:
+        with self._lock:
+            for event in events:
+                self.write(event)
+
+    def _append(self, line: bytes, event: AuditEvent) -> None:
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"audit writer is closed: {self.path}")
+
+            self._buffer.append(line)
+            if self._observers:
+                self._buffered_events.append(event)
+            self._buffered_bytes += len(line)
+            if self._first_buffered_at is None:
+                self._first_buffered_at = time.monotonic()
+
+            cfg = self.config
+            if (
+                cfg.fsync == FsyncPolicy.EVENT
+                or len(self._buffer) >= cfg.max_batch_events
+                or self._buffered_bytes >= cfg.max_batch_bytes
+                or (cfg.max_latency_s <= 0)
+                or (time.monotonic() - self._first_buffered_at >= cfg.max_latency_s)
+            ):
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(cfg.max_latency_s, self._flush_due)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_due(self) -> None:
+        with self._lock:
+            self._timer = None
+            if not self._closed:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+
+        self._fh.write(b"".join(self._buffer))
+        self._fh.flush()
+        if self.config.fsync != FsyncPolicy.NONE:
+            os.fsync(self._fh.fileno())
+
+        start = self._offset
+        self._offset += self._buffered_bytes
+        self._active_lines += len(self._buffer)
+        for observer in self._observers:
+            observer.on_commit(start, self._buffer, self._buffered_events)
+        self._buffer.clear()
+        self._buffered_events.clear()
+        self._buffered_bytes = 0
+        self._first_buffered_at = None
+
+        if self._rotation_due():
+            self._rotate_locked()
+
+    def _rotation_due(self) -> bool:
+        rotation = self.config.rotation
+        if rotation is None or self._manifest is None or self._offset == 0:
+            return False
+        if rotation.max_bytes is not None and self._offset >= rotation.max_bytes:
+            return True
+        started = self._manifest.active_started_at
+        return rotation.interval_s is not None and started is not None and time.time() - started >= rotation.interval_s
+
+    def _scan_active(self) -> None:
+        # Reopening a non-empty active file: recover its line count and ts range for the manifest.
+        with open(self.file_path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                self._active_lines += 1
+                try:
+                    ts = json.loads(line).get("ts_utc")
+                except ValueError:
+                    continue
+                if self._active_first_ts is None:
+                    self._active_first_ts = ts
+                self._active_last_ts = ts
+
+    def _recover_pending_segments(self) -> None:
+        # A previous writer died mid-seal. If the rename happened, finish what on_seal would
+        # have done to the sidecars and adopt the segment; otherwise the lines are still in
+        # the active file and the entry goes.
+        assert self._manifest is not None
+        for entry in [e for e in self._manifest.segments if e.get("pending")]:
+            sealed = self._manifest.segment_file(entry)
+            if not os.path.exists(sealed):
+                self._manifest.drop_segment(entry["seq"])
+                continue
+            if self.config.index:
+                recover_sealed_index(self.file_path, sealed)
+            if self.config.chain is not None:
+                recover_sealed_chain(self.file_path, sealed, self.config.chain)
+            if self.config.rollups:
+                recover_sealed_rollups(self.file_path, sealed)
+            self._manifest.commit_segment(entry["seq"], active_started_at=time.time())
+
+    def _rotate_locked(self) -> None:
+        assert self._manifest is not None and self.config.rotation is not None
+        manifest = self._manifest
+        seq = manifest.next_seq()
+        name = f"{os.path.basename(self.file_path)}.{seq:06d}"
+        sealed = os.path.join(manifest.directory, name)
+
+        manifest.add_segment(
+            {
+                "seq": seq,
+                "name": name,
+                "compression": None,
+                "bytes": self._offset,
+                "lines": self._active_lines,
+                "first_ts": self._active_first_ts,
+                "last_ts": self._active_last_ts,
+                "sealed_at": datetime.now(timezone.utc).isoformat(),
+                "pending": True,
+            },
+            active_started_at=manifest.active_started_at or time.time(),
+        )
+        self._fh.close()
+        os.replace(self.file_path, sealed)
+        for observer in self._observers:
+            observer.on_seal(sealed)
+        manifest.commit_segment(seq, active_started_at=time.time())
+
+        self._fh = open(self.file_path, "ab")
+        self._offset = 0
+        self._active_lines = 0
+        self._active_first_ts = None
+        self._active_last_ts = None
+
+        compression = self.config.rotation.compression
+        if compression and self._compressor is not None:
+            future = self._compressor.submit(self._compress, seq, sealed, compression)
+            future.add_done_callback(lambda f: self._compress_done(f, sealed))
+
+    def _compress(self, seq: int, sealed: str, compression: str) -> None:
+        assert self._manifest is not None
+        compressed = compress_segment(sealed, compression)
+        self._manifest.update_segment(seq, name=os.path.basename(compressed), compression=compression)
+        os.remove(sealed)
+
+    @staticmethod
+    def _compress_done(future: Future[None], sealed: str) -> None:
+        # The manifest entry is only renamed once compression succeeds, so a failure leaves the
+        # sealed segment readable as-is.
+        exc = future.exception()
+        if exc is not None:
+            logger.error("compression of audit segment %s failed; left uncompressed", sealed, exc_info=exc)
+
+    def rotate(self) -> None:
+        """Seal the active file now (no-op without a RotationPolicy or when it is empty)."""
+        with self._lock:
+            if self._closed or self._manifest is None:
+                return
+            self._flush_locked()
+            if self._offset:
+                self._rotate_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._fh.close()
+            for observer in self._observers:
+                observer.close()
+            self._closed = True
+        if self._compressor is not None:
+            self._compressor.shutdown(wait=True)
+
+    def __enter__(self) -> "AuditWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def open_audit_writer(path: Optional[str], config: AuditWriterConfig = AuditWriterConfig()) -> Optional[AuditWriter]:
+    if not path:
+        return None
+    return AuditWriter(path, config)
@@ -0,0 +1 @@
+# Performance harness (not shipped with the package).
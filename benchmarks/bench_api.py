@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+In-process load harness for api.main:app.
+
+Drives the app through httpx.ASGITransport (no sockets, runs offline) or, with
+--target uvicorn, through a local uvicorn server on a free port (uvicorn must be
+installed). --target URL sends the same load to an already running server.
+
+Each scenario is one request path x auth setting, run with --concurrency client
+tasks until --requests have completed:
+  - inline:   POST /v1/process with the full policy in every request
+  - registry: PUT /v1/policies once, then POST /v1/process with its policy_id
+  - batch:    PUT /v1/policies once, then POST /v1/process:batch with --batch-size
+              NDJSON envelopes per request (items_per_s counts envelopes)
+
+Bodies come from the seeded synthetic generator, so --payload-bytes, --zipf and
+--deny-ratio shape the mix. One JSON line per scenario reports throughput, error
+rate and latency percentiles. error_rate is per item: a batch response counts each
+{"error": ...} line (and every envelope a fatal line cut off) as a failed item.
+
+    python -m benchmarks.bench_api --requests 5000 --concurrency 1,16,64
+    python -m benchmarks.bench_api --paths registry --auth on,off --payload-bytes 64,4096,65536
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import json
+import os
+import socket
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Sequence
+
+import httpx
+
+from .synthetic import JURISDICTIONS, RESIDENCY_CLASSES, SyntheticConfig, generate_envelopes
+
+PATHS = ("inline", "registry", "batch")
+API_KEY = "bench-secret"
+
+
+def policy_raw() -> dict[str, Any]:
+    """benchmarks.synthetic.default_policy() in the API's JSON policy shape."""
+    return {
+        "layer4": {
+            "allowed_jurisdictions": list(JURISDICTIONS[:6]),
+            "allowed_residency_classes": list(RESIDENCY_CLASSES[:3]),
+            "blocked_export_control_flags": ["ITAR"],
+            "blocked_sanctions_flags": ["SDN"],
+        },
+        "layer5": {
+            "blocked_sanctions_flags": ["SDN", "OFAC"],
+            "quarantine_export_control_flags": ["NLR", "5A002"],
+            "quarantine_sanctions_flags": ["review"],
+            "require_layer4_allow": True,
+        },
+        "layer6": {"include_payload": False},
+    }
+
+
+def envelope_bodies(n: int, seed: int, config: SyntheticConfig) -> list[dict[str, Any]]:
+    out = []
+    for env in generate_envelopes(n, seed=seed, config=config):
+        raw = dataclasses.asdict(env)
+        raw.pop("provenance_ref")
+        out.append(raw)
+    return out
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(q / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+@dataclasses.dataclass
+class LoadResult:
+    latencies_s: list[float] = dataclasses.field(default_factory=list)
+    statuses: dict[str, int] = dataclasses.field(default_factory=dict)
+    items: int = 0
+    item_errors: int = 0
+    seconds: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(n for status, n in self.statuses.items() if status != "200")
+
+    def summary(self) -> dict[str, Any]:
+        lat = sorted(self.latencies_s)
+        ms = lambda v: round(v * 1000.0, 3)  # noqa: E731
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "items": self.items,
+            "item_errors": self.item_errors,
+            "error_rate": round(self.item_errors / self.items, 4) if self.items else 0.0,
+            "statuses": dict(sorted(self.statuses.items())),
+            "seconds": round(self.seconds, 3),
+            "rps": round(self.requests / self.seconds, 1) if self.seconds else 0.0,
+            "p50_ms": ms(percentile(lat, 50)),
+            "p90_ms": ms(percentile(lat, 90)),
+            "p99_ms": ms(percentile(lat, 99)),
+            "max_ms": ms(lat[-1]) if lat else 0.0,
+        }
+
+
+RequestFn = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def failed_items(response: httpx.Response, items_per_request: int) -> int:
+    """Items of one response that did not produce a result; a non-200 response fails them all."""
+    if response.status_code != 200:
+        return items_per_request
+    if not response.headers.get("content-type", "").startswith("application/x-ndjson"):
+        return 0
+    lines = [json.loads(line) for line in response.content.splitlines() if line.strip()]
+    errors = sum(1 for line in lines if "error" in line)
+    # a fatal line ends the stream early; the envelopes after it were never evaluated
+    return errors + max(0, items_per_request - len(lines))
+
+
+async def run_load(
+    client: httpx.AsyncClient, send: RequestFn, total: int, concurrency: int, items_per_request: int = 1
+) -> LoadResult:
+    """total requests over `concurrency` tasks sharing one counter; transport errors count as "error"."""
+    result = LoadResult()
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        for i in counter:
+            t0 = time.perf_counter()
+            try:
+                response = await send(client, i)
+                status, failed = str(response.status_code), failed_items(response, items_per_request)
+            except httpx.HTTPError:
+                status, failed = "error", items_per_request
+            result.latencies_s.append(time.perf_counter() - t0)
+            result.statuses[status] = result.statuses.get(status, 0) + 1
+            result.items += items_per_request
+            result.item_errors += failed
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.seconds = time.perf_counter() - t0
+    return result
+
+
+async def make_sender(
+    client: httpx.AsyncClient, path: str, bodies: Sequence[dict[str, Any]], headers: dict[str, str], batch_size: int
+) -> RequestFn:
+    policy = policy_raw()
+    url, content_type = "/v1/process", "application/json"
+    if path == "inline":
+        payloads = [json.dumps({"policy": policy, "envelope": b}).encode("utf-8") for b in bodies]
+    else:
+        r = await client.put("/v1/policies", json=policy, headers=headers)
+        r.raise_for_status()
+        policy_id = r.json()["policy_id"]
+        if path == "registry":
+            payloads = [json.dumps({"policy_id": policy_id, "envelope": b}).encode("utf-8") for b in bodies]
+        elif path == "batch":
+            url, content_type = f"/v1/process:batch?policy_id={policy_id}", "application/x-ndjson"
+            lines = [json.dumps(b).encode("utf-8") for b in bodies]
+            payloads = [
+                b"\n".join(lines[(start + k) % len(lines)] for k in range(batch_size)) + b"\n"
+                for start in range(0, len(lines), batch_size)
+            ]
+        else:
+            raise ValueError(f"unknown path: {path}")
+    post_headers = {**headers, "content-type": content_type}
+
+    def send(c: httpx.AsyncClient, i: int) -> Awaitable[httpx.Response]:
+        return c.post(url, content=payloads[i % len(payloads)], headers=post_headers)
+
+    return send
+
+
+@contextlib.asynccontextmanager
+async def asgi_client() -> AsyncIterator[httpx.AsyncClient]:
+    from api.main import app
+
+    # ASGITransport does not send lifespan events; run the app's lifespan around the load.
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            yield client
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def uvicorn_client(concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    import uvicorn
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config("api.main:app", host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("uvicorn failed to start")
+            await asyncio.sleep(0.01)
+        async with url_client(f"http://127.0.0.1:{port}", concurrency) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+@contextlib.asynccontextmanager
+async def url_client(url: str, concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        yield client
+
+
+async def run_scenarios(args: argparse.Namespace, bodies: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    rows = []
+    for auth in args.auth:
+        # in-process targets read the key from the environment on every request
+        if args.target in ("asgi", "uvicorn"):
+            if auth:
+                os.environ["FUSIONINTEL_API_KEY"] = API_KEY
+            else:
+                os.environ.pop("FUSIONINTEL_API_KEY", None)
+        headers = {"x-api-key": args.api_key or API_KEY} if auth else {}
+        for concurrency in args.concurrency:
+            if args.target == "asgi":
+                cm = asgi_client()
+            elif args.target == "uvicorn":
+                cm = uvicorn_client(concurrency)
+            else:
+                cm = url_client(args.target, concurrency)
+            async with cm as client:
+                for path in args.paths:
+                    send = await make_sender(client, path, bodies, headers, args.batch_size)
+                    per_request = args.batch_size if path == "batch" else 1
+                    if args.warmup:
+                        await run_load(client, send, args.warmup, concurrency, per_request)
+                    result = await run_load(client, send, args.requests, concurrency, per_request)
+                    summary = result.summary()
+                    rows.append(
+                        {
+                            "target": args.target,
+                            "path": path,
+                            "auth": auth,
+                            "concurrency": concurrency,
+                            **summary,
+                            "items_per_s": round(summary["rps"] * per_request, 1),
+                        }
+                    )
+    return rows
+
+
+def _ints(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _auth(value: str) -> list[bool]:
+    flags = {"on": True, "off": False}
+    try:
+        return [flags[v.strip()] for v in value.split(",") if v.strip()]
+    except KeyError:
+        raise argparse.ArgumentTypeError("expected on, off or on,off") from None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="asgi", help="asgi (default), uvicorn, or a base URL")
+    parser.add_argument("--paths", default=",".join(PATHS), help=f"comma-separated subset of {','.join(PATHS)}")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--batch-size", type=int, default=100, help="envelopes per batch request")
+    parser.add_argument("--warmup", type=int, default=100, help="untimed requests before each scenario")
+    parser.add_argument("--concurrency", type=_ints, default=[1, 16, 64])
+    parser.add_argument("--auth", type=_auth, default=[False], help="on, off or on,off")
+    parser.add_argument("--api-key", help=f"x-api-key for --target URL (default {API_KEY})")
+    parser.add_argument("--envelopes", type=int, default=1000, help="distinct bodies, reused round-robin")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--payload-bytes", type=_ints, default=[64, 1024])
+    parser.add_argument("--deny-ratio", type=float)
+    args = parser.parse_args(argv)
+
+    args.paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+    unknown = [p for p in args.paths if p not in PATHS]
+    if unknown:
+        parser.error(f"unknown path(s): {', '.join(unknown)}")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be >= 1")
+    if args.target == "uvicorn":
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            parser.error("--target uvicorn requires uvicorn to be installed")
+    elif args.target != "asgi" and not args.target.startswith(("http://", "https://")):
+        parser.error("--target must be asgi, uvicorn or an http(s):// URL")
+
+    config = SyntheticConfig(zipf_s=args.zipf, payload_bytes=tuple(args.payload_bytes), deny_ratio=args.deny_ratio)
+    bodies = envelope_bodies(args.envelopes, args.seed, config)
+    for row in asyncio.run(run_scenarios(args, bodies)):
+        print(json.dumps(row, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+/v1/process versus /v1/process:fast for payloads from 1 KB to 1 MB.
+
+Both routes get byte-identical request bodies through httpx.ASGITransport. The envelope
+payload is nested JSON (a list of small records), which is what pydantic has to walk on the
+regular route. Per size and route it reports latency percentiles from a timed pass (the
+routes alternate request by request) and, from a separate tracemalloc pass, the peak bytes
+allocated by one request and the bytes still held afterwards.
+
+    python -m benchmarks.bench_api_fastpath --sizes 1024,16384,131072,1048576 --requests 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import Any
+
+import httpx
+
+from .bench_api import asgi_client, percentile, policy_raw
+
+ROUTES = ("/v1/process", "/v1/process:fast")
+
+
+def nested_payload(target_bytes: int) -> dict[str, Any]:
+    record = {"id": 0, "name": "sensor-reading", "value": 12.5, "ok": True, "tags": ["a", "b", "c"]}
+    per_record = len(json.dumps(record)) + 2
+    return {
+        "items": [dict(record, id=i) for i in range(max(1, target_bytes // per_record))],
+        "source": "bench",
+    }
+
+
+def request_body(size: int) -> bytes:
+    envelope = {
+        "artifact_id": f"fp-{size}",
+        "artifact_type": "intel",
+        "producer_layer": "layer3",
+        "payload": nested_payload(size),
+        "metadata": {"m": "n"},
+        "jurisdiction_tags": {
+            "jurisdiction": "US",
+            "residency_class": "domestic",
+            "export_control_flags": ["EAR99"],
+            "sanctions_flags": [],
+        },
+    }
+    return json.dumps({"policy": policy_raw(), "envelope": envelope}).encode("utf-8")
+
+
+async def _post(client: httpx.AsyncClient, route: str, body: bytes) -> float:
+    t0 = time.perf_counter()
+    r = await client.post(route, content=body, headers={"content-type": "application/json"})
+    elapsed = time.perf_counter() - t0
+    r.raise_for_status()
+    return elapsed
+
+
+async def _allocations(client: httpx.AsyncClient, route: str, body: bytes, requests: int) -> tuple[int, int]:
+    """(peak bytes above the pre-request baseline, bytes still held after the requests)."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    peak = 0
+    for _ in range(requests):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        await client.post(route, content=body, headers={"content-type": "application/json"})
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return peak, retained
+
+
+async def _run(sizes: list[int], requests: int, warmup: int) -> list[dict[str, Any]]:
+    ms = lambda v: round(v * 1000.0, 3)  # noqa: E731
+    rows = []
+    async with asgi_client() as client:
+        for size in sizes:
+            body = request_body(size)
+            latencies: dict[str, list[float]] = {route: [] for route in ROUTES}
+            for i in range(warmup + requests):
+                # alternate routes so drift (GC, caches, frequency) hits both equally
+                for route in ROUTES:
+                    elapsed = await _post(client, route, body)
+                    if i >= warmup:
+                        latencies[route].append(elapsed)
+            for route in ROUTES:
+                lat = sorted(latencies[route])
+                # separate pass: tracemalloc slows everything it traces
+                peak, retained = await _allocations(client, route, body, max(1, min(requests, 20)))
+                rows.append(
+                    {
+                        "payload_bytes": size,
+                        "body_bytes": len(body),
+                        "route": route,
+                        "p50_ms": ms(percentile(lat, 50)),
+                        "p99_ms": ms(percentile(lat, 99)),
+                        "mean_ms": ms(sum(lat) / len(lat)),
+                        "peak_alloc_kb": round(peak / 1024, 1),
+                        "retained_kb": round(retained / 1024, 1),
+                    }
+                )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1024,16384,131072,1048576", help="comma-separated payload sizes")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per size and route")
+    parser.add_argument("--warmup", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    sizes = [int(v) for v in args.sizes.split(",") if v.strip()]
+    for row in asyncio.run(_run(sizes, args.requests, args.warmup)):
+        print(json.dumps(row, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
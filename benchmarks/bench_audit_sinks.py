@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Audit write throughput of the JSONL AuditWriter versus the SQLite sink.
+
+    python -m benchmarks.bench_audit_sinks --events 200000 --batch 1,64,256,1024 --fsync none,batch
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from audit_log import AuditWriterConfig, FsyncPolicy, build_audit_event, open_audit_sink
+from orchestrator import evaluate_layers
+
+from .synthetic import default_policy, generate_envelopes
+
+
+def _footprint(path: str) -> int:
+    # data file plus any sidecars (SQLite -wal/-shm)
+    directory, base = os.path.split(path)
+    return sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory) if f.startswith(base))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--batch", default="1,256,1024", help="comma-separated max_batch_events values")
+    parser.add_argument("--fsync", default="none", help="comma-separated fsync policies")
+    args = parser.parse_args(argv)
+
+    policy = default_policy()
+    events = []
+    for env in generate_envelopes(args.events):
+        layer4, layer5 = evaluate_layers(env, policy.layer4, policy.layer5)
+        events.append(build_audit_event(env, layer4, layer5, policy.layer6))
+
+    rows = []
+    with tempfile.TemporaryDirectory() as td:
+        for fsync in [FsyncPolicy(f.strip()) for f in args.fsync.split(",") if f.strip()]:
+            for batch in sorted({int(b) for b in args.batch.split(",") if b.strip()}):
+                for kind, name in (("jsonl", "audit.jsonl"), ("sqlite", "audit.db")):
+                    path = os.path.join(td, f"{fsync.value}-{batch}-{name}")
+                    sink = open_audit_sink(path, AuditWriterConfig(max_batch_events=batch, fsync=fsync), kind=kind)
+                    assert sink is not None
+                    t0 = time.perf_counter()
+                    with sink:
+                        sink.write_many(events)
+                    elapsed = time.perf_counter() - t0
+                    rows.append(
+                        {
+                            "sink": kind,
+                            "fsync": fsync.value,
+                            "batch": batch,
+                            "seconds": round(elapsed, 3),
+                            "per_sec": round(len(events) / elapsed),
+                            "bytes": _footprint(path),
+                        }
+                    )
+
+    for row in rows:
+        print(json.dumps(row, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
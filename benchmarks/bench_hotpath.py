@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Hot-path micro-benchmarks with a JSON baseline for regression checks.
+
+Cases: evaluate_sovereignty, evaluate_delivery_action, build_audit_event, write_audit_event
+(one open-append per event) and an end-to-end process_envelope with a persistent AuditWriter.
+Each case runs over the same seeded synthetic envelopes; the best of --repeat runs is kept.
+
+    python -m benchmarks.bench_hotpath --save /tmp/baseline.json
+    python -m benchmarks.bench_hotpath --compare /tmp/baseline.json --tolerance 0.15
+
+Compare mode exits 1 when any case is slower than baseline * (1 + tolerance).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Any, Callable, Sequence
+
+from audit_log import AuditWriter, build_audit_event, write_audit_event
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import evaluate_delivery_action
+from orchestrator import process_envelope
+from sovereignty_compliance import evaluate_sovereignty
+
+from .synthetic import SyntheticConfig, default_policy, generate_envelopes
+
+CASES = (
+    "evaluate_sovereignty",
+    "evaluate_delivery_action",
+    "build_audit_event",
+    "write_audit_event",
+    "process_envelope",
+)
+
+
+def _case(name: str, envelopes: Sequence[ArtifactEnvelope], td: str) -> Callable[[], None]:
+    policy = default_policy()
+    l4p, l5p, l6p = policy.layer4, policy.layer5, policy.layer6
+    decisions = [(evaluate_sovereignty(e, l4p), evaluate_delivery_action(e, l5p)) for e in envelopes]
+    if name == "evaluate_sovereignty":
+        return lambda: [evaluate_sovereignty(e, l4p) for e in envelopes] and None
+    if name == "evaluate_delivery_action":
+        return lambda: [evaluate_delivery_action(e, l5p) for e in envelopes] and None
+    if name == "build_audit_event":
+        return lambda: [build_audit_event(e, l4, l5, l6p) for e, (l4, l5) in zip(envelopes, decisions)] and None
+    if name == "write_audit_event":
+        events = [build_audit_event(e, l4, l5, l6p) for e, (l4, l5) in zip(envelopes, decisions)]
+        path = os.path.join(td, "write_audit_event.jsonl")
+
+        def run() -> None:
+            for ev in events:
+                write_audit_event(path, ev)
+
+        return run
+    if name == "process_envelope":
+        path = os.path.join(td, "process_envelope.jsonl")
+
+        def run() -> None:
+            with AuditWriter(path) as writer:
+                for e in envelopes:
+                    process_envelope(e, policy, audit_writer=writer)
+
+        return run
+    raise ValueError(f"unknown case: {name}")
+
+
+def run_suite(cases: Sequence[str], n: int, seed: int, config: SyntheticConfig, repeat: int) -> dict[str, Any]:
+    envelopes = list(generate_envelopes(n, seed=seed, config=config))
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as td:
+        for name in cases:
+            fn = _case(name, envelopes, td)
+            best = float("inf")
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                fn()
+                best = min(best, time.perf_counter() - t0)
+            results[name] = {"ns_per_op": round(best / n * 1e9, 1), "ops_per_sec": round(n / best)}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "n": n,
+            "seed": seed,
+            "repeat": repeat,
+            "config": asdict(config),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[dict[str, Any]]:
+    """Per-case ratio of current to baseline ns/op; regressed when ratio > 1 + tolerance."""
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        ratio = cur["ns_per_op"] / base["ns_per_op"] if base["ns_per_op"] else float("inf")
+        rows.append(
+            {
+                "case": name,
+                "baseline_ns": base["ns_per_op"],
+                "current_ns": cur["ns_per_op"],
+                "ratio": round(ratio, 3),
+                "regressed": ratio > 1.0 + tolerance,
+            }
+        )
+    return rows
+
+
+def _sizes(value: str) -> tuple[int, ...]:
+    return tuple(int(v) for v in value.split(",") if v.strip())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--envelopes", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", default=",".join(CASES))
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent over jurisdictions (0 => uniform)")
+    parser.add_argument("--max-export-flags", type=int, default=2)
+    parser.add_argument("--max-sanctions-flags", type=int, default=1)
+    parser.add_argument("--payload-bytes", type=_sizes, default=(64, 1024), help="comma-separated body sizes")
+    parser.add_argument("--deny-ratio", type=float, help="share of envelopes the default policy denies")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown per case (0.10 => 10%%)")
+    args = parser.parse_args(argv)
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+    config = SyntheticConfig(
+        zipf_s=args.zipf,
+        max_export_flags=args.max_export_flags,
+        max_sanctions_flags=args.max_sanctions_flags,
+        payload_bytes=args.payload_bytes,
+        deny_ratio=args.deny_ratio,
+    )
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        # measure the same workload the baseline was taken with
+        meta = baseline.get("meta", {})
+        if "config" in meta:
+            cfg = dict(meta["config"])
+            for key in ("jurisdictions", "residency_classes", "payload_bytes"):
+                cfg[key] = tuple(cfg[key])
+            config = SyntheticConfig(**cfg)
+            args.envelopes, args.seed = meta.get("n", args.envelopes), meta.get("seed", args.seed)
+
+    current = run_suite(cases, args.envelopes, args.seed, config, args.repeat)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, sort_keys=True, indent=1)
+
+    if baseline is None:
+        for name, row in current["results"].items():
+            print(json.dumps({"case": name, **row}, sort_keys=True))
+        return 0
+
+    rows = compare(current, baseline, args.tolerance)
+    for row in rows:
+        print(json.dumps(row, sort_keys=True))
+    regressed = [r["case"] for r in rows if r["regressed"]]
+    if regressed:
+        print(f"regressed beyond {args.tolerance:.0%}: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Aggregate audit throughput with N processes appending at once, as under uvicorn --workers N.
+
+Modes:
+  per_worker  each process appends to <path>.worker-<pid>; the logs are then merged
+  shared      every process opens the same file with its own AuditWriter (the unsafe default)
+
+After each run every line is parsed and counted, so torn or interleaved lines show up as
+"corrupt" and lost ones as a shortfall against "expected".
+
+    python -m benchmarks.bench_multiworker --events 50000 --workers 1,2,4,8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+from audit_log import AuditWriter, AuditWriterConfig, build_audit_event, iter_audit_lines
+from audit_log.merge import merge_audit_logs
+from orchestrator import evaluate_layers
+
+from .synthetic import default_policy, generate_envelopes
+
+
+def _worker(path: str, per_worker: bool, events: int, seed: int, start, results) -> None:  # type: ignore[no-untyped-def]
+    policy = default_policy()
+    batch = []
+    for env in generate_envelopes(events, seed=seed):
+        layer4, layer5 = evaluate_layers(env, policy.layer4, policy.layer5)
+        batch.append(build_audit_event(env, layer4, layer5, policy.layer6))
+    start.wait()
+    t0 = time.time()
+    with AuditWriter(path, AuditWriterConfig(per_worker=per_worker)) as writer:
+        for event in batch:
+            writer.write(event)
+    results.put((t0, time.time()))
+
+
+def _verify(path: str) -> tuple[int, int]:
+    ok = corrupt = 0
+    for line in iter_audit_lines(path):
+        try:
+            json.loads(line)["artifact_id"]
+            ok += 1
+        except (ValueError, KeyError, TypeError):
+            corrupt += 1
+    return ok, corrupt
+
+
+def _run(td: str, mode: str, workers: int, events: int) -> dict[str, object]:
+    path = os.path.join(td, f"{mode}-{workers}.jsonl")
+    start = mp.Barrier(workers)
+    results: mp.Queue = mp.Queue()
+    procs = [
+        mp.Process(target=_worker, args=(path, mode == "per_worker", events, seed, start, results))
+        for seed in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    spans = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    elapsed = max(end for _, end in spans) - min(begin for begin, _ in spans)
+
+    merge_s = 0.0
+    if mode == "per_worker":
+        merged = path + ".merged"
+        t0 = time.perf_counter()
+        merge_audit_logs(path, merged, remove_inputs=True)
+        merge_s = time.perf_counter() - t0
+        path = merged
+    ok, corrupt = _verify(path)
+    return {
+        "mode": mode,
+        "workers": workers,
+        "expected": workers * events,
+        "lines_ok": ok,
+        "corrupt": corrupt,
+        "seconds": round(elapsed, 3),
+        "per_sec": round(workers * events / elapsed),
+        "merge_seconds": round(merge_s, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=50_000, help="events per worker")
+    parser.add_argument("--workers", default=",".join(str(w) for w in (1, 2, 4, os.cpu_count() or 1)))
+    parser.add_argument("--modes", default="per_worker,shared")
+    args = parser.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as td:
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            for workers in sorted({int(w) for w in args.workers.split(",") if w.strip()}):
+                rows.append(_run(td, mode, workers, args.events))
+    for row in rows:
+        print(json.dumps(row, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Throughput of process_envelopes_parallel versus the serial process_envelopes.
+
+    python -m benchmarks.bench_parallel --envelopes 200000 --workers 1,2,4,8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from orchestrator import process_envelopes, process_envelopes_parallel
+
+from .synthetic import default_policy, generate_envelopes
+
+
+def _drain(results) -> int:
+    n = 0
+    for _ in results:
+        n += 1
+    return n
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--envelopes", type=int, default=100_000)
+    parser.add_argument("--workers", default=",".join(str(w) for w in (1, 2, 4, os.cpu_count() or 1)))
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--audit", action="store_true", help="also write the audit log")
+    args = parser.parse_args(argv)
+
+    policy = default_policy()
+    rows = []
+    with tempfile.TemporaryDirectory() as td:
+        audit_path = os.path.join(td, "audit.jsonl") if args.audit else None
+
+        t0 = time.perf_counter()
+        n = _drain(process_envelopes(generate_envelopes(args.envelopes), policy, audit_log_path=audit_path))
+        serial_s = time.perf_counter() - t0
+        rows.append({"mode": "serial", "workers": 1, "seconds": round(serial_s, 3), "per_sec": round(n / serial_s)})
+
+        for workers in sorted({int(w) for w in args.workers.split(",") if w.strip()}):
+            t0 = time.perf_counter()
+            n = _drain(
+                process_envelopes_parallel(
+                    generate_envelopes(args.envelopes),
+                    policy,
+                    audit_log_path=audit_path,
+                    workers=workers,
+                    chunk_size=args.chunk_size,
+                )
+            )
+            elapsed = time.perf_counter() - t0
+            rows.append(
+                {
+                    "mode": "parallel",
+                    "workers": workers,
+                    "seconds": round(elapsed, 3),
+                    "per_sec": round(n / elapsed),
+                    "speedup_vs_serial": round(serial_s / elapsed, 2),
+                }
+            )
+
+    for row in rows:
+        print(json.dumps(row, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import itertools
+import random
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+
+from contracts.schemas import ArtifactEnvelope, JurisdictionTags
+from delivery_action import DeliveryPolicy
+from orchestrator import OrchestratorPolicy
+from sovereignty_compliance import SovereigntyPolicy
+
+JURISDICTIONS = ("US", "ZA", "DE", "GB", "FR", "JP", "CN", "RU")
+RESIDENCY_CLASSES = ("domestic", "restricted", "public", "foreign")
+EXPORT_FLAGS = ("EAR99", "NLR", "ITAR", "5A002", "3A001")
+SANCTIONS_FLAGS = ("none", "review", "SDN", "OFAC")
+
+
+def default_policy() -> OrchestratorPolicy:
+    return OrchestratorPolicy(
+        layer4=SovereigntyPolicy.from_iterables(
+            allowed_jurisdictions=JURISDICTIONS[:6],
+            allowed_residency_classes=RESIDENCY_CLASSES[:3],
+            blocked_export_control_flags=("ITAR",),
+            blocked_sanctions_flags=("SDN",),
+        ),
+        layer5=DeliveryPolicy.from_iterables(
+            blocked_sanctions_flags=("SDN", "OFAC"),
+            quarantine_export_control_flags=("NLR", "5A002"),
+            quarantine_sanctions_flags=("review",),
+            require_layer4_allow=True,
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    """
+    Shape of a synthetic envelope stream:
+      - zipf_s: Zipf exponent over `jurisdictions` in listed order (0 => uniform)
+      - max_export_flags / max_sanctions_flags: flag counts are drawn uniformly from 0..max
+      - payload_bytes: body sizes, one drawn uniformly per envelope
+      - deny_ratio: when set, exactly this share (in expectation) is denied by default_policy():
+        those envelopes carry an SDN flag and all others are drawn from values it allows
+    """
+
+    jurisdictions: Tuple[str, ...] = JURISDICTIONS
+    zipf_s: float = 0.0
+    residency_classes: Tuple[str, ...] = RESIDENCY_CLASSES
+    max_export_flags: int = 2
+    max_sanctions_flags: int = 1
+    payload_bytes: Tuple[int, ...] = (64,)
+    deny_ratio: Optional[float] = None
+
+
+def _cum_weights(n: int, s: float) -> list[float]:
+    return list(itertools.accumulate(1.0 / (k**s) for k in range(1, n + 1)))
+
+
+def generate_envelopes(
+    n: int, *, seed: int = 0, config: SyntheticConfig = SyntheticConfig()
+) -> Iterator[ArtifactEnvelope]:
+    """Seeded stream of envelopes; the same (n, seed, config) always yields the same stream."""
+    rng = random.Random(seed)
+    cfg = config
+    jurisdictions, residency = cfg.jurisdictions, cfg.residency_classes
+    export_flags, sanctions_flags = EXPORT_FLAGS, SANCTIONS_FLAGS
+    if cfg.deny_ratio is not None:
+        # pools default_policy() passes, so only the injected SDN flag denies
+        jurisdictions = tuple(j for j in jurisdictions if j in JURISDICTIONS[:6]) or JURISDICTIONS[:1]
+        residency = tuple(r for r in residency if r in RESIDENCY_CLASSES[:3]) or RESIDENCY_CLASSES[:1]
+        export_flags = ("EAR99", "3A001")
+        sanctions_flags = ("none",)
+    weights = _cum_weights(len(jurisdictions), cfg.zipf_s)
+    bodies = {size: "x" * size for size in cfg.payload_bytes}
+
+    for i in range(n):
+        exports = tuple(rng.sample(export_flags, min(len(export_flags), rng.randint(0, cfg.max_export_flags))))
+        sanctions = tuple(
+            rng.sample(sanctions_flags, min(len(sanctions_flags), rng.randint(0, cfg.max_sanctions_flags)))
+        )
+        if cfg.deny_ratio is not None and rng.random() < cfg.deny_ratio:
+            sanctions += ("SDN",)
+        yield ArtifactEnvelope(
+            artifact_id=f"syn-{seed}-{i}",
+            artifact_type="intel",
+            producer_layer="layer3",
+            payload={"seq": i, "body": bodies[rng.choice(cfg.payload_bytes)]},
+            jurisdiction_tags=JurisdictionTags(
+                jurisdiction=rng.choices(jurisdictions, cum_weights=weights)[0],
+                residency_class=rng.choice(residency),
+                export_control_flags=exports,
+                sanctions_flags=sanctions,
+            ),
+        )
@@ -5,8 +5,10 @@ from .action import (
     enforce_delivery_action,
     evaluate_delivery_action,
 )
+from .compiled import CompiledDeliveryPolicy
 
 __all__ = [
+    "CompiledDeliveryPolicy",
     "DeliveryAction",
     "DeliveryDecision",
     "DeliveryPolicy",
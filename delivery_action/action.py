@@ -2,11 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Iterable, Tuple, Union, overload
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Tuple, Union, overload
 
 from contracts.schemas import ArtifactEnvelope
 from sovereignty_compliance import GateDecision as Layer4Decision
 
+if TYPE_CHECKING:
+    from sovereignty_compliance import FlagTable
+
+    from .compiled import CompiledDeliveryPolicy
+
 
 def _norm_set(values: Iterable[str]) -> frozenset[str]:
     out: list[str] = []
@@ -55,6 +60,15 @@ class DeliveryPolicy:
             require_layer4_allow=bool(require_layer4_allow),
         )
 
+    def compile(self, table: Optional["FlagTable"] = None) -> "CompiledDeliveryPolicy":
+        """
+        Intern the flag vocabulary into bit positions so evaluation is mask ANDs.
+        Without a table the result is cached per policy value.
+        """
+        from .compiled import compile_delivery_policy
+
+        return compile_delivery_policy(self, table)
+
 
 @dataclass(frozen=True)
 class DeliveryDecision:
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from contracts.schemas import ArtifactEnvelope
+from sovereignty_compliance import FlagTable, GateDecision as Layer4Decision, TagMasks
+from sovereignty_compliance.compiled import hashable_policy, hit_reasons, reason_bits
+
+from .action import DeliveryAction, DeliveryDecision, DeliveryPolicy
+
+_DELIVER = DeliveryDecision(allow=True, action=DeliveryAction.DELIVER, reasons=())
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledDeliveryPolicy:
+    table: FlagTable
+    require_layer4_allow: bool
+    blocked_export_mask: int
+    blocked_sanctions_mask: int
+    quarantine_export_mask: int
+    quarantine_sanctions_mask: int
+    blocked_export_reasons: Tuple[Tuple[int, str], ...]
+    blocked_sanctions_reasons: Tuple[Tuple[int, str], ...]
+    quarantine_export_reasons: Tuple[Tuple[int, str], ...]
+    quarantine_sanctions_reasons: Tuple[Tuple[int, str], ...]
+
+    def evaluate_masks(self, m: TagMasks, layer4_decision: Optional[Layer4Decision] = None) -> DeliveryDecision:
+        if layer4_decision is not None and self.require_layer4_allow and layer4_decision.deny:
+            reasons = tuple(sorted({f"layer4:{r}" for r in layer4_decision.reasons}))
+            return DeliveryDecision(allow=False, action=DeliveryAction.BLOCK, reasons=reasons)
+
+        export_block = m.export_mask & self.blocked_export_mask
+        sanctions_block = m.sanctions_mask & self.blocked_sanctions_mask
+        if export_block or sanctions_block:
+            block_reasons: list[str] = []
+            hit_reasons(export_block, self.blocked_export_reasons, block_reasons)
+            hit_reasons(sanctions_block, self.blocked_sanctions_reasons, block_reasons)
+            return DeliveryDecision(allow=False, action=DeliveryAction.BLOCK, reasons=tuple(sorted(set(block_reasons))))
+
+        export_q = m.export_mask & self.quarantine_export_mask
+        sanctions_q = m.sanctions_mask & self.quarantine_sanctions_mask
+        if export_q or sanctions_q:
+            quarantine_reasons: list[str] = []
+            hit_reasons(export_q, self.quarantine_export_reasons, quarantine_reasons)
+            hit_reasons(sanctions_q, self.quarantine_sanctions_reasons, quarantine_reasons)
+            return DeliveryDecision(
+                allow=True, action=DeliveryAction.QUARANTINE, reasons=tuple(sorted(set(quarantine_reasons)))
+            )
+
+        return _DELIVER
+
+    def evaluate(self, envelope: ArtifactEnvelope, layer4_decision: Optional[Layer4Decision] = None) -> DeliveryDecision:
+        """Mirrors evaluate_delivery_action: chaining only applies when a Layer 4 decision is given."""
+        return self.evaluate_masks(self.table.tag_masks(envelope.jurisdiction_tags), layer4_decision)
+
+    def enforce(self, envelope: ArtifactEnvelope, layer4_decision: Optional[Layer4Decision] = None) -> DeliveryDecision:
+        decision = self.evaluate(envelope, layer4_decision)
+        if decision.deny:
+            raise PermissionError("Layer5 delivery denied: " + ";".join(decision.reasons))
+        return decision
+
+
+def compile_delivery_policy(policy: DeliveryPolicy, table: Optional[FlagTable] = None) -> CompiledDeliveryPolicy:
+    if table is None:
+        try:
+            return _compile_cached(policy)
+        except TypeError:
+            # unhashable field values (e.g. a set passed to the constructor)
+            return _compile_cached(hashable_policy(policy))
+
+    t = table
+    return CompiledDeliveryPolicy(
+        table=t,
+        require_layer4_allow=bool(policy.require_layer4_allow),
+        blocked_export_mask=t.mask(t.export_control_flags, policy.blocked_export_control_flags),
+        blocked_sanctions_mask=t.mask(t.sanctions_flags, policy.blocked_sanctions_flags),
+        quarantine_export_mask=t.mask(t.export_control_flags, policy.quarantine_export_control_flags),
+        quarantine_sanctions_mask=t.mask(t.sanctions_flags, policy.quarantine_sanctions_flags),
+        blocked_export_reasons=reason_bits(
+            t.export_control_flags, policy.blocked_export_control_flags, "export_control_blocked"
+        ),
+        blocked_sanctions_reasons=reason_bits(t.sanctions_flags, policy.blocked_sanctions_flags, "sanctions_blocked"),
+        quarantine_export_reasons=reason_bits(
+            t.export_control_flags, policy.quarantine_export_control_flags, "export_control_quarantine"
+        ),
+        quarantine_sanctions_reasons=reason_bits(
+            t.sanctions_flags, policy.quarantine_sanctions_flags, "sanctions_quarantine"
+        ),
+    )
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(policy: DeliveryPolicy) -> CompiledDeliveryPolicy:
+    return compile_delivery_policy(policy, FlagTable())
@@ -1,3 +1,24 @@
-from .pipeline import OrchestratorPolicy, OrchestratorResult, process_envelope
+from .cache import DecisionCache
+from .fused import FusedEvaluator, compile_layers, evaluate_layers, policy_fingerprint
+from .metrics import LatencyHistogram, PipelineMetrics, StageTimings, add_stage_hook, remove_stage_hook
+from .parallel import process_envelopes_parallel
+from .pipeline import EnforcementOutcome, OrchestratorPolicy, OrchestratorResult, process_envelope, process_envelopes
 
-__all__ = ["OrchestratorPolicy", "OrchestratorResult", "process_envelope"]
+__all__ = [
+    "DecisionCache",
+    "EnforcementOutcome",
+    "FusedEvaluator",
+    "LatencyHistogram",
+    "OrchestratorPolicy",
+    "OrchestratorResult",
+    "PipelineMetrics",
+    "StageTimings",
+    "add_stage_hook",
+    "compile_layers",
+    "evaluate_layers",
+    "policy_fingerprint",
+    "process_envelope",
+    "process_envelopes",
+    "process_envelopes_parallel",
+    "remove_stage_hook",
+]
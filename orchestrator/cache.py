@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
+from contracts.schemas import ArtifactEnvelope, JurisdictionTags
+from delivery_action import DeliveryDecision
+from sovereignty_compliance import GateDecision
+
+from .fused import FusedEvaluator
+
+Decisions = Tuple[GateDecision, DeliveryDecision]
+
+
+def tag_key(tags: JurisdictionTags) -> Hashable:
+    # Same normalisation the layers apply, so equivalent tag sets share one entry.
+    return (
+        str(tags.jurisdiction).strip(),
+        str(tags.residency_class).strip(),
+        frozenset(k for k in (str(s).strip() for s in tags.export_control_flags) if k),
+        frozenset(k for k in (str(s).strip() for s in tags.sanctions_flags) if k),
+    )
+
+
+class DecisionCache:
+    """
+    Size-bounded LRU of Layer 4/5 decisions keyed on (policy fingerprint, normalised
+    jurisdiction tags).
+
+    One cache can serve any number of policies at once: entries for different fingerprints
+    share the LRU and never serve each other, and entries for a retired policy simply age
+    out. Thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Tuple[str, Hashable], Decisions] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def evaluate(self, evaluator: FusedEvaluator, envelope: ArtifactEnvelope) -> Decisions:
+        key = (evaluator.fingerprint, tag_key(envelope.jurisdiction_tags))
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        decisions = evaluator.evaluate(envelope)
+
+        with self._lock:
+            self._entries[key] = decisions
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return decisions
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -3,11 +3,13 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from dataclasses import replace
+from typing import IO, Iterator
 
-from audit_log import AuditPolicy
+from audit_log import AuditPolicy, AuditWriterConfig, ChainPolicy, FsyncPolicy, RotationPolicy, open_audit_sink
 from contracts.schemas import ArtifactEnvelope, JurisdictionTags, ProvenanceRef
 from delivery_action import DeliveryPolicy
-from orchestrator import OrchestratorPolicy, process_envelope
+from orchestrator import OrchestratorPolicy, OrchestratorResult, process_envelope, process_envelopes
 from sovereignty_compliance import SovereigntyPolicy
 
 
@@ -39,6 +41,9 @@ def _build_policy(policy_raw: dict, args: argparse.Namespace) -> OrchestratorPol
     layer6 = AuditPolicy(
         include_payload=bool(layer6_raw.get("include_payload", False)),
         redact_payload_keys=tuple(layer6_raw.get("redact_payload_keys", [])),
+        redact_payload_paths=tuple(layer6_raw.get("redact_payload_paths", [])),
+        max_snapshot_bytes=layer6_raw.get("max_snapshot_bytes"),
+        payload_store=layer6_raw.get("payload_store"),
     )
 
     audit_log_path = args.audit_log if args.audit_log is not None else policy_raw.get("audit_log_path")
@@ -71,22 +76,149 @@ def _build_envelope(envelope_raw: dict) -> ArtifactEnvelope:
     )
 
 
+def _result_output(result: OrchestratorResult, enforcement_error: bool) -> dict:
+    return {
+        "layer4": {"allow": result.layer4.allow, "reasons": list(result.layer4.reasons)},
+        "layer5": {"allow": result.layer5.allow, "action": result.layer5.action.value, "reasons": list(result.layer5.reasons)},
+        "audit_written": result.audit_written,
+        "audit_reasons": list(result.audit_reasons),
+        "enforcement_error": enforcement_error,
+    }
+
+
+def _exit_code(result: OrchestratorResult, enforcement_error: bool) -> int:
+    action = result.layer5.action.value
+    if enforcement_error:
+        return 3
+    if action == "block" or not result.layer5.allow:
+        return 3
+    if action == "quarantine":
+        return 2
+    return 0
+
+
+def _run_ndjson(source: IO[str], policy: OrchestratorPolicy, args: argparse.Namespace) -> int:
+    counts = {"total": 0, "deliver": 0, "quarantine": 0, "block": 0, "errors": 0, "enforcement_errors": 0}
+    out = sys.stdout
+
+    def envelopes() -> Iterator[ArtifactEnvelope]:
+        # process_envelopes pulls lazily, so an error line written here still lands in input order.
+        for line_no, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+                if not isinstance(raw, dict):
+                    raise ValueError("envelope must be a JSON object")
+                envelope = _build_envelope(raw)
+            except (ValueError, AttributeError, TypeError) as exc:
+                counts["total"] += 1
+                counts["errors"] += 1
+                out.write(json.dumps({"line": line_no, "error": str(exc)}, sort_keys=True) + "\n")
+                continue
+            yield envelope
+
+    worst = 0
+    resolution_s = args.audit_clock_ms / 1000.0 if args.audit_clock_ms else None
+    for result in process_envelopes(
+        envelopes(), policy, raise_on_deny=False, audit_clock_resolution_s=resolution_s
+    ):
+        enforcement_error = result.enforcement_error
+        counts["total"] += 1
+        counts[result.layer5.action.value] += 1
+        counts["enforcement_errors"] += int(enforcement_error)
+        worst = max(worst, _exit_code(result, enforcement_error))
+        out.write(json.dumps(_result_output(result, enforcement_error), sort_keys=True) + "\n")
+
+    if counts["errors"]:
+        worst = 3
+    out.flush()
+    print(json.dumps({"summary": counts}, sort_keys=True), file=sys.stderr)
+    return worst
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--policy", required=True)
     parser.add_argument("--envelope")
+    parser.add_argument(
+        "--envelopes-ndjson",
+        metavar="PATH",
+        help="stream one envelope per line from PATH ('-' for stdin); prints one result per line",
+    )
     parser.add_argument("--audit-log")
     parser.add_argument("--enforce-layer4", action="store_true")
     parser.add_argument("--enforce-layer5", action="store_true")
+    parser.add_argument("--audit-fsync", choices=[p.value for p in FsyncPolicy], default=FsyncPolicy.NONE.value)
+    parser.add_argument("--audit-rotate-bytes", type=int, help="seal the audit log into a segment at this size")
+    parser.add_argument("--audit-rotate-interval", type=float, metavar="SECONDS", help="seal the audit log at this age")
+    parser.add_argument("--audit-compression", choices=["gzip", "lzma"], help="compress sealed audit segments")
+    parser.add_argument("--audit-index", action="store_true", help="maintain the artifact_id/ts_utc sidecar index")
+    parser.add_argument(
+        "--audit-rollups", action="store_true", help="keep per-minute action/jurisdiction/reason counters"
+    )
+    parser.add_argument("--audit-chain", action="store_true", help="hash-chain audit lines into a .chain sidecar")
+    parser.add_argument("--audit-chain-key-file", metavar="PATH", help="HMAC key for --audit-chain (raw bytes)")
+    parser.add_argument(
+        "--audit-clock-ms",
+        type=float,
+        help="with --envelopes-ndjson, share ts_utc across audit events within this many milliseconds",
+    )
+    parser.add_argument(
+        "--audit-sink",
+        choices=["jsonl", "sqlite"],
+        help="audit storage (default: jsonl, or sqlite for a 'sqlite:' audit path)",
+    )
     args = parser.parse_args(argv)
+    if args.envelope and args.envelopes_ndjson:
+        parser.error("--envelope and --envelopes-ndjson are mutually exclusive")
 
     policy_raw = _load_json(args.policy)
-    envelope_raw = _load_json(args.envelope)
-
     policy = _build_policy(policy_raw, args)
+
+    rotation = None
+    if args.audit_rotate_bytes or args.audit_rotate_interval:
+        rotation = RotationPolicy(
+            max_bytes=args.audit_rotate_bytes,
+            interval_s=args.audit_rotate_interval,
+            compression=args.audit_compression,
+        )
+    chain = None
+    if args.audit_chain or args.audit_chain_key_file:
+        key = None
+        if args.audit_chain_key_file:
+            with open(args.audit_chain_key_file, "rb") as f:
+                key = f.read()
+        chain = ChainPolicy(key=key)
+    try:
+        writer = open_audit_sink(
+            policy.audit_log_path,
+            AuditWriterConfig(
+                fsync=FsyncPolicy(args.audit_fsync),
+                rotation=rotation,
+                index=args.audit_index,
+                chain=chain,
+                rollups=args.audit_rollups,
+            ),
+            kind=args.audit_sink,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    policy = replace(policy, audit_writer=writer)
+
+    if args.envelopes_ndjson:
+        try:
+            if args.envelopes_ndjson == "-":
+                return _run_ndjson(sys.stdin, policy, args)
+            with open(args.envelopes_ndjson, "r", encoding="utf-8") as source:
+                return _run_ndjson(source, policy, args)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    envelope_raw = _load_json(args.envelope)
     envelope = _build_envelope(envelope_raw)
 
-    enforcement_error = False
     try:
         result = process_envelope(
             envelope=envelope,
@@ -94,34 +226,14 @@ def main(argv: list[str] | None = None) -> int:
             audit_log_path=args.audit_log,
             enforce_layer4=args.enforce_layer4,
             enforce_layer5=args.enforce_layer5,
+            raise_on_deny=False,
         )
-    except PermissionError:
-        enforcement_error = True
-        result = process_envelope(
-            envelope=envelope,
-            policy=policy,
-            audit_log_path=args.audit_log,
-            enforce_layer4=False,
-            enforce_layer5=False,
-        )
-
-    output = {
-        "layer4": {"allow": result.layer4.allow, "reasons": list(result.layer4.reasons)},
-        "layer5": {"allow": result.layer5.allow, "action": result.layer5.action.value, "reasons": list(result.layer5.reasons)},
-        "audit_written": result.audit_written,
-        "audit_reasons": list(result.audit_reasons),
-        "enforcement_error": enforcement_error,
-    }
-    print(json.dumps(output, sort_keys=True))
+    finally:
+        if writer is not None:
+            writer.close()
 
-    action = result.layer5.action.value
-    if enforcement_error:
-        return 3
-    if action == "block" or not result.layer5.allow:
-        return 3
-    if action == "quarantine":
-        return 2
-    return 0
+    print(json.dumps(_result_output(result, result.enforcement_error), sort_keys=True))
+    return _exit_code(result, result.enforcement_error)
 
 
 if __name__ == "__main__":
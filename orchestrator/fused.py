@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Tuple
+
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import CompiledDeliveryPolicy, DeliveryDecision, DeliveryPolicy
+from sovereignty_compliance import CompiledSovereigntyPolicy, FlagTable, GateDecision, SovereigntyPolicy
+from sovereignty_compliance.compiled import hashable_policy
+
+
+@dataclass(frozen=True, eq=False)
+class FusedEvaluator:
+    """
+    Single-pass Layer 4 + Layer 5 evaluator.
+
+    Both layers are compiled against one FlagTable, so the envelope's jurisdiction tags are
+    stripped, de-duplicated and masked once and the same TagMasks feed both decisions,
+    including the optional require_layer4_allow chaining.
+    """
+
+    table: FlagTable
+    layer4: CompiledSovereigntyPolicy
+    layer5: CompiledDeliveryPolicy
+    # Stable content hash of the decision-relevant policy (Layer 4 + Layer 5).
+    fingerprint: str
+
+    def evaluate(self, envelope: ArtifactEnvelope) -> Tuple[GateDecision, DeliveryDecision]:
+        masks = self.table.tag_masks(envelope.jurisdiction_tags)
+        layer4 = self.layer4.evaluate_masks(masks)
+        layer5 = self.layer5.evaluate_masks(masks, layer4 if self.layer5.require_layer4_allow else None)
+        return layer4, layer5
+
+
+def _policy_document(policy: Any) -> dict[str, Any]:
+    doc: dict[str, Any] = {}
+    for f in fields(policy):
+        value = getattr(policy, f.name)
+        doc[f.name] = sorted((str(v) for v in value)) if isinstance(value, (frozenset, set)) else value
+    return doc
+
+
+def policy_fingerprint(layer4: SovereigntyPolicy, layer5: DeliveryPolicy) -> str:
+    doc = {"layer4": _policy_document(layer4), "layer5": _policy_document(layer5)}
+    canonical = json.dumps(doc, sort_keys=True, separators=(",", ":"))
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _compile_layers_cached(layer4: SovereigntyPolicy, layer5: DeliveryPolicy) -> FusedEvaluator:
+    table = FlagTable()
+    return FusedEvaluator(
+        table=table,
+        layer4=layer4.compile(table),
+        layer5=layer5.compile(table),
+        fingerprint=policy_fingerprint(layer4, layer5),
+    )
+
+
+def compile_layers(layer4: SovereigntyPolicy, layer5: DeliveryPolicy) -> FusedEvaluator:
+    try:
+        return _compile_layers_cached(layer4, layer5)
+    except TypeError:
+        # unhashable field values (e.g. a set passed to the constructor)
+        return _compile_layers_cached(hashable_policy(layer4), hashable_policy(layer5))
+
+
+def evaluate_layers(
+    envelope: ArtifactEnvelope,
+    layer4: SovereigntyPolicy,
+    layer5: DeliveryPolicy,
+) -> Tuple[GateDecision, DeliveryDecision]:
+    return compile_layers(layer4, layer5).evaluate(envelope)
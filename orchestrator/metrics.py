@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+# Pipeline stages timed per envelope. Layers 4 and 5 run as one fused evaluation
+# (see orchestrator.fused), so they share the "evaluate" stage.
+STAGES = ("evaluate", "audit_build", "audit_write", "total")
+
+# Upper bounds in seconds, 5µs .. 1s; anything slower lands in +Inf.
+DEFAULT_BUCKETS_S: Tuple[float, ...] = (
+    0.000005,
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+
+class StageTimings(NamedTuple):
+    """Seconds spent per stage for one envelope; audit stages are 0.0 when nothing was audited."""
+
+    evaluate_s: float
+    audit_build_s: float
+    audit_write_s: float
+    total_s: float
+    action: str
+    audited: bool
+
+
+StageHook = Callable[[StageTimings], None]
+
+_hooks: Tuple[StageHook, ...] = ()
+_hooks_lock = threading.Lock()
+
+
+def add_stage_hook(hook: StageHook) -> None:
+    """Call hook(StageTimings) after every envelope processed in this process."""
+    global _hooks
+    with _hooks_lock:
+        if hook not in _hooks:
+            _hooks = _hooks + (hook,)
+
+
+def remove_stage_hook(hook: StageHook) -> None:
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(h for h in _hooks if h != hook)
+
+
+def stage_hooks() -> Tuple[StageHook, ...]:
+    # Copy-on-write tuple: the pipeline reads it without locking, and an empty tuple
+    # means no timers are started at all.
+    return _hooks
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cumulative on export, like a Prometheus histogram)."""
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS_S, lock: Optional[threading.Lock] = None) -> None:
+        self.bounds = tuple(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0.0
+        # histograms updated together may share one lock (see PipelineMetrics)
+        self._lock = lock if lock is not None else threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._observe_locked(seconds)
+
+    def _observe_locked(self, seconds: float) -> None:
+        self._counts[bisect_left(self.bounds, seconds)] += 1
+        self._sum += seconds
+
+    def snapshot(self) -> Tuple[Tuple[int, ...], float]:
+        with self._lock:
+            return tuple(self._counts), self._sum
+
+    @property
+    def count(self) -> int:
+        return sum(self.snapshot()[0])
+
+
+def _labels(labels: Iterable[Tuple[str, str]]) -> str:
+    parts = []
+    for name, value in labels:
+        escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{escaped}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render_histogram(
+    name: str, series: Sequence[Tuple[Sequence[Tuple[str, str]], LatencyHistogram]], help_text: str
+) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, hist in series:
+        counts, total = hist.snapshot()
+        cumulative = 0
+        for bound, n in zip(hist.bounds + (float("inf"),), counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else _fmt(bound)
+            lines.append(f"{name}_bucket{_labels(tuple(labels) + (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {_fmt(total)}")
+        lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return lines
+
+
+class PipelineMetrics:
+    """
+    Stage hook that aggregates StageTimings into one LatencyHistogram per stage and
+    counters by Layer 5 action. Register with add_stage_hook(metrics); render() emits
+    Prometheus text exposition format.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS_S, prefix: str = "fusionintel") -> None:
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.stages = {stage: LatencyHistogram(bounds, self._lock) for stage in STAGES}
+        self.actions: Counter[str] = Counter()
+        self._evaluate, self._build, self._write, self._total = (self.stages[s] for s in STAGES)
+
+    def __call__(self, t: StageTimings) -> None:
+        # one lock round-trip per envelope
+        with self._lock:
+            self._evaluate._observe_locked(t.evaluate_s)
+            if t.audited:
+                self._build._observe_locked(t.audit_build_s)
+                self._write._observe_locked(t.audit_write_s)
+            self._total._observe_locked(t.total_s)
+            self.actions[t.action] += 1
+
+    def render(self) -> list[str]:
+        p = self.prefix
+        lines = render_histogram(
+            f"{p}_pipeline_stage_seconds",
+            [((("stage", stage),), hist) for stage, hist in self.stages.items()],
+            "Per-envelope pipeline stage latency",
+        )
+        lines += [f"# HELP {p}_envelopes_total Envelopes processed by Layer 5 action", f"# TYPE {p}_envelopes_total counter"]
+        with self._lock:
+            actions = sorted(self.actions.items())
+        lines += [f"{p}_envelopes_total{_labels((('action', a),))} {n}" for a, n in actions]
+        return lines
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from audit_log import AuditEvent, AuditPolicy, AuditSink, AuditWriterConfig, build_audit_event, open_audit_sink
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import DeliveryDecision
+from sovereignty_compliance import GateDecision
+
+from .fused import FusedEvaluator
+from .pipeline import EnforcementOutcome, OrchestratorPolicy, OrchestratorResult, _evaluate_layers
+
+_ChunkResult = List[Tuple[GateDecision, DeliveryDecision, Optional[EnforcementOutcome], Optional[AuditEvent]]]
+
+# Per-worker state, installed once by _init_worker.
+_worker: Optional[Tuple[FusedEvaluator, AuditPolicy, bool, bool, bool, bool]] = None
+
+
+def _init_worker(
+    evaluator: FusedEvaluator,
+    layer6: AuditPolicy,
+    enforce_l4: bool,
+    enforce_l5: bool,
+    raise_on_deny: bool,
+    build_audit: bool,
+) -> None:
+    global _worker
+    _worker = (evaluator, layer6, enforce_l4, enforce_l5, raise_on_deny, build_audit)
+
+
+def _process_chunk(chunk: List[ArtifactEnvelope]) -> Tuple[_ChunkResult, Optional[PermissionError]]:
+    """Results for the chunk, or for its envelopes before an enforced denial plus that denial."""
+    assert _worker is not None, "worker not initialised"
+    evaluator, layer6, enforce_l4, enforce_l5, raise_on_deny, build_audit = _worker
+    out: _ChunkResult = []
+    for envelope in chunk:
+        try:
+            layer4, layer5, enforcement = _evaluate_layers(
+                envelope, evaluator, enforce_l4, enforce_l5, None, raise_on_deny
+            )
+        except PermissionError as exc:
+            # the parent still audits and yields what came before, as the serial path does
+            return out, exc
+        event = build_audit_event(envelope, layer4, layer5, layer6) if build_audit else None
+        out.append((layer4, layer5, enforcement, event))
+    return out, None
+
+
+def process_envelopes_parallel(
+    envelopes: Iterable[ArtifactEnvelope],
+    policy: OrchestratorPolicy,
+    audit_log_path: Optional[str] = None,
+    enforce_layer4: Optional[bool] = None,
+    enforce_layer5: Optional[bool] = None,
+    audit_writer: Optional[AuditSink] = None,
+    raise_on_deny: bool = True,
+    workers: Optional[int] = None,
+    chunk_size: int = 512,
+    max_inflight_chunks: Optional[int] = None,
+) -> Iterator[OrchestratorResult]:
+    """
+    Process-pool form of process_envelopes for large CPU-bound batches.
+
+    The compiled FusedEvaluator and audit policy are shipped to each worker once through
+    the pool initializer; envelopes then travel in chunks of chunk_size. Results are
+    yielded in input order. Workers build the AuditEvents but never touch the log: the
+    parent writes them through a single AuditSink, so JSONL lines never interleave.
+    At most max_inflight_chunks (default 2 x workers) chunks are pending at once, which
+    bounds memory for arbitrarily long inputs. The decision cache is not used here.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    n_workers = workers or os.cpu_count() or 1
+    max_inflight = max_inflight_chunks or 2 * n_workers
+
+    eff_writer = audit_writer if audit_writer is not None else policy.audit_writer
+    eff_audit = audit_log_path if audit_log_path is not None else policy.audit_log_path
+    eff_enforce_l4 = policy.enforce_layer4 if enforce_layer4 is None else bool(enforce_layer4)
+    eff_enforce_l5 = policy.enforce_layer5 if enforce_layer5 is None else bool(enforce_layer5)
+
+    owned_writer: Optional[AuditSink] = None
+    if eff_writer is None and eff_audit:
+        owned_writer = open_audit_sink(eff_audit, AuditWriterConfig(max_batch_events=chunk_size))
+        eff_writer = owned_writer
+
+    audit_reasons: Tuple[str, ...] = ("audit_written",) if eff_writer is not None else ()
+    evaluator = policy.compiled()
+    initargs = (evaluator, policy.layer6, eff_enforce_l4, eff_enforce_l5, raise_on_deny, eff_writer is not None)
+
+    it = iter(envelopes)
+    pending: deque[Future[Tuple[_ChunkResult, Optional[PermissionError]]]] = deque()
+    executor = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=initargs)
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_inflight:
+                chunk = list(islice(it, chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending.append(executor.submit(_process_chunk, chunk))
+            if not pending:
+                break
+
+            results, denial = pending.popleft().result()
+            for layer4, layer5, enforcement, event in results:
+                if eff_writer is not None and event is not None:
+                    eff_writer.write(event)
+                yield OrchestratorResult(
+                    layer4=layer4,
+                    layer5=layer5,
+                    audit_written=eff_writer is not None,
+                    audit_reasons=audit_reasons,
+                    enforcement=enforcement,
+                )
+            if denial is not None:
+                raise denial
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if owned_writer is not None:
+            owned_writer.close()
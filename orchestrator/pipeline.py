@@ -1,12 +1,27 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from time import perf_counter
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Tuple
 
-from audit_log import AuditPolicy, build_audit_event, write_audit_event
+from audit_log import (
+    AuditPolicy,
+    AuditSink,
+    AuditWriterConfig,
+    CoarseClock,
+    build_audit_event,
+    open_audit_sink,
+    write_audit_event,
+)
 from contracts.schemas import ArtifactEnvelope
-from delivery_action import DeliveryDecision, DeliveryPolicy, enforce_delivery_action, evaluate_delivery_action
-from sovereignty_compliance import GateDecision, SovereigntyPolicy, enforce_sovereignty_gate, evaluate_sovereignty
+from delivery_action import DeliveryDecision, DeliveryPolicy
+from sovereignty_compliance import GateDecision, SovereigntyPolicy
+
+from .fused import FusedEvaluator, compile_layers
+from .metrics import StageHook, StageTimings, stage_hooks
+
+if TYPE_CHECKING:
+    from .cache import DecisionCache
 
 
 @dataclass(frozen=True)
@@ -17,6 +32,41 @@ class OrchestratorPolicy:
     audit_log_path: Optional[str] = None
     enforce_layer4: bool = False
     enforce_layer5: bool = False
+    # Optional shared memo of Layer 4/5 decisions; see orchestrator.cache.
+    decision_cache: Optional["DecisionCache"] = None
+    # Optional precompiled compile_layers(layer4, layer5), pinned by long-lived holders such as
+    # the API policy registry so the hot path never goes through the shared compile LRU.
+    evaluator: Optional[FusedEvaluator] = None
+    # Shared persistent sink (AuditWriter or SqliteAuditSink); takes precedence over audit_log_path.
+    audit_writer: Optional[AuditSink] = None
+
+    def compiled(self) -> FusedEvaluator:
+        return self.evaluator if self.evaluator is not None else compile_layers(self.layer4, self.layer5)
+
+    def fingerprint(self) -> str:
+        """Stable hash of the decision-relevant parts (Layer 4 + Layer 5) of this policy."""
+        return self.compiled().fingerprint
+
+
+@dataclass(frozen=True)
+class EnforcementOutcome:
+    """
+    Which enforced layer denied the envelope.
+      - layer: "layer4" or "layer5"
+      - short_circuited: True when Layer 4 tripped while Layer 5 enforcement was also on.
+        Layer 5 was still evaluated (the fused pass computes both decisions; see
+        OrchestratorResult.layer5), but its enforcement was not reported: only the Layer 4
+        denial is raised or returned here
+    """
+
+    layer: str
+    reasons: Tuple[str, ...] = ()
+    short_circuited: bool = False
+
+    def message(self) -> str:
+        if self.layer == "layer4":
+            return "Layer4 gate denied: " + ";".join(self.reasons)
+        return "Layer5 delivery denied: " + ";".join(self.reasons)
 
 
 @dataclass(frozen=True)
@@ -25,6 +75,66 @@ class OrchestratorResult:
     layer5: DeliveryDecision
     audit_written: bool
     audit_reasons: Tuple[str, ...] = ()
+    # Set only when an enforced layer denied and raise_on_deny was False.
+    enforcement: Optional[EnforcementOutcome] = None
+
+    @property
+    def enforcement_error(self) -> bool:
+        return self.enforcement is not None
+
+
+def _evaluate_layers(
+    envelope: ArtifactEnvelope,
+    evaluator: FusedEvaluator,
+    enforce_l4: bool,
+    enforce_l5: bool,
+    cache: Optional["DecisionCache"] = None,
+    raise_on_deny: bool = True,
+) -> Tuple[GateDecision, DeliveryDecision, Optional[EnforcementOutcome]]:
+    if cache is not None:
+        layer4, layer5 = cache.evaluate(evaluator, envelope)
+    else:
+        layer4, layer5 = evaluator.evaluate(envelope)
+
+    outcome: Optional[EnforcementOutcome] = None
+    if enforce_l4 and layer4.deny:
+        outcome = EnforcementOutcome(layer="layer4", reasons=layer4.reasons, short_circuited=enforce_l5)
+    elif enforce_l5 and layer5.deny:
+        outcome = EnforcementOutcome(layer="layer5", reasons=layer5.reasons)
+
+    if outcome is not None and raise_on_deny:
+        raise PermissionError(outcome.message())
+    return layer4, layer5, outcome
+
+
+def _dispatch(hooks: Tuple[StageHook, ...], timings: StageTimings) -> None:
+    for hook in hooks:
+        hook(timings)
+
+
+def _evaluate_timed(
+    hooks: Tuple[StageHook, ...],
+    envelope: ArtifactEnvelope,
+    evaluator: FusedEvaluator,
+    enforce_l4: bool,
+    enforce_l5: bool,
+    cache: Optional["DecisionCache"],
+    raise_on_deny: bool,
+    writer: Optional[AuditSink],
+    layer6: AuditPolicy,
+    clock: Optional[CoarseClock],
+) -> Tuple[GateDecision, DeliveryDecision, Optional[EnforcementOutcome]]:
+    # process_envelopes' per-envelope body with stage timers, used only while hooks are registered
+    t0 = perf_counter()
+    layer4, layer5, enforcement = _evaluate_layers(envelope, evaluator, enforce_l4, enforce_l5, cache, raise_on_deny)
+    t1 = t2 = t3 = perf_counter()
+    if writer is not None:
+        ev = build_audit_event(envelope, layer4, layer5, layer6, clock)
+        t2 = perf_counter()
+        writer.write(ev)
+        t3 = perf_counter()
+    _dispatch(hooks, StageTimings(t1 - t0, t2 - t1, t3 - t2, t3 - t0, layer5.action.value, writer is not None))
+    return layer4, layer5, enforcement
 
 
 def process_envelope(
@@ -33,43 +143,130 @@ def process_envelope(
     audit_log_path: Optional[str] = None,
     enforce_layer4: Optional[bool] = None,
     enforce_layer5: Optional[bool] = None,
+    audit_writer: Optional[AuditSink] = None,
+    decision_cache: Optional["DecisionCache"] = None,
+    raise_on_deny: bool = True,
 ) -> OrchestratorResult:
+    """
+    Run Layers 4-6 for one envelope.
+
+    With enforcement on, a denying layer raises PermissionError before anything is audited.
+    With raise_on_deny=False the envelope is still audited once and the result carries an
+    EnforcementOutcome instead, so callers need only one pass per envelope.
+    """
+    eff_writer = audit_writer if audit_writer is not None else policy.audit_writer
+    eff_cache = decision_cache if decision_cache is not None else policy.decision_cache
     eff_audit = audit_log_path if audit_log_path is not None else policy.audit_log_path
     eff_enforce_l4 = policy.enforce_layer4 if enforce_layer4 is None else bool(enforce_layer4)
     eff_enforce_l5 = policy.enforce_layer5 if enforce_layer5 is None else bool(enforce_layer5)
 
-    # Layer 4
-    if eff_enforce_l4:
-        layer4 = enforce_sovereignty_gate(envelope, policy.layer4)
-    else:
-        layer4 = evaluate_sovereignty(envelope, policy.layer4)
-
-    # Layer 5 (supports optional chaining)
-    if policy.layer5.require_layer4_allow:
-        layer5 = (
-            enforce_delivery_action(envelope, layer4, policy.layer5)
-            if eff_enforce_l5
-            else evaluate_delivery_action(envelope, layer4, policy.layer5)
-        )
-    else:
-        layer5 = (
-            enforce_delivery_action(envelope, policy.layer5)
-            if eff_enforce_l5
-            else evaluate_delivery_action(envelope, policy.layer5)
-        )
+    hooks = stage_hooks()
+    t0 = perf_counter() if hooks else 0.0
+
+    evaluator = policy.compiled()
+    layer4, layer5, enforcement = _evaluate_layers(
+        envelope, evaluator, eff_enforce_l4, eff_enforce_l5, eff_cache, raise_on_deny
+    )
+    t1 = t2 = t3 = perf_counter() if hooks else 0.0
 
     # Layer 6 audit
     audit_written = False
     audit_reasons: list[str] = []
-    if eff_audit:
+    if eff_writer is not None or eff_audit:
         ev = build_audit_event(envelope, layer4, layer5, policy.layer6)
-        write_audit_event(eff_audit, ev)
+        if hooks:
+            t2 = perf_counter()
+        if eff_writer is not None:
+            eff_writer.write(ev)
+        else:
+            write_audit_event(eff_audit, ev)
+        if hooks:
+            t3 = perf_counter()
         audit_written = True
         audit_reasons.append("audit_written")
 
+    if hooks:
+        _dispatch(hooks, StageTimings(t1 - t0, t2 - t1, t3 - t2, t3 - t0, layer5.action.value, audit_written))
+
     return OrchestratorResult(
         layer4=layer4,
         layer5=layer5,
         audit_written=audit_written,
         audit_reasons=tuple(audit_reasons),
+        enforcement=enforcement,
     )
+
+
+def process_envelopes(
+    envelopes: Iterable[ArtifactEnvelope],
+    policy: OrchestratorPolicy,
+    audit_log_path: Optional[str] = None,
+    enforce_layer4: Optional[bool] = None,
+    enforce_layer5: Optional[bool] = None,
+    audit_writer: Optional[AuditSink] = None,
+    audit_batch_size: int = 256,
+    decision_cache: Optional["DecisionCache"] = None,
+    raise_on_deny: bool = True,
+    audit_clock_resolution_s: Optional[float] = None,
+) -> Iterator[OrchestratorResult]:
+    """
+    Streaming batch form of process_envelope.
+
+    Resolves the effective audit target, enforcement flags and fused evaluator once, then yields one
+    OrchestratorResult per input envelope as it is consumed. Audit lines go through a
+    single AuditSink in group commits of audit_batch_size; if no writer is supplied one
+    is opened for the audit path (a "sqlite:" path selects the SQLite sink) and closed
+    when the generator finishes. Memory stays bounded by one audit batch regardless of
+    input length. raise_on_deny behaves as in process_envelope; leave it False to keep
+    streaming past enforced denials. audit_clock_resolution_s switches ts_utc to a
+    CoarseClock of that resolution, so events written within the same tick share one
+    formatted timestamp.
+    """
+    eff_writer = audit_writer if audit_writer is not None else policy.audit_writer
+    eff_audit = audit_log_path if audit_log_path is not None else policy.audit_log_path
+    eff_enforce_l4 = policy.enforce_layer4 if enforce_layer4 is None else bool(enforce_layer4)
+    eff_enforce_l5 = policy.enforce_layer5 if enforce_layer5 is None else bool(enforce_layer5)
+    eff_cache = decision_cache if decision_cache is not None else policy.decision_cache
+
+    owned_writer: Optional[AuditSink] = None
+    if eff_writer is None and eff_audit:
+        owned_writer = open_audit_sink(eff_audit, AuditWriterConfig(max_batch_events=audit_batch_size))
+        eff_writer = owned_writer
+
+    audit_reasons: Tuple[str, ...] = ("audit_written",) if eff_writer is not None else ()
+    layer6 = policy.layer6
+    clock = CoarseClock(audit_clock_resolution_s) if audit_clock_resolution_s else None
+    evaluator = policy.compiled()
+
+    try:
+        for envelope in envelopes:
+            hooks = stage_hooks()
+            if hooks:
+                layer4, layer5, enforcement = _evaluate_timed(
+                    hooks,
+                    envelope,
+                    evaluator,
+                    eff_enforce_l4,
+                    eff_enforce_l5,
+                    eff_cache,
+                    raise_on_deny,
+                    eff_writer,
+                    layer6,
+                    clock,
+                )
+            else:
+                layer4, layer5, enforcement = _evaluate_layers(
+                    envelope, evaluator, eff_enforce_l4, eff_enforce_l5, eff_cache, raise_on_deny
+                )
+                if eff_writer is not None:
+                    eff_writer.write(build_audit_event(envelope, layer4, layer5, layer6, clock))
+            yield OrchestratorResult(
+                layer4=layer4,
+                layer5=layer5,
+                audit_written=eff_writer is not None,
+                audit_reasons=audit_reasons,
+                enforcement=enforcement,
+            )
+    finally:
+        if owned_writer is not None:
+            owned_writer.close()
@@ -34,7 +34,7 @@ LEGACY_PYTHON_PREFIXES = (
     "api/",
 )
 
-ALLOWED_PYTHON = re.compile(r"^(fusionintel_core/.+\.py|scripts/[^/]+\.py|tests/.+\.py)$")
+ALLOWED_PYTHON = re.compile(r"^(fusionintel_core/.+\.py|scripts/[^/]+\.py|tests/.+\.py|benchmarks/[^/]+\.py)$")
 
 # YAML files that are valid outside .github/workflows
 YAML_ALLOWLIST = {
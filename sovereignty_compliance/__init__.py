@@ -1,3 +1,12 @@
+from .compiled import CompiledSovereigntyPolicy, FlagTable, TagMasks
 from .policy import GateDecision, SovereigntyPolicy, enforce_sovereignty_gate, evaluate_sovereignty
 
-__all__ = ["GateDecision", "SovereigntyPolicy", "evaluate_sovereignty", "enforce_sovereignty_gate"]
+__all__ = [
+    "CompiledSovereigntyPolicy",
+    "FlagTable",
+    "GateDecision",
+    "SovereigntyPolicy",
+    "TagMasks",
+    "evaluate_sovereignty",
+    "enforce_sovereignty_gate",
+]
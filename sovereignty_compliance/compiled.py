@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields, replace
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Tuple
+
+from contracts.schemas import ArtifactEnvelope, JurisdictionTags
+
+from .policy import GateDecision, SovereigntyPolicy
+
+
+def _intern(bits: dict[str, int], value: str) -> int:
+    bit = bits.get(value)
+    if bit is None:
+        bit = 1 << len(bits)
+        bits[value] = bit
+    return bit
+
+
+@dataclass(eq=False)
+class FlagTable:
+    """
+    Interns policy vocabulary (jurisdictions, residency classes, export/sanctions flags) into
+    integer bit positions, one namespace each. Compiled policies sharing a table produce
+    compatible tag masks, so an envelope only needs to be normalised once for all of them.
+    Bits are only ever added, so masks computed for earlier compiled policies stay valid.
+    """
+
+    jurisdictions: dict[str, int] = field(default_factory=dict)
+    residency_classes: dict[str, int] = field(default_factory=dict)
+    export_control_flags: dict[str, int] = field(default_factory=dict)
+    sanctions_flags: dict[str, int] = field(default_factory=dict)
+
+    def mask(self, bits: dict[str, int], values: Iterable[str]) -> int:
+        m = 0
+        for v in values:
+            m |= _intern(bits, v)
+        return m
+
+    def tag_masks(self, tags: JurisdictionTags) -> "TagMasks":
+        jurisdiction = str(tags.jurisdiction).strip()
+        residency_class = str(tags.residency_class).strip()
+
+        export_bits = self.export_control_flags
+        export_mask = 0
+        for s in tags.export_control_flags:
+            k = str(s).strip()
+            bit = export_bits.get(k) if k else None
+            if bit:
+                export_mask |= bit
+
+        sanctions_bits = self.sanctions_flags
+        sanctions_mask = 0
+        for s in tags.sanctions_flags:
+            k = str(s).strip()
+            bit = sanctions_bits.get(k) if k else None
+            if bit:
+                sanctions_mask |= bit
+
+        return TagMasks(
+            jurisdiction=jurisdiction,
+            residency_class=residency_class,
+            jurisdiction_bit=self.jurisdictions.get(jurisdiction, 0),
+            residency_class_bit=self.residency_classes.get(residency_class, 0),
+            export_mask=export_mask,
+            sanctions_mask=sanctions_mask,
+        )
+
+
+@dataclass(frozen=True)
+class TagMasks:
+    jurisdiction: str
+    residency_class: str
+    jurisdiction_bit: int
+    residency_class_bit: int
+    export_mask: int
+    sanctions_mask: int
+
+
+def reason_bits(bits: dict[str, int], flags: Iterable[str], prefix: str) -> Tuple[Tuple[int, str], ...]:
+    # (bit, reason) pairs; reason strings are only pulled out when the bit hits.
+    return tuple((bits[f], f"{prefix}:{f}") for f in flags)
+
+
+def hit_reasons(mask: int, pairs: Tuple[Tuple[int, str], ...], out: list[str]) -> None:
+    for bit, reason in pairs:
+        if mask & bit:
+            out.append(reason)
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledSovereigntyPolicy:
+    table: FlagTable
+    check_jurisdiction: bool
+    allowed_jurisdiction_mask: int
+    check_residency_class: bool
+    allowed_residency_class_mask: int
+    blocked_export_mask: int
+    blocked_sanctions_mask: int
+    export_reasons: Tuple[Tuple[int, str], ...]
+    sanctions_reasons: Tuple[Tuple[int, str], ...]
+
+    def evaluate_masks(self, m: TagMasks) -> GateDecision:
+        reasons: list[str] = []
+        if self.check_jurisdiction and not (m.jurisdiction_bit & self.allowed_jurisdiction_mask):
+            reasons.append(f"jurisdiction_not_allowed:{m.jurisdiction}")
+        if self.check_residency_class and not (m.residency_class_bit & self.allowed_residency_class_mask):
+            reasons.append(f"residency_class_not_allowed:{m.residency_class}")
+
+        export_hits = m.export_mask & self.blocked_export_mask
+        if export_hits:
+            hit_reasons(export_hits, self.export_reasons, reasons)
+        sanctions_hits = m.sanctions_mask & self.blocked_sanctions_mask
+        if sanctions_hits:
+            hit_reasons(sanctions_hits, self.sanctions_reasons, reasons)
+
+        if not reasons:
+            return GateDecision(allow=True, reasons=())
+        return GateDecision(allow=False, reasons=tuple(sorted(set(reasons))))
+
+    def evaluate(self, envelope: ArtifactEnvelope) -> GateDecision:
+        return self.evaluate_masks(self.table.tag_masks(envelope.jurisdiction_tags))
+
+    def enforce(self, envelope: ArtifactEnvelope) -> GateDecision:
+        decision = self.evaluate(envelope)
+        if decision.deny:
+            raise PermissionError("Layer4 gate denied: " + ";".join(decision.reasons))
+        return decision
+
+
+def compile_sovereignty_policy(policy: SovereigntyPolicy, table: Optional[FlagTable] = None) -> CompiledSovereigntyPolicy:
+    if table is None:
+        try:
+            return _compile_cached(policy)
+        except TypeError:
+            # unhashable field values (e.g. a set passed to the constructor)
+            return _compile_cached(hashable_policy(policy))
+
+    t = table
+    return CompiledSovereigntyPolicy(
+        table=t,
+        check_jurisdiction=bool(policy.allowed_jurisdictions),
+        allowed_jurisdiction_mask=t.mask(t.jurisdictions, policy.allowed_jurisdictions),
+        check_residency_class=bool(policy.allowed_residency_classes),
+        allowed_residency_class_mask=t.mask(t.residency_classes, policy.allowed_residency_classes),
+        blocked_export_mask=t.mask(t.export_control_flags, policy.blocked_export_control_flags),
+        blocked_sanctions_mask=t.mask(t.sanctions_flags, policy.blocked_sanctions_flags),
+        export_reasons=reason_bits(t.export_control_flags, policy.blocked_export_control_flags, "export_control_blocked"),
+        sanctions_reasons=reason_bits(t.sanctions_flags, policy.blocked_sanctions_flags, "sanctions_blocked"),
+    )
+
+
+def hashable_policy(policy: Any) -> Any:
+    # Policies built directly (not via from_iterables) may hold sets or lists; freeze them so
+    # the policy can key the compile cache. Membership semantics are unchanged.
+    changes = {
+        f.name: frozenset(getattr(policy, f.name))
+        for f in fields(policy)
+        if isinstance(getattr(policy, f.name), (set, list, tuple))
+    }
+    return replace(policy, **changes) if changes else policy
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(policy: SovereigntyPolicy) -> CompiledSovereigntyPolicy:
+    return compile_sovereignty_policy(policy, FlagTable())
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Tuple
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
 
 from contracts.schemas import ArtifactEnvelope
 
+if TYPE_CHECKING:
+    from .compiled import CompiledSovereigntyPolicy, FlagTable
+
 
 def _norm_set(values: Iterable[str]) -> frozenset[str]:
     out: list[str] = []
@@ -52,6 +55,16 @@ class SovereigntyPolicy:
             blocked_sanctions_flags=_norm_set(blocked_sanctions_flags),
         )
 
+    def compile(self, table: Optional["FlagTable"] = None) -> "CompiledSovereigntyPolicy":
+        """
+        Intern the policy vocabulary into bit positions so evaluation is mask ANDs.
+        Without a table the result is cached per policy value; pass a shared FlagTable to
+        compile several policies against one tag normalisation.
+        """
+        from .compiled import compile_sovereignty_policy
+
+        return compile_sovereignty_policy(self, table)
+
 
 @dataclass(frozen=True)
 class GateDecision:
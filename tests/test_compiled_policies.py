@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from contracts.schemas import ArtifactEnvelope, JurisdictionTags
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from orchestrator import evaluate_layers
+from sovereignty_compliance import FlagTable, SovereigntyPolicy, evaluate_sovereignty
+
+JURISDICTIONS = ("US", "ZA", "CN", "DE", " US ", "", "RU")
+RESIDENCY = ("restricted", "public", "foreign", "", " public")
+EXPORT = ("ITAR", "EAR99", "NLR", " ITAR", "5A002", "")
+SANCTIONS = ("SDN", "review", "none", "SDN ", "OFAC", "")
+
+
+def _pick(rng: random.Random, pool: tuple[str, ...], k: int) -> tuple[str, ...]:
+    return tuple(rng.choice(pool) for _ in range(rng.randint(0, k)))
+
+
+def _random_sovereignty(rng: random.Random) -> SovereigntyPolicy:
+    if rng.random() < 0.3:
+        # direct construction skips normalisation, so blank and padded entries survive
+        return SovereigntyPolicy(
+            allowed_jurisdictions=frozenset(_pick(rng, JURISDICTIONS, 3)),
+            blocked_export_control_flags=frozenset(_pick(rng, EXPORT, 3)),
+        )
+    return SovereigntyPolicy.from_iterables(
+        allowed_jurisdictions=_pick(rng, JURISDICTIONS, 3),
+        allowed_residency_classes=_pick(rng, RESIDENCY, 2),
+        blocked_export_control_flags=_pick(rng, EXPORT, 3),
+        blocked_sanctions_flags=_pick(rng, SANCTIONS, 3),
+    )
+
+
+def _random_delivery(rng: random.Random) -> DeliveryPolicy:
+    if rng.random() < 0.3:
+        return DeliveryPolicy(
+            blocked_sanctions_flags=frozenset(_pick(rng, SANCTIONS, 2)),
+            quarantine_export_control_flags=frozenset(_pick(rng, EXPORT, 3)),
+            require_layer4_allow=True,
+        )
+    return DeliveryPolicy.from_iterables(
+        blocked_export_control_flags=_pick(rng, EXPORT, 2),
+        blocked_sanctions_flags=_pick(rng, SANCTIONS, 2),
+        quarantine_export_control_flags=_pick(rng, EXPORT, 3),
+        quarantine_sanctions_flags=_pick(rng, SANCTIONS, 3),
+        require_layer4_allow=rng.random() < 0.5,
+    )
+
+
+def _random_envelope(rng: random.Random) -> ArtifactEnvelope:
+    return ArtifactEnvelope(
+        jurisdiction_tags=JurisdictionTags(
+            jurisdiction=rng.choice(JURISDICTIONS),
+            residency_class=rng.choice(RESIDENCY),
+            export_control_flags=_pick(rng, EXPORT, 4),
+            sanctions_flags=_pick(rng, SANCTIONS, 4),
+        )
+    )
+
+
+class TestCompiledPolicies(unittest.TestCase):
+    def test_compiled_matches_reference_evaluators(self) -> None:
+        rng = random.Random(1234)
+        for _ in range(300):
+            l4 = _random_sovereignty(rng)
+            l5 = _random_delivery(rng)
+            table = FlagTable()
+            c4 = l4.compile(table)
+            c5 = l5.compile(table)
+            cached4 = l4.compile()
+            cached5 = l5.compile()
+
+            for _ in range(20):
+                env = _random_envelope(rng)
+                ref4 = evaluate_sovereignty(env, l4)
+                self.assertEqual(repr(ref4), repr(c4.evaluate(env)))
+                self.assertEqual(repr(ref4), repr(cached4.evaluate(env)))
+
+                ref5 = evaluate_delivery_action(env, l5)
+                self.assertEqual(repr(ref5), repr(c5.evaluate(env)))
+                self.assertEqual(repr(ref5), repr(cached5.evaluate(env)))
+
+                chained = evaluate_delivery_action(env, ref4, l5)
+                self.assertEqual(repr(chained), repr(c5.evaluate(env, ref4)))
+
+    def test_fused_evaluator_matches_per_layer_pipeline(self) -> None:
+        rng = random.Random(99)
+        for _ in range(200):
+            l4 = _random_sovereignty(rng)
+            l5 = _random_delivery(rng)
+            for _ in range(10):
+                env = _random_envelope(rng)
+                ref4 = evaluate_sovereignty(env, l4)
+                ref5 = evaluate_delivery_action(env, ref4, l5) if l5.require_layer4_allow else evaluate_delivery_action(env, l5)
+                fused4, fused5 = evaluate_layers(env, l4, l5)
+                self.assertEqual((repr(ref4), repr(ref5)), (repr(fused4), repr(fused5)))
+
+    def test_compile_is_cached_per_policy_value(self) -> None:
+        a = SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US",))
+        b = SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US",))
+        self.assertIs(a.compile(), b.compile())
+
+    def test_compile_accepts_directly_built_set_fields(self) -> None:
+        env = ArtifactEnvelope(jurisdiction_tags=JurisdictionTags(jurisdiction="CN", sanctions_flags=("SDN",)))
+        l4 = SovereigntyPolicy(allowed_jurisdictions={"US"})  # type: ignore[arg-type]
+        l5 = DeliveryPolicy(blocked_sanctions_flags=["SDN"])  # type: ignore[arg-type]
+        self.assertEqual(repr(evaluate_sovereignty(env, l4)), repr(l4.compile().evaluate(env)))
+        self.assertEqual(repr(evaluate_delivery_action(env, l5)), repr(l5.compile().evaluate(env)))
+        self.assertIs(l4.compile(), SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US",)).compile())
+
+    def test_enforce_raises_like_reference(self) -> None:
+        env = ArtifactEnvelope(jurisdiction_tags=JurisdictionTags(jurisdiction="CN", sanctions_flags=("SDN",)))
+        with self.assertRaisesRegex(PermissionError, "Layer4 gate denied: jurisdiction_not_allowed:CN"):
+            SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US",)).compile().enforce(env)
+        with self.assertRaisesRegex(PermissionError, "Layer5 delivery denied: sanctions_blocked:SDN"):
+            DeliveryPolicy.from_iterables(blocked_sanctions_flags=("SDN",)).compile().enforce(env)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+from audit_log import (
+    AsyncAuditSink,
+    AuditPolicy,
+    AuditQueueFull,
+    AuditWriter,
+    AuditWriterConfig,
+    BackpressureMode,
+    build_audit_event,
+)
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+
+def _event(artifact_id: str):
+    env = ArtifactEnvelope(artifact_id=artifact_id, producer_layer="layerX")
+    l4 = evaluate_sovereignty(env, SovereigntyPolicy.from_iterables())
+    l5 = evaluate_delivery_action(env, DeliveryPolicy.from_iterables())
+    return build_audit_event(env, l4, l5, AuditPolicy(include_payload=False))
+
+
+class TestLayer6AsyncSink(unittest.IsolatedAsyncioTestCase):
+    async def test_stop_drains_queue_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            writer = AuditWriter(path, AuditWriterConfig(max_latency_s=60.0))
+            sink = AsyncAuditSink(writer, max_queue=8, max_batch=3)
+            await sink.start()
+            for i in range(20):
+                await sink.submit(_event(f"a{i}"))
+            await sink.stop()
+            writer.close()
+
+            with open(path, "r", encoding="utf-8") as f:
+                ids = [json.loads(ln)["artifact_id"] for ln in f if ln.strip()]
+            self.assertEqual([f"a{i}" for i in range(20)], ids)
+            self.assertFalse(sink.running)
+
+    async def test_reject_mode_raises_when_full(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            writer = AuditWriter(os.path.join(td, "audit.jsonl"))
+            sink = AsyncAuditSink(writer, max_queue=2, backpressure=BackpressureMode.REJECT)
+            await sink.start()
+            # the consumer cannot run until we yield, so the third put overflows
+            await sink.submit(_event("a0"))
+            await sink.submit(_event("a1"))
+            with self.assertRaises(AuditQueueFull):
+                await sink.submit(_event("a2"))
+            self.assertEqual(1, sink.rejected_events)
+            await sink.stop()
+            writer.close()
+
+    async def test_failed_batch_is_logged_and_counted(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            writer = AuditWriter(os.path.join(td, "audit.jsonl"))
+            writer.close()  # writes now raise
+            sink = AsyncAuditSink(writer, max_batch=10)
+            await sink.start()
+            with self.assertLogs("audit_log.async_sink", level="ERROR") as logs:
+                for i in range(3):
+                    await sink.submit(_event(f"a{i}"))
+                await sink.stop()
+            self.assertEqual(3, sink.failed_events)
+            self.assertIn("3 events dropped", logs.output[0])
+
+    async def test_submit_requires_running_sink(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            writer = AuditWriter(os.path.join(td, "audit.jsonl"))
+            sink = AsyncAuditSink(writer)
+            with self.assertRaises(RuntimeError):
+                await sink.submit(_event("a0"))
+            writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
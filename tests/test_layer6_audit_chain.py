@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from audit_log import (
+    AuditPolicy,
+    AuditWriter,
+    AuditWriterConfig,
+    ChainPolicy,
+    RotationPolicy,
+    build_audit_event,
+    iter_segment_paths,
+    verify_audit_chain,
+)
+from audit_log.chain import chain_path
+from audit_log.segments import SegmentManifest
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _event(artifact_id: str):
+    env = ArtifactEnvelope(artifact_id=artifact_id, producer_layer="layerX", payload={"pad": "x" * 100})
+    l4 = evaluate_sovereignty(env, SovereigntyPolicy.from_iterables())
+    l5 = evaluate_delivery_action(env, DeliveryPolicy.from_iterables())
+    return build_audit_event(env, l4, l5, AuditPolicy(include_payload=True))
+
+
+def _write(path: str, n: int, start: int = 0, compression: str | None = None, key: bytes | None = None) -> None:
+    cfg = AuditWriterConfig(
+        max_batch_events=4,
+        rotation=RotationPolicy(max_bytes=2500, compression=compression),
+        chain=ChainPolicy(checkpoint_every=6, key=key),
+    )
+    with AuditWriter(path, cfg) as writer:
+        for i in range(start, start + n):
+            writer.write(_event(f"c{i}"))
+
+
+class TestLayer6AuditChain(unittest.TestCase):
+    def test_chain_spans_segments_and_verifies_in_parallel(self) -> None:
+        for compression in ("gzip", None):
+            with self.subTest(compression=compression), tempfile.TemporaryDirectory() as td:
+                path = os.path.join(td, "audit.jsonl")
+                _write(path, 50, compression=compression, key=b"secret")
+
+                files = list(iter_segment_paths(path))
+                self.assertGreaterEqual(len(files), 4)
+                for f in files:
+                    self.assertTrue(os.path.exists(chain_path(f)))
+
+                report = verify_audit_chain(path, workers=2, key=b"secret")
+                self.assertTrue(report.ok, report.errors)
+                self.assertEqual(50, report.lines)
+                self.assertEqual(0, report.to_dict()["unchecked_lines"])
+                self.assertTrue(all(s.seal for s in report.segments[:-1]))
+                for prev, nxt in zip(report.segments, report.segments[1:]):
+                    self.assertEqual((prev.head, prev.seal), (nxt.prev, nxt.prev))
+
+                self.assertEqual(report.to_dict(), verify_audit_chain(path, workers=1, key=b"secret").to_dict())
+                self.assertFalse(verify_audit_chain(path, workers=1).ok)
+
+    def test_reopen_continues_chain_and_catches_up_unchained_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            _write(path, 10)
+            # a line that reached the file after the last checkpoint, e.g. before a crash
+            with open(path, "ab") as f:
+                f.write(b'{"artifact_id": "tail", "ts_utc": "2026-01-01T00:00:00+00:00"}\n')
+            _write(path, 10, start=10)
+            report = verify_audit_chain(path, workers=1)
+            self.assertTrue(report.ok, report.errors)
+            self.assertEqual(21, report.lines)
+
+    def test_tampering_and_reordering_are_detected(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            _write(path, 40)
+            sealed = list(iter_segment_paths(path, include_active=False))
+
+            with open(sealed[1], "rb") as f:
+                data = f.read()
+            with open(sealed[1], "wb") as f:
+                f.write(data.replace(b'"c', b'"C', 1))
+            report = verify_audit_chain(path, workers=1)
+            self.assertFalse(report.ok)
+            self.assertTrue(all(sealed[1] in e for e in report.errors), report.errors)
+            with open(sealed[1], "wb") as f:
+                f.write(data)
+            self.assertTrue(verify_audit_chain(path, workers=1).ok)
+
+            # dropping the oldest segment breaks the stitch to genesis
+            manifest = SegmentManifest(path)
+            manifest.segments = manifest.segments[1:]
+            manifest.save()
+            report = verify_audit_chain(path, workers=1)
+            self.assertEqual(1, len(report.errors))
+            self.assertIn("does not continue", report.errors[0])
+
+    def test_sidecar_ahead_of_data_refuses_to_open(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            with AuditWriter(path, AuditWriterConfig(chain=ChainPolicy())) as writer:
+                writer.write(_event("a"))
+            open(path, "wb").close()
+            with self.assertRaises(ValueError):
+                AuditWriter(path, AuditWriterConfig(chain=ChainPolicy()))
+
+    def test_verify_cli_exit_status(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            _write(path, 20)
+            cmd = [sys.executable, "-m", "audit_log.verify", path, "--workers", "2"]
+            proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+            self.assertEqual(0, proc.returncode, proc.stderr)
+            self.assertEqual(20, json.loads(proc.stdout)["lines"])
+
+            os.remove(chain_path(path))
+            proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+            self.assertEqual(1, proc.returncode)
+            self.assertFalse(json.loads(proc.stdout)["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
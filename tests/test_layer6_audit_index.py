@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from audit_log import (
+    AuditPolicy,
+    AuditWriter,
+    AuditWriterConfig,
+    RotationPolicy,
+    build_audit_event,
+    find_artifact,
+    find_time_range,
+    iter_audit_records,
+    rebuild_index,
+)
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _event(artifact_id: str, minute: int):
+    env = ArtifactEnvelope(artifact_id=artifact_id, producer_layer="layerX", payload={"pad": "x" * 64})
+    l4 = evaluate_sovereignty(env, SovereigntyPolicy.from_iterables())
+    l5 = evaluate_delivery_action(env, DeliveryPolicy.from_iterables())
+    ev = build_audit_event(env, l4, l5, AuditPolicy(include_payload=True))
+    return replace(ev, ts_utc=(T0 + timedelta(minutes=minute, seconds=7)).isoformat())
+
+
+def _ts(minute: int) -> str:
+    return (T0 + timedelta(minutes=minute)).isoformat()
+
+
+class TestLayer6AuditIndex(unittest.TestCase):
+    def _write(self, path: str, rotation: RotationPolicy | None) -> None:
+        cfg = AuditWriterConfig(max_batch_events=7, rotation=rotation, index=True)
+        with AuditWriter(path, cfg) as writer:
+            for i in range(120):
+                writer.write(_event(f"a{i % 30}", minute=i // 10))
+
+    def test_lookups_across_sealed_compressed_segments(self) -> None:
+        for compression in (None, "gzip"):
+            with self.subTest(compression=compression), tempfile.TemporaryDirectory() as td:
+                path = os.path.join(td, "audit.jsonl")
+                self._write(path, RotationPolicy(max_bytes=4000, compression=compression))
+                self.assertTrue(os.path.exists(path + ".aidx"))
+
+                hits = list(find_artifact(path, "a7"))
+                self.assertEqual(4, len(hits))
+                self.assertTrue(all(r["artifact_id"] == "a7" for r in hits))
+                self.assertEqual([], list(find_artifact(path, "missing")))
+
+                window = list(find_time_range(path, _ts(3), _ts(5)))
+                self.assertEqual(20, len(window))
+                self.assertEqual({3, 4}, {int(r["ts_utc"][14:16]) for r in window})
+
+    def test_unindexed_tail_and_rebuild(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            self._write(path, None)
+            # lines appended by a writer without indexing are still found via the tail scan
+            with AuditWriter(path) as writer:
+                writer.write(_event("late", minute=30))
+            self.assertEqual(1, len(list(find_artifact(path, "late"))))
+            self.assertEqual(1, len(list(find_time_range(path, _ts(30), _ts(31)))))
+
+            os.remove(path + ".aidx")
+            os.remove(path + ".tidx")
+            self.assertEqual(121, rebuild_index(path))
+            self.assertEqual(4, len(list(find_artifact(path, "a0"))))
+            self.assertEqual(len(list(iter_audit_records(path))), 121)
+
+    def test_reopen_catches_up_unindexed_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            with AuditWriter(path) as writer:
+                writer.write(_event("before", minute=0))
+            with AuditWriter(path, AuditWriterConfig(index=True)) as writer:
+                writer.write(_event("after", minute=1))
+            self.assertEqual(32, os.path.getsize(path + ".aidx"))
+
+    def test_active_index_is_sorted_with_a_bounded_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            with mock.patch("audit_log.index.TAIL_MIN_RECORDS", 16):
+                with AuditWriter(path, AuditWriterConfig(max_batch_events=7, index=True)) as writer:
+                    for i in range(120):
+                        writer.write(_event(f"a{i % 30}", minute=i // 10))
+                    writer.flush()
+                    # merged as it grew, so the open writer's tail stays under the threshold
+                    self.assertLess(os.path.getsize(path + ".atail"), (16 + 7) * 16)
+                    self.assertEqual(4, len(list(find_artifact(path, "a7"))))
+            self.assertEqual(0, os.path.getsize(path + ".atail"))
+            self.assertEqual(_records(path + ".aidx"), sorted(_records(path + ".aidx")))
+            self.assertEqual(120, len(_records(path + ".aidx")))
+
+            # an unsorted index from before the tail existed is still read, then sorted on reopen
+            unsorted = b"".join(struct.pack("<QQ", *r) for r in reversed(_records(path + ".aidx")))
+            with open(path + ".aidx", "wb") as f:
+                f.write(unsorted)
+            os.remove(path + ".atail")
+            self.assertEqual(4, len(list(find_artifact(path, "a7"))))
+            AuditWriter(path, AuditWriterConfig(index=True)).close()
+            self.assertEqual(_records(path + ".aidx"), sorted(_records(path + ".aidx")))
+            self.assertEqual(4, len(list(find_artifact(path, "a7"))))
+
+    def test_cli_rebuild_and_lookup(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            self._write(path, RotationPolicy(max_bytes=4000))
+            p = subprocess.run([sys.executable, "-m", "audit_log.lookup", "rebuild", path], capture_output=True, text=True)
+            self.assertEqual(0, p.returncode, p.stderr)
+            self.assertEqual(120, json.loads(p.stdout)["lines_indexed"])
+
+            p = subprocess.run(
+                [sys.executable, "-m", "audit_log.lookup", "lookup", path, "--artifact-id", "a3"],
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(0, p.returncode, p.stderr)
+            self.assertEqual(4, len(p.stdout.splitlines()))
+
+    def test_naive_bounds_are_utc_whatever_the_local_zone(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            self._write(path, RotationPolicy(max_bytes=4000))
+            env = dict(os.environ, TZ="America/New_York")
+            naive = [_ts(3)[:-len("+00:00")], _ts(5)[:-len("+00:00")]]
+            for extra in ([], ["--artifact-id", "a3"]):
+                with self.subTest(extra=extra):
+                    p = subprocess.run(
+                        [sys.executable, "-m", "audit_log.lookup", "lookup", path, "--since", naive[0]]
+                        + ["--until", naive[1], *extra],
+                        capture_output=True,
+                        text=True,
+                        env=env,
+                    )
+                    self.assertEqual(0, p.returncode, p.stderr)
+                    expected = [
+                        r
+                        for r in iter_audit_records(path)
+                        if _ts(3) <= r["ts_utc"] <= _ts(5) and (not extra or r["artifact_id"] == "a3")
+                    ]
+                    self.assertTrue(expected)
+                    self.assertEqual(len(expected), len(p.stdout.splitlines()))
+
+
+def _records(path: str) -> list[tuple[int, int]]:
+    with open(path, "rb") as f:
+        return list(struct.iter_unpack("<QQ", f.read()))
+
+
+if __name__ == "__main__":
+    unittest.main()
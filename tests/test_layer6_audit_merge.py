@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+import multiprocessing as mp
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from audit_log import (
+    AuditPolicy,
+    AuditWriter,
+    AuditWriterConfig,
+    ChainPolicy,
+    RotationPolicy,
+    build_audit_event,
+    iter_audit_records,
+    iter_segment_paths,
+    verify_audit_chain,
+    worker_log_path,
+    worker_log_paths,
+)
+from audit_log.chain import chain_head, merged_prev
+from audit_log.merge import iter_merged_lines, merge_audit_logs
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _event(artifact_id: str, ts: str | None = None):
+    env = ArtifactEnvelope(artifact_id=artifact_id, producer_layer="layerX", payload={"pad": "x" * 100})
+    l4 = evaluate_sovereignty(env, SovereigntyPolicy.from_iterables())
+    l5 = evaluate_delivery_action(env, DeliveryPolicy.from_iterables())
+    return build_audit_event(env, l4, l5, AuditPolicy(include_payload=True), clock=(lambda: ts) if ts else None)
+
+
+def _ts(second: int) -> str:
+    return f"2026-03-01T12:00:{second:02d}+00:00"
+
+
+def _write_worker(path: str, name: str, n: int) -> None:
+    with AuditWriter(path, AuditWriterConfig(max_batch_events=8, per_worker=True)) as writer:
+        for i in range(n):
+            writer.write(_event(f"{name}-{i}"))
+
+
+class TestLayer6AuditMerge(unittest.TestCase):
+    def test_per_worker_writer_appends_to_pid_file(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            with AuditWriter(path, AuditWriterConfig(per_worker=True)) as writer:
+                writer.write(_event("a"))
+                self.assertEqual(path, writer.path)
+                self.assertEqual(worker_log_path(path), writer.file_path)
+            self.assertFalse(os.path.exists(path))
+            self.assertEqual([worker_log_path(path)], worker_log_paths(path))
+            self.assertEqual(["a"], [r["artifact_id"] for r in iter_audit_records(worker_log_path(path))])
+
+    def test_merge_orders_by_ts_across_workers_and_segments(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            # worker 101 rotates, so part of its history lives in sealed (compressed) segments
+            cfg = AuditWriterConfig(max_batch_events=2, rotation=RotationPolicy(max_bytes=700, compression="gzip"))
+            with AuditWriter(worker_log_path(path, 101), cfg) as writer:
+                for s in range(0, 20, 2):
+                    writer.write(_event(f"even-{s}", _ts(s)))
+            with AuditWriter(worker_log_path(path, 7)) as writer:
+                for s in range(1, 20, 2):
+                    writer.write(_event(f"odd-{s}", _ts(s)))
+
+            self.assertEqual([worker_log_path(path, 7), worker_log_path(path, 101)], worker_log_paths(path))
+            out = os.path.join(td, "merged.jsonl")
+            stats = merge_audit_logs(path, out, remove_inputs=True)
+            self.assertEqual((2, 20, 0), (stats.sources, stats.lines, stats.untimed))
+
+            records = list(iter_audit_records(out))
+            self.assertEqual([_ts(s) for s in range(20)], [r["ts_utc"] for r in records])
+            self.assertEqual([], worker_log_paths(path))
+            self.assertEqual(["merged.jsonl"], os.listdir(td))
+
+    def test_compacting_chained_workers_rechains_the_output(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            cfg = AuditWriterConfig(
+                max_batch_events=2,
+                rotation=RotationPolicy(max_bytes=700),
+                chain=ChainPolicy(checkpoint_every=3, key=b"k"),
+            )
+            for pid, start in ((1, 0), (2, 1)):
+                with AuditWriter(worker_log_path(path, pid), cfg) as writer:
+                    for s in range(start, 20, 2):
+                        writer.write(_event(f"w{pid}-{s}", _ts(s)))
+            heads = [chain_head(worker_log_path(path, pid)) for pid in (1, 2)]
+
+            # a tampered input is not deleted
+            victim = next(iter_segment_paths(worker_log_path(path, 2)))
+            with open(victim, "rb") as f:
+                original = f.read()
+            with open(victim, "wb") as f:
+                f.write(original.replace(b"w2-", b"w9-", 1))
+            out = os.path.join(td, "merged.jsonl")
+            with self.assertRaises(ValueError):
+                merge_audit_logs(path, out, remove_inputs=True, chain_key=b"k")
+            self.assertTrue(os.path.exists(victim))
+            with open(victim, "wb") as f:
+                f.write(original)
+
+            stats = merge_audit_logs(path, out, remove_inputs=True, chain_key=b"k")
+            self.assertEqual(merged_prev(heads, b"k"), stats.chain_prev)
+            self.assertEqual(["merged.jsonl", "merged.jsonl.chain"], sorted(os.listdir(td)))
+            report = verify_audit_chain(out, workers=1, key=b"k")
+            self.assertTrue(report.ok, report.errors)
+            self.assertEqual((20, 0), (report.lines, report.to_dict()["unchecked_lines"]))
+            self.assertEqual(stats.chain_prev, report.segments[0].prev)
+
+    def test_merge_includes_base_log_and_rejects_overwriting_an_input(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            with AuditWriter(path) as writer:
+                writer.write(_event("base", _ts(5)))
+            with AuditWriter(worker_log_path(path, 1)) as writer:
+                writer.write(_event("w", _ts(3)))
+
+            ids = [json.loads(line)["artifact_id"] for line in iter_merged_lines(path)]
+            self.assertEqual(["w", "base"], ids)
+            self.assertEqual(["w"], [json.loads(line)["artifact_id"] for line in iter_merged_lines(path, False)])
+            with self.assertRaises(ValueError):
+                merge_audit_logs(path, path)
+
+    def test_concurrent_processes_write_complete_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            procs = [mp.Process(target=_write_worker, args=(path, f"p{i}", 200)) for i in range(3)]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join()
+                self.assertEqual(0, p.exitcode)
+
+            self.assertEqual(3, len(worker_log_paths(path)))
+            out = os.path.join(td, "merged.jsonl")
+            merge_audit_logs(path, out)
+            records = list(iter_audit_records(out))
+            self.assertEqual(600, len(records))
+            self.assertEqual({f"p{i}-{j}" for i in range(3) for j in range(200)}, {r["artifact_id"] for r in records})
+            ts = [r["ts_utc"] for r in records]
+            self.assertEqual(sorted(ts), ts)
+
+    def test_merge_cli_streams_to_stdout(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            for pid, s in ((1, 2), (2, 1)):
+                with AuditWriter(worker_log_path(path, pid)) as writer:
+                    writer.write(_event(f"w{pid}", _ts(s)))
+            proc = subprocess.run(
+                [sys.executable, "-m", "audit_log.merge", path],
+                cwd=REPO_ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            self.assertEqual(["w2", "w1"], [json.loads(line)["artifact_id"] for line in proc.stdout.splitlines()])
+
+            proc = subprocess.run(
+                [sys.executable, "-m", "audit_log.merge", path, "--compact"],
+                cwd=REPO_ROOT,
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(2, proc.returncode)
+
+
+if __name__ == "__main__":
+    unittest.main()
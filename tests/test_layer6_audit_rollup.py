@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+from audit_log import (
+    AuditPolicy,
+    AuditWriter,
+    AuditWriterConfig,
+    RotationPolicy,
+    build_audit_event,
+    query_rollups,
+    rebuild_rollups,
+    serialize_audit_event,
+    worker_log_path,
+)
+from audit_log.merge import merge_audit_logs
+from audit_log.rollup import load_rollups, rollup_path
+from audit_log.scan import ScanFilter, group_counts
+from contracts.schemas import ArtifactEnvelope, JurisdictionTags
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+L4 = SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US", "ZA"), allowed_residency_classes=("domestic",))
+L5 = DeliveryPolicy.from_iterables(blocked_sanctions_flags=("SDN",), quarantine_export_control_flags=("EAR99",))
+
+
+def _event(i: int):
+    env = ArtifactEnvelope(
+        artifact_id=f"a{i}",
+        jurisdiction_tags=JurisdictionTags(
+            jurisdiction=("US", "ZA", "CN")[i % 3],
+            residency_class=("domestic", "public")[i % 4 // 3],
+            export_control_flags=("EAR99",) if i % 5 == 1 else (),
+            sanctions_flags=("SDN",) if i % 7 == 2 else (),
+        ),
+    )
+    ev = build_audit_event(env, evaluate_sovereignty(env, L4), evaluate_delivery_action(env, L5), AuditPolicy())
+    # sixty events per minute, so each bucket aggregates many events
+    return replace(ev, ts_utc=(T0 + timedelta(seconds=i)).isoformat())
+
+
+GROUPINGS = (
+    ("action",),
+    ("action", "jurisdiction"),
+    ("jurisdiction", "residency_class", "action"),
+    ("reason",),
+    ("action", "reason"),
+    ("minute", "action"),
+    ("hour",),
+)
+
+
+def _groups(result) -> dict:
+    return {k: v for k, v in result.counts.items()}
+
+
+class TestLayer6AuditRollup(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._td.name, "audit.jsonl")
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def _write(self, events, **cfg) -> None:
+        config = AuditWriterConfig(max_batch_events=5, rollups=True, **cfg)
+        with AuditWriter(self.path, config) as writer:
+            for ev in events:
+                writer.write(ev)
+
+    def test_rollups_match_full_scan(self) -> None:
+        self._write(
+            [_event(i) for i in range(300)], rotation=RotationPolicy(max_bytes=6000, compression="gzip")
+        )
+        for group_by in GROUPINGS:
+            with self.subTest(group_by=group_by):
+                rolled = query_rollups(self.path, group_by)
+                self.assertEqual(_groups(group_counts(self.path, group_by)), _groups(rolled))
+                # rollup reads cost buckets, not events
+                self.assertLess(rolled.scanned, 150)
+
+        since, until = (T0 + timedelta(minutes=1)).isoformat(), (T0 + timedelta(minutes=3, seconds=-1)).isoformat()
+        flt = ScanFilter(actions=("block", "quarantine"), jurisdictions=("US", "CN"), since=since, until=until)
+        rolled = query_rollups(
+            self.path, ("action", "jurisdiction"), ("block", "quarantine"), ("US", "CN"), since, until
+        )
+        self.assertEqual(_groups(group_counts(self.path, ("action", "jurisdiction"), flt)), _groups(rolled))
+
+        # the sidecar is compacted on every seal, so it stays a handful of records
+        self.assertLess(load_rollups(self.path)[2], 10)
+
+    def test_crash_recovery_replays_from_last_checkpoint(self) -> None:
+        self._write([_event(i) for i in range(60)])
+        # lines that reached the log after the last checkpoint, and a torn sidecar append
+        with open(self.path, "a", encoding="utf-8") as f:
+            for i in range(60, 75):
+                f.write(serialize_audit_event(_event(i)) + "\n")
+        with open(rollup_path(self.path), "a", encoding="utf-8") as f:
+            f.write('{"offset": 99999, "eve')
+
+        self._write([_event(i) for i in range(75, 90)])
+        expected = group_counts(self.path, ("minute", "action", "reason"))
+        self.assertEqual(90, group_counts(self.path, ("action",)).matched)
+        self.assertEqual(_groups(expected), _groups(query_rollups(self.path, ("minute", "action", "reason"))))
+
+    def test_rebuild_and_merged_worker_rollups(self) -> None:
+        with AuditWriter(self.path) as writer:
+            for i in range(30):
+                writer.write(_event(i))
+        self.assertEqual({}, _groups(query_rollups(self.path)))
+        self.assertEqual(30, rebuild_rollups(self.path))
+        self.assertEqual(_groups(group_counts(self.path, ("action",))), _groups(query_rollups(self.path)))
+        os.remove(self.path)
+        os.remove(rollup_path(self.path))
+
+        for pid, ids in ((11, range(0, 40, 2)), (12, range(1, 40, 2))):
+            with AuditWriter(worker_log_path(self.path, pid), AuditWriterConfig(rollups=True)) as writer:
+                for i in ids:
+                    writer.write(_event(i))
+        by_worker = _groups(query_rollups(self.path, ("minute", "jurisdiction")))
+        self.assertEqual(40, sum(by_worker.values()))
+
+        out = os.path.join(self._td.name, "merged.jsonl")
+        merge_audit_logs(self.path, out, remove_inputs=True)
+        self.assertEqual(by_worker, _groups(query_rollups(out, ("minute", "jurisdiction"))))
+        self.assertEqual(_groups(group_counts(out, ("minute", "jurisdiction"))), by_worker)
+
+    def test_scan_cli_rollups(self) -> None:
+        self._write([_event(i) for i in range(30)])
+        proc = subprocess.run(
+            [sys.executable, "-m", "audit_log.scan", self.path, "--rollups", "--group-by", "action"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        doc = json.loads(proc.stdout)
+        self.assertEqual(30, sum(g["count"] for g in doc["groups"]))
+
+        proc = subprocess.run(
+            [sys.executable, "-m", "audit_log.scan", self.path, "--rollups"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(2, proc.returncode)
+
+
+if __name__ == "__main__":
+    unittest.main()
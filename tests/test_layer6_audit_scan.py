@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+from audit_log import (
+    AuditPolicy,
+    AuditWriter,
+    AuditWriterConfig,
+    RotationPolicy,
+    build_audit_event,
+    iter_audit_records,
+)
+from audit_log.scan import ScanFilter, group_counts, scan_records
+from contracts.schemas import ArtifactEnvelope, JurisdictionTags
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+L4 = SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US", "ZA"))
+L5 = DeliveryPolicy.from_iterables(blocked_sanctions_flags=("SDN",), quarantine_export_control_flags=("EAR99",))
+JURISDICTIONS = ("US", "ZA", "CN")
+FLAGS = ((), ("EAR99",), ("SDN",))
+
+
+def _event(i: int):
+    sanctions = FLAGS[i % 3] if FLAGS[i % 3] == ("SDN",) else ()
+    export = FLAGS[i % 3] if FLAGS[i % 3] == ("EAR99",) else ()
+    env = ArtifactEnvelope(
+        artifact_id=f"a{i}",
+        jurisdiction_tags=JurisdictionTags(
+            jurisdiction=JURISDICTIONS[i % 5 % 3], export_control_flags=export, sanctions_flags=sanctions
+        ),
+        # look-alike keys in the payload must not fool the byte-level pre-filter
+        payload={"jurisdiction": "CN", "layer5": {"action": "block"}} if i % 10 == 0 else {"n": i},
+    )
+    ev = build_audit_event(env, evaluate_sovereignty(env, L4), evaluate_delivery_action(env, L5), AuditPolicy())
+    return replace(ev, ts_utc=(T0 + timedelta(minutes=i)).isoformat())
+
+
+class TestLayer6AuditScan(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._td.name, "audit.jsonl")
+        cfg = AuditWriterConfig(max_batch_events=5, rotation=RotationPolicy(max_bytes=3000, compression="gzip"))
+        with AuditWriter(self.path, cfg) as writer:
+            for i in range(90):
+                writer.write(_event(i))
+        self.records = list(iter_audit_records(self.path))
+        self.assertEqual(90, len(self.records))
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def _reference(self, flt: ScanFilter) -> list[str]:
+        return [r["artifact_id"] for r in self.records if flt.matches(r)]
+
+    def test_filters_match_full_decode(self) -> None:
+        filters = [
+            ScanFilter(),
+            ScanFilter(actions=("block",)),
+            ScanFilter(jurisdictions=("CN",)),
+            ScanFilter(layer4_allow=True, actions=("quarantine", "deliver")),
+            ScanFilter(since=(T0 + timedelta(minutes=10)).isoformat(), until="2026-01-01T00:40:00"),
+        ]
+        for flt in filters:
+            with self.subTest(flt=flt):
+                stats: Counter = Counter()
+                got = [r["artifact_id"] for r in scan_records(self.path, flt, stats)]
+                self.assertEqual(self._reference(flt), got)
+                if not flt.empty:
+                    self.assertLess(stats["decoded"], stats["scanned"])
+
+        window = list(scan_records(self.path, filters[-1]))
+        self.assertEqual([f"a{i}" for i in range(10, 41)], [r["artifact_id"] for r in window])
+
+    def test_group_counts(self) -> None:
+        result = group_counts(self.path, ["action", "jurisdiction"])
+        self.assertEqual(90, result.matched)
+        expected = Counter((r["layer5"]["action"], r["jurisdiction"]) for r in self.records)
+        self.assertEqual(dict(expected), result.counts)
+
+        capped = group_counts(self.path, ["minute"], ScanFilter(actions=("block",)), max_groups=5)
+        self.assertEqual(6, len(capped.counts))
+        self.assertEqual(30, sum(capped.counts.values()))
+        self.assertEqual(25, capped.overflow)
+
+        with self.assertRaises(ValueError):
+            group_counts(self.path, ["nope"])
+
+    def test_cli(self) -> None:
+        p = subprocess.run(
+            [sys.executable, "-m", "audit_log.scan", self.path, "--layer4-allow", "false", "--group-by", "reason"],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(0, p.returncode, p.stderr)
+        out = json.loads(p.stdout)
+        self.assertEqual(18, out["matched"])
+        self.assertEqual({"reason": "layer4:jurisdiction_not_allowed:CN"}, out["groups"][0]["key"])
+
+        p = subprocess.run(
+            [sys.executable, "-m", "audit_log.scan", self.path, "--action", "block", "--count"],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(0, p.returncode, p.stderr)
+        self.assertEqual({"scanned": 90, "matched": 30}, json.loads(p.stdout))
+
+
+if __name__ == "__main__":
+    unittest.main()
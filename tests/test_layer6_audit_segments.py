@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from audit_log import (
+    AuditPolicy,
+    AuditWriter,
+    AuditWriterConfig,
+    ChainPolicy,
+    RotationPolicy,
+    build_audit_event,
+    find_artifact,
+    iter_audit_records,
+    iter_segment_paths,
+    query_rollups,
+    verify_audit_chain,
+)
+from audit_log.index import AuditIndexer
+from audit_log.segments import load_manifest
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+
+def _event(artifact_id: str):
+    env = ArtifactEnvelope(artifact_id=artifact_id, producer_layer="layerX", payload={"pad": "x" * 100})
+    l4 = evaluate_sovereignty(env, SovereigntyPolicy.from_iterables())
+    l5 = evaluate_delivery_action(env, DeliveryPolicy.from_iterables())
+    return build_audit_event(env, l4, l5, AuditPolicy(include_payload=True))
+
+
+class TestLayer6AuditSegments(unittest.TestCase):
+    def test_size_rotation_seals_compresses_and_reads_across_segments(self) -> None:
+        for compression, ext in (("gzip", ".gz"), ("lzma", ".xz"), (None, "")):
+            with self.subTest(compression=compression), tempfile.TemporaryDirectory() as td:
+                path = os.path.join(td, "audit.jsonl")
+                cfg = AuditWriterConfig(
+                    max_batch_events=4,
+                    rotation=RotationPolicy(max_bytes=2000, compression=compression),
+                )
+                with AuditWriter(path, cfg) as writer:
+                    for i in range(40):
+                        writer.write(_event(f"r{i}"))
+
+                manifest = load_manifest(path)
+                segments = manifest["segments"]
+                self.assertGreaterEqual(len(segments), 3)
+                self.assertEqual(list(range(1, len(segments) + 1)), [s["seq"] for s in segments])
+                for entry in segments:
+                    self.assertEqual(compression, entry["compression"])
+                    self.assertTrue(entry["name"].endswith(ext))
+                    self.assertTrue(os.path.exists(os.path.join(td, entry["name"])))
+                    self.assertLessEqual(entry["first_ts"], entry["last_ts"])
+
+                self.assertEqual(sum(s["lines"] for s in segments) + _count(path), 40)
+                ids = [r["artifact_id"] for r in iter_audit_records(path)]
+                self.assertEqual([f"r{i}" for i in range(40)], ids)
+
+    def test_failed_compression_is_logged_and_segment_stays_uncompressed(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            cfg = AuditWriterConfig(
+                max_batch_events=4,
+                rotation=RotationPolicy(max_bytes=2000, compression="gzip"),
+            )
+            with mock.patch("audit_log.writer.compress_segment", side_effect=OSError("disk full")):
+                with self.assertLogs("audit_log.writer", level="ERROR"):
+                    with AuditWriter(path, cfg) as writer:
+                        for i in range(20):
+                            writer.write(_event(f"c{i}"))
+
+            segments = load_manifest(path)["segments"]
+            self.assertTrue(segments)
+            for entry in segments:
+                self.assertIsNone(entry["compression"])
+                self.assertTrue(os.path.exists(os.path.join(td, entry["name"])))
+            ids = [r["artifact_id"] for r in iter_audit_records(path)]
+            self.assertEqual([f"c{i}" for i in range(20)], ids)
+
+    def test_interval_rotation_and_reopen_keeps_sequence(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            cfg = AuditWriterConfig(max_latency_s=0, rotation=RotationPolicy(interval_s=0.05))
+            with AuditWriter(path, cfg) as writer:
+                writer.write(_event("i0"))
+                time.sleep(0.1)
+                writer.write(_event("i1"))
+
+            with AuditWriter(path, AuditWriterConfig(rotation=RotationPolicy(max_bytes=1))) as writer:
+                writer.write(_event("i2"))
+
+            self.assertEqual([1, 2], [s["seq"] for s in load_manifest(path)["segments"]])
+            self.assertEqual(["i0", "i1", "i2"], [r["artifact_id"] for r in iter_audit_records(path)])
+            self.assertEqual(2, len(list(iter_segment_paths(path, include_active=False))))
+
+    def test_crash_mid_seal_is_recovered_on_reopen(self) -> None:
+        cfg = AuditWriterConfig(
+            max_batch_events=4,
+            rotation=RotationPolicy(max_bytes=2000),
+            index=True,
+            chain=ChainPolicy(checkpoint_every=3),
+            rollups=True,
+        )
+        real_replace = os.replace
+
+        def replace_fails_for(path: str):
+            def fake(src, dst):
+                if src == path:
+                    raise OSError("simulated crash before the rename")
+                return real_replace(src, dst)
+
+            return fake
+
+        for crash in ("after_rename", "before_rename"):
+            with self.subTest(crash=crash), tempfile.TemporaryDirectory() as td:
+                path = os.path.join(td, "audit.jsonl")
+                if crash == "after_rename":
+                    # the first observer's on_seal never runs, nor do the ones after it
+                    patch = mock.patch.object(AuditIndexer, "on_seal", side_effect=RuntimeError("crash"))
+                else:
+                    patch = mock.patch("audit_log.writer.os.replace", side_effect=replace_fails_for(path))
+                writer = AuditWriter(path, cfg)
+                written = 0
+                with patch, self.assertRaises((RuntimeError, OSError)):
+                    while True:
+                        written += 1  # the crashing write's group commit reached the file
+                        writer.write(_event(f"c{written - 1}"))
+
+                segments = load_manifest(path)["segments"]
+                self.assertEqual([1], [s["seq"] for s in segments])
+                self.assertTrue(segments[0]["pending"])
+
+                with AuditWriter(path, cfg) as writer:
+                    for i in range(written, written + 30):
+                        writer.write(_event(f"c{i}"))
+                    written += 30
+
+                segments = load_manifest(path)["segments"]
+                self.assertFalse(any(s.get("pending") for s in segments))
+                self.assertEqual(list(range(1, len(segments) + 1)), [s["seq"] for s in segments])
+                ids = [r["artifact_id"] for r in iter_audit_records(path)]
+                self.assertEqual([f"c{i}" for i in range(written)], ids)
+                self.assertEqual(["c0"], [r["artifact_id"] for r in find_artifact(path, "c0")])
+                report = verify_audit_chain(path, workers=1)
+                self.assertTrue(report.ok, report.errors)
+                self.assertEqual(written, report.lines)
+                self.assertEqual(written, sum(query_rollups(path).counts.values()))
+
+
+def _count(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as f:
+        return sum(1 for ln in f if ln.strip())
+
+
+if __name__ == "__main__":
+    unittest.main()
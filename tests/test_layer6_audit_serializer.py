@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import random
+import time
+import unittest
+from datetime import datetime
+
+from audit_log import AuditEvent, AuditEventSerializer, CoarseClock, build_audit_event, serialize_audit_event
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+STRINGS = ("US", "", " ZA ", 'q"uote', "back\\slash", "tab\tnew\nline", "\x00\x1f", "é", "日本", "😀", "</script>")
+
+
+def _random_payload(rng: random.Random, depth: int = 0):
+    if depth > 2 or rng.random() < 0.3:
+        return rng.choice([None, True, 1, -2.5, float("inf"), rng.choice(STRINGS), [], {}])
+    if rng.random() < 0.5:
+        return [_random_payload(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return {rng.choice(STRINGS) + str(i): _random_payload(rng, depth + 1) for i in range(rng.randint(0, 4))}
+
+
+def _random_event(rng: random.Random) -> AuditEvent:
+    payload = _random_payload(rng)
+    return AuditEvent(
+        ts_utc=datetime.now().isoformat(),
+        artifact_id=rng.choice(STRINGS) + str(rng.random()),
+        producer_layer=rng.choice(STRINGS),
+        jurisdiction=rng.choice(STRINGS),
+        residency_class=rng.choice(STRINGS),
+        layer4_allow=rng.random() < 0.5,
+        layer4_reasons=tuple(sorted({rng.choice(STRINGS) for _ in range(rng.randint(0, 3))})),
+        layer5_action=rng.choice(("deliver", "quarantine", "block")),
+        layer5_allow=rng.random() < 0.5,
+        layer5_reasons=tuple(rng.choice(STRINGS) for _ in range(rng.randint(0, 2))),
+        payload_snapshot=payload if isinstance(payload, dict) else None,
+    )
+
+
+class TestLayer6AuditSerializer(unittest.TestCase):
+    def test_byte_identical_to_reference(self) -> None:
+        rng = random.Random(7)
+        serializer = AuditEventSerializer(max_cached=8)
+        for _ in range(2000):
+            event = _random_event(rng)
+            expected = json.dumps(event.to_dict(), sort_keys=True)
+            self.assertEqual(expected, serializer.serialize(event))
+            self.assertEqual(expected, serialize_audit_event(event))
+
+    def test_non_canonical_field_types_fall_back(self) -> None:
+        base = _random_event(random.Random(1))
+        odd = [
+            base.__class__(**{**base.__dict__, "artifact_id": 42}),
+            base.__class__(**{**base.__dict__, "layer4_allow": 1}),
+            base.__class__(**{**base.__dict__, "layer5_reasons": ("ok", 3)}),
+            base.__class__(**{**base.__dict__, "payload_snapshot": {2: "int key", 1: (1, 2)}}),
+        ]
+        for event in odd:
+            self.assertEqual(json.dumps(event.to_dict(), sort_keys=True), serialize_audit_event(event))
+
+    def test_coarse_clock_shares_timestamps_within_resolution(self) -> None:
+        clock = CoarseClock(resolution_s=3600)
+        first = clock()
+        self.assertEqual(first, clock())
+        self.assertEqual(first[-6:], "+00:00")
+
+        fine = CoarseClock(resolution_s=0.001)
+        a = fine()
+        time.sleep(0.005)
+        self.assertLess(a, fine())
+
+        env = ArtifactEnvelope(artifact_id="c1")
+        l4 = evaluate_sovereignty(env, SovereigntyPolicy.from_iterables())
+        l5 = evaluate_delivery_action(env, DeliveryPolicy.from_iterables())
+        self.assertEqual(first, build_audit_event(env, l4, l5, clock=clock).ts_utc)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from audit_log import AuditPolicy, AuditWriter, AuditWriterConfig, FsyncPolicy, build_audit_event
+from contracts.schemas import ArtifactEnvelope, JurisdictionTags
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from orchestrator import OrchestratorPolicy, process_envelope
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+
+def _event(artifact_id: str = "a1"):
+    env = ArtifactEnvelope(artifact_id=artifact_id, producer_layer="layerX", payload={"x": 1})
+    l4 = evaluate_sovereignty(env, SovereigntyPolicy.from_iterables())
+    l5 = evaluate_delivery_action(env, DeliveryPolicy.from_iterables())
+    return build_audit_event(env, l4, l5, AuditPolicy(include_payload=False))
+
+
+def _read_lines(path: str) -> list[str]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [ln for ln in f.read().splitlines() if ln.strip()]
+
+
+class TestLayer6AuditWriter(unittest.TestCase):
+    def test_group_commit_on_event_count(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            cfg = AuditWriterConfig(max_batch_events=3, max_latency_s=60.0)
+            with AuditWriter(path, cfg) as writer:
+                writer.write(_event("a1"))
+                writer.write(_event("a2"))
+                self.assertEqual([], _read_lines(path))
+
+                writer.write(_event("a3"))
+                self.assertEqual(3, len(_read_lines(path)))
+
+                writer.write(_event("a4"))
+                self.assertEqual(3, len(_read_lines(path)))
+
+            lines = _read_lines(path)
+            self.assertEqual(["a1", "a2", "a3", "a4"], [json.loads(ln)["artifact_id"] for ln in lines])
+
+    def test_latency_timer_flushes_idle_buffer(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            with AuditWriter(path, AuditWriterConfig(max_batch_events=1000, max_latency_s=0.05)) as writer:
+                writer.write(_event())
+                deadline = time.monotonic() + 2.0
+                while not _read_lines(path) and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                self.assertEqual(1, len(_read_lines(path)))
+
+    def test_fsync_per_event_writes_through(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            with AuditWriter(path, AuditWriterConfig(max_latency_s=60.0, fsync=FsyncPolicy.EVENT)) as writer:
+                writer.write(_event())
+                self.assertEqual(1, len(_read_lines(path)))
+
+    def test_write_after_close_raises(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            writer = AuditWriter(os.path.join(td, "audit.jsonl"))
+            writer.close()
+            with self.assertRaises(ValueError):
+                writer.write(_event())
+
+    def test_pipeline_shares_writer_from_policy(self) -> None:
+        env = ArtifactEnvelope(
+            artifact_id="x1",
+            jurisdiction_tags=JurisdictionTags(jurisdiction="US", residency_class="restricted"),
+        )
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            with AuditWriter(path, AuditWriterConfig(max_latency_s=60.0)) as writer:
+                policy = OrchestratorPolicy(
+                    layer4=SovereigntyPolicy.from_iterables(),
+                    layer5=DeliveryPolicy.from_iterables(),
+                    audit_writer=writer,
+                )
+                for _ in range(5):
+                    self.assertTrue(process_envelope(env, policy).audit_written)
+
+            self.assertEqual(5, len(_read_lines(path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
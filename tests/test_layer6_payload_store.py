@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+
+from audit_log import (
+    AuditPolicy,
+    AuditWriter,
+    PayloadResolver,
+    SqliteAuditSink,
+    build_audit_event,
+    iter_audit_records,
+    iter_sqlite_records,
+    open_payload_store,
+    rehydrate_records,
+    serialize_audit_event,
+)
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+
+def _event(i: int, policy: AuditPolicy):
+    env = ArtifactEnvelope(artifact_id=f"p{i}", payload={"body": "x" * 200, "variant": i % 3, "secret": "s"})
+    l4 = evaluate_sovereignty(env, SovereigntyPolicy.from_iterables())
+    l5 = evaluate_delivery_action(env, DeliveryPolicy.from_iterables())
+    return build_audit_event(env, l4, l5, policy)
+
+
+def _blob_count(root: str) -> int:
+    return sum(len([f for f in files if f.endswith(".json")]) for _, _, files in os.walk(root))
+
+
+class TestLayer6PayloadStore(unittest.TestCase):
+    def test_directory_store_dedupes_and_rehydrates(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            blobs, log = os.path.join(td, "blobs"), os.path.join(td, "audit.jsonl")
+            policy = AuditPolicy(redact_payload_keys=("secret",), payload_store=blobs)
+            with AuditWriter(log) as writer:
+                for i in range(30):
+                    writer.write(_event(i, policy))
+
+            self.assertEqual(3, _blob_count(blobs))
+            records = list(iter_audit_records(log))
+            self.assertTrue(all(r["payload_snapshot"] is None for r in records))
+            self.assertTrue(all(r["payload_digest"].startswith("sha256:") for r in records))
+
+            resolver = PayloadResolver(open_payload_store(blobs), cache_size=3)
+            restored = [resolver.rehydrate(r) for r in records]
+            self.assertEqual({"body": "x" * 200, "variant": 1}, restored[1]["payload_snapshot"])
+            self.assertGreater(resolver.hits, 0)
+            self.assertEqual(
+                [r["payload_snapshot"] for r in restored],
+                [r["payload_snapshot"] for r in rehydrate_records(records, blobs)],
+            )
+            with self.assertRaises(KeyError):
+                resolver.get("sha256:" + "0" * 64)
+
+    def test_digest_lines_match_reference_serialization(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            event = _event(0, AuditPolicy(payload_store=td))
+            self.assertEqual(json.dumps(event.to_dict(), sort_keys=True), serialize_audit_event(event))
+            plain = replace(event, payload_digest=None)
+            self.assertNotIn("payload_digest", serialize_audit_event(plain))
+
+    def test_sqlite_store_and_sink(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = "sqlite:" + os.path.join(td, "blobs.db")
+            db = os.path.join(td, "audit.db")
+            policy = AuditPolicy(payload_store=store)
+            with SqliteAuditSink(db) as sink:
+                for i in range(6):
+                    sink.write(_event(i, policy))
+            records = list(iter_sqlite_records(db))
+            self.assertEqual(3, len({r["payload_digest"] for r in records}))
+            restored = list(rehydrate_records(records, store))
+            self.assertEqual(2, restored[5]["payload_snapshot"]["variant"])
+
+
+if __name__ == "__main__":
+    unittest.main()
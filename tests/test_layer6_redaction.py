@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import copy
+import json
+import unittest
+
+from audit_log import AuditPolicy, build_audit_event
+from audit_log.redaction import compile_redactor
+from contracts.schemas import ArtifactEnvelope
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+PAYLOAD = {
+    "title": "report",
+    "customer": {"name": "A", "ssn": "123", "address": {"city": "X", "zip": "1"}},
+    "contacts": [{"phone": "1", "email": "a@x"}, {"phone": "2"}, "plain"],
+    "untouched": {"big": list(range(50))},
+    "a.b": "literal dotted key",
+    "*": "literal star key",
+}
+
+
+def _snapshot(policy: AuditPolicy, payload=PAYLOAD):
+    env = ArtifactEnvelope(artifact_id="r1", payload=payload)
+    l4 = evaluate_sovereignty(env, SovereigntyPolicy.from_iterables())
+    l5 = evaluate_delivery_action(env, DeliveryPolicy.from_iterables())
+    return build_audit_event(env, l4, l5, policy).payload_snapshot
+
+
+class TestLayer6Redaction(unittest.TestCase):
+    def test_no_rules_shares_payload(self) -> None:
+        self.assertIs(PAYLOAD, _snapshot(AuditPolicy()))
+        self.assertIs(PAYLOAD, _snapshot(AuditPolicy(redact_payload_paths=("missing.path", "*.nope"))))
+
+    def test_top_level_keys_are_literal(self) -> None:
+        snap = _snapshot(AuditPolicy(redact_payload_keys=("a.b", "*", "title")))
+        self.assertEqual({"customer", "contacts", "untouched"}, set(snap))
+
+    def test_non_str_keys_match_by_str(self) -> None:
+        payload = {1: "one", "2": "two", "n": {3: "three", "k": "v"}}
+        snap = _snapshot(AuditPolicy(redact_payload_keys=("1",), redact_payload_paths=("n.3",)), payload)
+        self.assertEqual({"2": "two", "n": {"k": "v"}}, snap)
+
+    def test_nested_paths_and_wildcards_copy_only_modified_branches(self) -> None:
+        before = copy.deepcopy(PAYLOAD)
+        snap = _snapshot(AuditPolicy(redact_payload_paths=("customer.ssn", "customer.address.zip", "contacts.*.phone")))
+
+        self.assertEqual(before, PAYLOAD)
+        self.assertEqual({"name": "A", "address": {"city": "X"}}, snap["customer"])
+        self.assertEqual([{"email": "a@x"}, {}, "plain"], snap["contacts"])
+        self.assertIs(PAYLOAD["untouched"], snap["untouched"])
+        self.assertEqual(PAYLOAD["title"], snap["title"])
+
+        star = _snapshot(AuditPolicy(redact_payload_paths=("*.ssn", "*.big")))
+        self.assertNotIn("ssn", star["customer"])
+        self.assertEqual({}, star["untouched"])
+        self.assertIs(PAYLOAD["contacts"], star["contacts"])
+
+        self.assertEqual([], _snapshot(AuditPolicy(redact_payload_paths=("contacts.*",)))["contacts"])
+
+    def test_snapshot_byte_cap(self) -> None:
+        size = len(json.dumps(PAYLOAD, sort_keys=True))
+        self.assertIs(PAYLOAD, _snapshot(AuditPolicy(max_snapshot_bytes=size)))
+        self.assertEqual({"_truncated": True, "_bytes": size}, _snapshot(AuditPolicy(max_snapshot_bytes=size - 1)))
+
+    def test_redactor_is_compiled_once(self) -> None:
+        a = AuditPolicy(redact_payload_paths=("x.y",)).redactor()
+        self.assertIs(a, AuditPolicy(redact_payload_paths=("x.y",)).redactor())
+        self.assertIsNot(a, compile_redactor((), ("x.z",)))
+
+
+if __name__ == "__main__":
+    unittest.main()
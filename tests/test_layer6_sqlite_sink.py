@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from audit_log import (
+    AuditPolicy,
+    AuditWriterConfig,
+    RotationPolicy,
+    SqliteAuditSink,
+    build_audit_event,
+    iter_sqlite_records,
+    open_audit_sink,
+    write_audit_event,
+)
+from audit_log.sqlite_sink import shared_sqlite_sink
+from contracts.schemas import ArtifactEnvelope, JurisdictionTags
+from delivery_action import DeliveryPolicy, evaluate_delivery_action
+from orchestrator import OrchestratorPolicy, process_envelopes
+from sovereignty_compliance import SovereigntyPolicy, evaluate_sovereignty
+
+L4 = SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US",))
+L5 = DeliveryPolicy.from_iterables(quarantine_sanctions_flags=("review",))
+
+
+def _envelope(i: int) -> ArtifactEnvelope:
+    return ArtifactEnvelope(
+        artifact_id=f"s{i}",
+        payload={"n": i, "nested": {"k": [1, 2]}},
+        jurisdiction_tags=JurisdictionTags(
+            jurisdiction=("US", "CN")[i % 2], sanctions_flags=("review",) if i % 3 == 0 else ()
+        ),
+    )
+
+
+def _event(i: int, policy: AuditPolicy = AuditPolicy()):
+    env = _envelope(i)
+    return build_audit_event(env, evaluate_sovereignty(env, L4), evaluate_delivery_action(env, L5), policy)
+
+
+class TestLayer6SqliteSink(unittest.TestCase):
+    def test_rows_round_trip_to_audit_event_shape(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db = os.path.join(td, "audit.db")
+            events = [_event(i) for i in range(10)] + [_event(10, AuditPolicy(include_payload=False))]
+            with SqliteAuditSink(db, AuditWriterConfig(max_batch_events=4)) as sink:
+                sink.write_many(events)
+                sink.flush()
+                self.assertEqual(11, len(list(iter_sqlite_records(db))))
+
+            got = list(iter_sqlite_records(db))
+            self.assertEqual([json.loads(json.dumps(e.to_dict())) for e in events], got)
+            quarantined = list(iter_sqlite_records(db, "layer5_action = ?", ("quarantine",)))
+            self.assertEqual(["s0", "s3", "s6", "s9"], [r["artifact_id"] for r in quarantined])
+
+    def test_wal_and_indexed_columns(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db = os.path.join(td, "audit.db")
+            SqliteAuditSink(db).close()
+            conn = sqlite3.connect(db)
+            try:
+                self.assertEqual("wal", conn.execute("PRAGMA journal_mode").fetchone()[0])
+                indexed = {row[4] for row in conn.execute("SELECT * FROM sqlite_master WHERE type = 'index'")}
+            finally:
+                conn.close()
+            for column in ("artifact_id", "ts_utc", "layer5_action", "jurisdiction"):
+                self.assertTrue(any(f"({column})" in sql for sql in indexed), column)
+
+    def test_selected_by_path_prefix_and_kind(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db = os.path.join(td, "audit.db")
+            policy = OrchestratorPolicy(layer4=L4, layer5=L5, audit_log_path="sqlite:" + db)
+            results = list(process_envelopes((_envelope(i) for i in range(5)), policy))
+            self.assertTrue(all(r.audit_written for r in results))
+            write_audit_event("sqlite:" + db, _event(5))
+            self.assertIs(shared_sqlite_sink("sqlite:" + db), shared_sqlite_sink(db))
+            self.assertEqual([f"s{i}" for i in range(6)], [r["artifact_id"] for r in iter_sqlite_records(db)])
+
+            sink = open_audit_sink(db, kind="sqlite")
+            self.assertIsInstance(sink, SqliteAuditSink)
+            sink.close()
+            with self.assertRaises(ValueError):
+                SqliteAuditSink(db, AuditWriterConfig(rotation=RotationPolicy(max_bytes=10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from contracts.schemas import ArtifactEnvelope, JurisdictionTags
+from delivery_action import DeliveryPolicy
+from orchestrator import (
+    LatencyHistogram,
+    OrchestratorPolicy,
+    PipelineMetrics,
+    add_stage_hook,
+    process_envelope,
+    process_envelopes,
+    remove_stage_hook,
+)
+from sovereignty_compliance import SovereigntyPolicy
+
+POLICY = OrchestratorPolicy(
+    layer4=SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US",)),
+    layer5=DeliveryPolicy.from_iterables(blocked_sanctions_flags=("SDN",), quarantine_export_control_flags=("NLR",)),
+)
+
+
+def _env(i: int) -> ArtifactEnvelope:
+    flags = ((), ("NLR",), ())[i % 3]
+    sanctions = ("SDN",) if i % 3 == 2 else ()
+    return ArtifactEnvelope(
+        artifact_id=f"m{i}",
+        jurisdiction_tags=JurisdictionTags(jurisdiction="US", export_control_flags=flags, sanctions_flags=sanctions),
+    )
+
+
+class TestLayer7Metrics(unittest.TestCase):
+    def test_hooks_receive_stage_timings(self) -> None:
+        seen = []
+        add_stage_hook(seen.append)
+        try:
+            with tempfile.TemporaryDirectory() as td:
+                path = os.path.join(td, "audit.jsonl")
+                process_envelope(_env(0), POLICY, audit_log_path=path)
+                process_envelope(_env(1), POLICY)
+                list(process_envelopes([_env(i) for i in range(3)], POLICY, audit_log_path=path))
+        finally:
+            remove_stage_hook(seen.append)
+
+        self.assertEqual(5, len(seen))
+        self.assertEqual([True, False, True, True, True], [t.audited for t in seen])
+        self.assertEqual(["deliver", "quarantine", "deliver", "quarantine", "block"], [t.action for t in seen])
+        for t in seen:
+            self.assertGreaterEqual(t.total_s, t.evaluate_s + t.audit_build_s + t.audit_write_s - 1e-9)
+        self.assertEqual((0.0, 0.0), (seen[1].audit_build_s, seen[1].audit_write_s))
+
+        process_envelope(_env(0), POLICY)
+        self.assertEqual(5, len(seen))
+
+    def test_pipeline_metrics_render_prometheus_text(self) -> None:
+        metrics = PipelineMetrics()
+        add_stage_hook(metrics)
+        try:
+            list(process_envelopes([_env(i) for i in range(9)], POLICY))
+        finally:
+            remove_stage_hook(metrics)
+
+        self.assertEqual(9, metrics.stages["evaluate"].count)
+        self.assertEqual(0, metrics.stages["audit_write"].count)
+        text = "\n".join(metrics.render())
+        self.assertIn("# TYPE fusionintel_pipeline_stage_seconds histogram", text)
+        self.assertIn('fusionintel_pipeline_stage_seconds_bucket{stage="total",le="+Inf"} 9', text)
+        self.assertIn('fusionintel_pipeline_stage_seconds_count{stage="evaluate"} 9', text)
+        self.assertIn('fusionintel_envelopes_total{action="block"} 3', text)
+
+    def test_histogram_buckets_are_upper_bounds(self) -> None:
+        hist = LatencyHistogram((0.001, 0.01))
+        for s in (0.0005, 0.001, 0.002, 5.0):
+            hist.observe(s)
+        counts, total = hist.snapshot()
+        self.assertEqual((2, 1, 1), counts)
+        self.assertAlmostEqual(5.0035, total)
+
+
+if __name__ == "__main__":
+    unittest.main()
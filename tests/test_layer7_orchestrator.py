@@ -5,9 +5,10 @@ import os
 import tempfile
 import unittest
 
+from audit_log import AuditPolicy
 from contracts.schemas import ArtifactEnvelope, JurisdictionTags
 from delivery_action import DeliveryAction, DeliveryPolicy
-from orchestrator import OrchestratorPolicy, process_envelope
+from orchestrator import DecisionCache, OrchestratorPolicy, process_envelope, process_envelopes
 from sovereignty_compliance import SovereigntyPolicy
 
 
@@ -55,6 +56,123 @@ class TestLayer7Orchestrator(unittest.TestCase):
         self.assertEqual(DeliveryAction.BLOCK, result.layer5.action)
         self.assertEqual(("layer4:jurisdiction_not_allowed:CN",), result.layer5.reasons)
 
+    def test_process_envelopes_streams_lazily_and_batches_audit(self) -> None:
+        l4 = SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US",))
+        l5 = DeliveryPolicy.from_iterables(quarantine_export_control_flags=("NLR",))
+        consumed: list[int] = []
+
+        def source():
+            for i in range(10):
+                consumed.append(i)
+                flags = ("NLR",) if i % 2 else ()
+                yield ArtifactEnvelope(
+                    artifact_id=f"b{i}",
+                    jurisdiction_tags=JurisdictionTags(jurisdiction="US" if i < 8 else "CN", export_control_flags=flags),
+                )
+
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            policy = OrchestratorPolicy(layer4=l4, layer5=l5, audit_log_path=path)
+
+            results = process_envelopes(source(), policy, audit_batch_size=4)
+            first = next(results)
+            self.assertEqual([0], consumed)
+            self.assertEqual(DeliveryAction.DELIVER, first.layer5.action)
+
+            rest = list(results)
+            self.assertEqual(9, len(rest))
+            self.assertEqual(DeliveryAction.QUARANTINE, rest[0].layer5.action)
+            self.assertTrue(rest[-1].layer4.deny)
+
+            single = process_envelope(ArtifactEnvelope(jurisdiction_tags=JurisdictionTags(jurisdiction="CN")), policy)
+            self.assertEqual(single.layer4, rest[-1].layer4)
+
+            with open(path, "r", encoding="utf-8") as f:
+                ids = [json.loads(ln)["artifact_id"] for ln in f if ln.strip()]
+            self.assertEqual([f"b{i}" for i in range(10)] + [""], ids)
+
+    def test_decision_cache_hits_and_keys_on_policy_fingerprint(self) -> None:
+        cache = DecisionCache(maxsize=2)
+        l5 = DeliveryPolicy.from_iterables(quarantine_export_control_flags=("NLR",))
+        us_only = OrchestratorPolicy(layer4=SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US",)), layer5=l5)
+
+        def env(jurisdiction: str, *flags: str) -> ArtifactEnvelope:
+            return ArtifactEnvelope(jurisdiction_tags=JurisdictionTags(jurisdiction=jurisdiction, export_control_flags=flags))
+
+        first = process_envelope(env("US", "NLR"), us_only, decision_cache=cache)
+        again = process_envelope(env(" US", "NLR", " NLR"), us_only, decision_cache=cache)
+        self.assertIs(first.layer5, again.layer5)
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+        process_envelope(env("CN"), us_only, decision_cache=cache)
+        process_envelope(env("ZA"), us_only, decision_cache=cache)
+        self.assertEqual(1, cache.evictions)
+        self.assertEqual(2, len(cache))
+
+        za_too = OrchestratorPolicy(
+            layer4=SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US", "ZA")), layer5=l5
+        )
+        self.assertNotEqual(us_only.fingerprint(), za_too.fingerprint())
+        self.assertTrue(process_envelope(env("ZA"), za_too, decision_cache=cache).layer4.allow)
+        self.assertFalse(process_envelope(env("ZA"), us_only, decision_cache=cache).layer4.allow)
+
+        # two policies interleaved on one cache keep hitting their own entries
+        cache = DecisionCache(maxsize=8)
+        for _ in range(5):
+            for policy in (us_only, za_too):
+                process_envelope(env("ZA"), policy, decision_cache=cache)
+        self.assertEqual((8, 2), (cache.hits, cache.misses))
+        self.assertEqual(2, len(cache))
+
+    def test_non_raising_enforcement_audits_once_and_reports_layer(self) -> None:
+        env = ArtifactEnvelope(
+            artifact_id="d1",
+            jurisdiction_tags=JurisdictionTags(jurisdiction="CN", sanctions_flags=("SDN",)),
+        )
+        l4 = SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US",))
+        l5 = DeliveryPolicy.from_iterables(blocked_sanctions_flags=("SDN",))
+
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            policy = OrchestratorPolicy(layer4=l4, layer5=l5, audit_log_path=path, enforce_layer4=True, enforce_layer5=True)
+
+            with self.assertRaisesRegex(PermissionError, "Layer4 gate denied"):
+                process_envelope(env, policy)
+            self.assertFalse(os.path.exists(path))
+
+            result = process_envelope(env, policy, raise_on_deny=False)
+            self.assertTrue(result.enforcement_error)
+            assert result.enforcement is not None
+            self.assertEqual("layer4", result.enforcement.layer)
+            self.assertEqual(("jurisdiction_not_allowed:CN",), result.enforcement.reasons)
+            self.assertTrue(result.enforcement.short_circuited)
+            self.assertEqual(DeliveryAction.BLOCK, result.layer5.action)
+
+            l5_only = process_envelope(env, policy, enforce_layer4=False, raise_on_deny=False)
+            assert l5_only.enforcement is not None
+            self.assertEqual("layer5", l5_only.enforcement.layer)
+            self.assertFalse(l5_only.enforcement.short_circuited)
+
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(2, len([ln for ln in f if ln.strip()]))
+
+    def test_directly_built_policies_with_sets_are_accepted(self) -> None:
+        l4 = SovereigntyPolicy(allowed_jurisdictions={"US"})  # type: ignore[arg-type]
+        l5 = DeliveryPolicy(blocked_sanctions_flags=["SDN"])  # type: ignore[arg-type]
+        policy = OrchestratorPolicy(layer4=l4, layer5=l5)
+        us = ArtifactEnvelope(jurisdiction_tags=JurisdictionTags(jurisdiction="US"))
+        cn = ArtifactEnvelope(jurisdiction_tags=JurisdictionTags(jurisdiction="CN", sanctions_flags=("SDN",)))
+        self.assertTrue(process_envelope(us, policy).layer4.allow)
+        result = process_envelope(cn, policy, raise_on_deny=False)
+        self.assertFalse(result.layer4.allow)
+        self.assertEqual(DeliveryAction.BLOCK, result.layer5.action)
+        self.assertTrue(policy.fingerprint().startswith("sha256:"))
+
+    def test_positional_fields_keep_their_places(self) -> None:
+        l4, l5 = SovereigntyPolicy.from_iterables(), DeliveryPolicy.from_iterables()
+        policy = OrchestratorPolicy(l4, l5, AuditPolicy(), "audit.jsonl", True, True)
+        self.assertEqual((True, True, None), (policy.enforce_layer4, policy.enforce_layer5, policy.audit_writer))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+from contracts.schemas import ArtifactEnvelope, JurisdictionTags
+from delivery_action import DeliveryPolicy
+from orchestrator import OrchestratorPolicy, process_envelopes, process_envelopes_parallel
+from sovereignty_compliance import SovereigntyPolicy
+
+
+def _envelopes(n: int):
+    jurisdictions = ("US", "ZA", "CN")
+    for i in range(n):
+        yield ArtifactEnvelope(
+            artifact_id=f"p{i}",
+            jurisdiction_tags=JurisdictionTags(
+                jurisdiction=jurisdictions[i % 3],
+                export_control_flags=("NLR",) if i % 4 == 0 else (),
+                sanctions_flags=("SDN",) if i % 7 == 0 else (),
+            ),
+        )
+
+
+class TestLayer7Parallel(unittest.TestCase):
+    def test_parallel_preserves_order_and_matches_serial(self) -> None:
+        policy = OrchestratorPolicy(
+            layer4=SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US", "ZA")),
+            layer5=DeliveryPolicy.from_iterables(
+                blocked_sanctions_flags=("SDN",),
+                quarantine_export_control_flags=("NLR",),
+                require_layer4_allow=True,
+            ),
+        )
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "audit.jsonl")
+            parallel = list(
+                process_envelopes_parallel(
+                    _envelopes(250), policy, audit_log_path=path, workers=2, chunk_size=16, max_inflight_chunks=3
+                )
+            )
+            serial = list(process_envelopes(_envelopes(250), policy))
+
+            self.assertEqual([(r.layer4, r.layer5) for r in serial], [(r.layer4, r.layer5) for r in parallel])
+            self.assertTrue(all(r.audit_written for r in parallel))
+
+            with open(path, "r", encoding="utf-8") as f:
+                ids = [json.loads(ln)["artifact_id"] for ln in f if ln.strip()]
+            self.assertEqual([f"p{i}" for i in range(250)], ids)
+
+    def test_parallel_raises_enforced_denial(self) -> None:
+        policy = OrchestratorPolicy(
+            layer4=SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US",)),
+            layer5=DeliveryPolicy.from_iterables(),
+            enforce_layer4=True,
+        )
+        with self.assertRaises(PermissionError):
+            list(process_envelopes_parallel(_envelopes(10), policy, workers=2, chunk_size=4))
+
+    def test_enforced_denial_audits_same_envelopes_as_serial(self) -> None:
+        policy = OrchestratorPolicy(
+            layer4=SovereigntyPolicy.from_iterables(allowed_jurisdictions=("US", "ZA")),
+            layer5=DeliveryPolicy.from_iterables(),
+            enforce_layer4=True,
+        )
+
+        def run(path: str, parallel: bool) -> tuple[int, list[str]]:
+            yielded = 0
+            with self.assertRaises(PermissionError):
+                if parallel:
+                    results = process_envelopes_parallel(
+                        _envelopes(20), policy, audit_log_path=path, workers=2, chunk_size=4
+                    )
+                else:
+                    results = process_envelopes(_envelopes(20), policy, audit_log_path=path)
+                for _ in results:
+                    yielded += 1
+            with open(path, "r", encoding="utf-8") as f:
+                return yielded, [json.loads(ln)["artifact_id"] for ln in f if ln.strip()]
+
+        with tempfile.TemporaryDirectory() as td:
+            # p2 (CN) is denied mid-chunk; p0 and p1 come before it in the same chunk
+            serial = run(os.path.join(td, "serial.jsonl"), parallel=False)
+            parallel = run(os.path.join(td, "parallel.jsonl"), parallel=True)
+            self.assertEqual((2, ["p0", "p1"]), serial)
+            self.assertEqual(serial, parallel)
+
+
+if __name__ == "__main__":
+    unittest.main()
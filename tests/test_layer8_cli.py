@@ -124,3 +124,59 @@ def test_cli_reads_envelope_from_stdin(tmp_path: Path) -> None:
     assert completed.returncode == 0
     payload = json.loads(completed.stdout)
     assert payload["layer5"]["action"] == "deliver"
+
+
+def test_cli_ndjson_streams_results_and_exits_with_worst_action(tmp_path: Path) -> None:
+    audit_path = tmp_path / "audit.log"
+    policy = _base_policy(str(audit_path))
+    policy["layer5"]["quarantine_export_control_flags"] = ["NLR"]
+    policy_path = tmp_path / "policy.json"
+    _write_json(policy_path, policy)
+
+    deliver = _base_envelope()
+    quarantine = _base_envelope()
+    quarantine["jurisdiction_tags"]["export_control_flags"] = ["NLR"]
+    lines = [json.dumps(deliver), json.dumps(quarantine), "", json.dumps(deliver)]
+
+    cmd = [sys.executable, "-m", "orchestrator.cli", "--policy", str(policy_path), "--envelopes-ndjson", "-"]
+    completed = subprocess.run(cmd, input="\n".join(lines) + "\n", text=True, capture_output=True, check=False)
+
+    assert completed.returncode == 2
+    results = [json.loads(ln) for ln in completed.stdout.splitlines()]
+    assert [r["layer5"]["action"] for r in results] == ["deliver", "quarantine", "deliver"]
+    summary = json.loads(completed.stderr.strip().splitlines()[-1])["summary"]
+    assert summary == {"total": 3, "deliver": 2, "quarantine": 1, "block": 0, "errors": 0, "enforcement_errors": 0}
+    assert len(audit_path.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_cli_ndjson_reports_bad_lines_in_order(tmp_path: Path) -> None:
+    policy_path = tmp_path / "policy.json"
+    _write_json(policy_path, _base_policy(str(tmp_path / "audit.log")))
+    ndjson_path = tmp_path / "envelopes.ndjson"
+    ndjson_path.write_text(json.dumps(_base_envelope()) + "\n{not json\n", encoding="utf-8")
+
+    cmd = [sys.executable, "-m", "orchestrator.cli", "--policy", str(policy_path), "--envelopes-ndjson", str(ndjson_path)]
+    completed = subprocess.run(cmd, text=True, capture_output=True, check=False)
+
+    assert completed.returncode == 3
+    results = [json.loads(ln) for ln in completed.stdout.splitlines()]
+    assert results[0]["layer5"]["action"] == "deliver"
+    assert results[1]["line"] == 2 and "error" in results[1]
+
+
+def test_cli_sqlite_audit_sink(tmp_path: Path) -> None:
+    db_path = tmp_path / "audit.db"
+    policy_path = tmp_path / "policy.json"
+    envelope_path = tmp_path / "envelope.json"
+    _write_json(policy_path, _base_policy(str(db_path)))
+    _write_json(envelope_path, _base_envelope())
+
+    cmd = [sys.executable, "-m", "orchestrator.cli", "--policy", str(policy_path), "--envelope", str(envelope_path)]
+    completed = subprocess.run(cmd + ["--audit-sink", "sqlite"], text=True, capture_output=True, check=False)
+
+    assert completed.returncode == 0, completed.stderr
+    from audit_log import iter_sqlite_records
+
+    records = list(iter_sqlite_records(str(db_path)))
+    assert [r["artifact_id"] for r in records] == ["a-1"]
+    assert records[0]["layer5"]["action"] == "deliver"
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import json
 import os
 
+import pytest
 from fastapi.testclient import TestClient
 
+import api.main as main_module
 from api.main import app
+from orchestrator.fused import _compile_layers_cached
+from orchestrator.metrics import stage_hooks
 
 client = TestClient(app)
 
@@ -84,3 +89,232 @@ def test_request_id_roundtrip() -> None:
     assert r.status_code == 200
     assert r.headers.get("x-request-id") == "rid-123"
     assert r.json().get("request_id") == "rid-123"
+
+
+def test_async_audit_sink_enqueues_and_drains_on_shutdown(monkeypatch, tmp_path) -> None:
+    audit_path = tmp_path / "audit.jsonl"
+    monkeypatch.setenv("FUSIONINTEL_AUDIT_LOG_PATH", str(audit_path))
+    monkeypatch.setenv("FUSIONINTEL_AUDIT_ASYNC", "1")
+
+    body = {"policy": _base_policy(), "envelope": _base_envelope()}
+    with TestClient(app) as c:
+        for _ in range(3):
+            r = c.post("/v1/process", json=body)
+            assert r.status_code == 200
+            assert r.json()["audit_reasons"] == ["audit_enqueued"]
+        text = c.get("/metrics").text
+        assert "fusionintel_audit_failed_events_total 0" in text
+        assert "fusionintel_audit_rejected_events_total 0" in text
+
+    lines = [ln for ln in audit_path.read_text(encoding="utf-8").splitlines() if ln.strip()]
+    assert len(lines) == 3
+
+
+def test_bad_audit_writer_config_fails_startup(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("FUSIONINTEL_AUDIT_LOG_PATH", str(tmp_path / "audit.jsonl"))
+    monkeypatch.setenv("FUSIONINTEL_AUDIT_FSYNC", "sometimes")
+    with pytest.raises(ValueError):
+        with TestClient(app):
+            pass
+
+    monkeypatch.setenv("FUSIONINTEL_AUDIT_LOG_PATH", "sqlite:" + str(tmp_path / "audit.db"))
+    monkeypatch.setenv("FUSIONINTEL_AUDIT_FSYNC", "none")
+    monkeypatch.setenv("FUSIONINTEL_AUDIT_INDEX", "1")
+    with pytest.raises(ValueError, match="JSONL audit logs only"):
+        with TestClient(app):
+            pass
+    assert main_module._audit_writers == {}
+
+
+def test_policy_registry_put_then_process_by_id() -> None:
+    policy = _base_policy()
+    policy["layer5"]["require_layer4_allow"] = True
+
+    r = client.put("/v1/policies", json=policy)
+    assert r.status_code == 200
+    policy_id = r.json()["policy_id"]
+    assert policy_id.startswith("sha256:")
+
+    # same content => same id
+    assert client.put("/v1/policies", json=policy).json()["policy_id"] == policy_id
+
+    env = _base_envelope()
+    env["jurisdiction_tags"]["jurisdiction"] = "CN"
+    # the registry pins the compiled evaluator: churn in the shared compile cache is irrelevant
+    _compile_layers_cached.cache_clear()
+    r = client.post("/v1/process", json={"policy_id": policy_id, "envelope": env})
+    assert r.status_code == 200
+    assert r.json()["layer5"]["action"] == "block"
+    assert _compile_layers_cached.cache_info().misses == 0
+
+
+def test_policy_registry_rejects_invalid_and_unknown() -> None:
+    r = client.put("/v1/policies", json={"layer4": {"allowed_jurisdictions": "US"}})
+    assert r.status_code == 422
+
+    r = client.post("/v1/process", json={"policy_id": "sha256:nope", "envelope": _base_envelope()})
+    assert r.status_code == 404
+
+
+def test_enforcement_error_is_single_pass(monkeypatch, tmp_path) -> None:
+    audit_path = tmp_path / "audit.jsonl"
+    monkeypatch.setenv("FUSIONINTEL_ENFORCE_L4", "1")
+
+    env = _base_envelope()
+    env["jurisdiction_tags"]["jurisdiction"] = "CN"
+    body = {"policy": _base_policy(), "envelope": env, "options": {"audit_log_path": str(audit_path)}}
+    with TestClient(app) as c:
+        r = c.post("/v1/process", json=body)
+    assert r.status_code == 200
+    assert r.json()["enforcement_error"] is True
+    assert r.json()["layer4"]["allow"] is False
+    assert len(audit_path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_nested_payload_redaction(tmp_path) -> None:
+    audit_path = tmp_path / "audit.jsonl"
+    policy = _base_policy()
+    policy["layer6"] = {"include_payload": True, "redact_payload_paths": ["user.*.token"]}
+    env = _base_envelope()
+    env["payload"] = {"user": {"a": {"token": "t", "id": 1}}, "k": "v"}
+    body = {"policy": policy, "envelope": env, "options": {"audit_log_path": str(audit_path)}}
+    with TestClient(app) as c:
+        assert c.post("/v1/process", json=body).status_code == 200
+    snapshot = json.loads(audit_path.read_text(encoding="utf-8"))["payload_snapshot"]
+    assert snapshot == {"user": {"a": {"id": 1}}, "k": "v"}
+
+    policy["layer6"]["max_snapshot_bytes"] = -1
+    assert client.put("/v1/policies", json=policy).status_code == 422
+
+
+def test_client_audit_paths_get_no_persistent_writer(tmp_path) -> None:
+    body = {"policy": _base_policy(), "envelope": _base_envelope()}
+    for i in range(3):
+        body["options"] = {"audit_log_path": str(tmp_path / f"audit-{i}.jsonl")}
+        assert client.post("/v1/process", json=body).status_code == 200
+    assert main_module._audit_writers == {}
+    assert all(len((tmp_path / f"audit-{i}.jsonl").read_text(encoding="utf-8").splitlines()) == 1 for i in range(3))
+
+
+def test_metrics_endpoint_exposes_stage_and_request_latency() -> None:
+    with TestClient(app) as c:
+        assert main_module._pipeline_metrics in stage_hooks()
+        body = {"policy": _base_policy(), "envelope": _base_envelope()}
+        r = c.post("/v1/process", json=body, headers={"x-request-id": "m-1"})
+        assert r.status_code == 200
+        assert r.headers["x-request-id"] == "m-1"
+        assert r.headers["server-timing"].startswith("app;dur=")
+
+        m = c.get("/metrics")
+    assert main_module._pipeline_metrics not in stage_hooks()
+    assert m.status_code == 200
+    assert m.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = m.text
+    assert 'fusionintel_pipeline_stage_seconds_count{stage="evaluate"}' in text
+    assert 'fusionintel_envelopes_total{action="deliver"}' in text
+    assert 'fusionintel_http_request_seconds_count{method="POST",route="/v1/process",status="200"}' in text
+
+
+def _batch_lines(r) -> list[dict]:
+    return [json.loads(line) for line in r.text.splitlines()]
+
+
+def test_process_batch_streams_ndjson_and_isolates_bad_items() -> None:
+    policy_id = client.put("/v1/policies", json=_base_policy()).json()["policy_id"]
+    denied = _base_envelope()
+    denied["jurisdiction_tags"]["jurisdiction"] = "CN"
+    body = "\n".join(
+        [json.dumps(_base_envelope()), "{not json", json.dumps(denied), "[1]", "", json.dumps({"jurisdiction_tags": "US"})]
+    )
+    r = client.post(
+        "/v1/process:batch", params={"policy_id": policy_id}, content=body, headers={"content-type": "application/x-ndjson"}
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = _batch_lines(r)
+    assert [line["index"] for line in lines] == [0, 1, 2, 3, 4]
+    assert lines[0]["layer4"]["allow"] is True and lines[0]["layer5"]["action"] == "deliver"
+    assert lines[1]["error"].startswith("invalid JSON")
+    assert lines[2]["layer4"]["allow"] is False
+    assert lines[3]["error"] == "expected a JSON object"
+    assert lines[4]["error"].startswith("invalid envelope")
+
+
+def test_process_batch_json_array_and_request_errors(monkeypatch, tmp_path) -> None:
+    audit_path = tmp_path / "audit.jsonl"
+    policy_id = client.put("/v1/policies", json=_base_policy()).json()["policy_id"]
+    envelopes = [dict(_base_envelope(), artifact_id=f"b-{i}") for i in range(600)]
+    with TestClient(app) as c:
+        r = c.post(
+            "/v1/process:batch", params={"policy_id": policy_id, "audit_log_path": str(audit_path)}, json=envelopes
+        )
+    lines = _batch_lines(r)
+    assert [line["index"] for line in lines] == list(range(600))
+    assert all(line["audit_written"] for line in lines)
+    assert len(audit_path.read_text(encoding="utf-8").splitlines()) == 600
+
+    r = client.post("/v1/process:batch", params={"policy_id": policy_id}, content=b'[{"artifact_id": "x"}, {"a": ')
+    lines = _batch_lines(r)
+    assert [line["index"] for line in lines] == [0, 1]
+    assert lines[0]["layer4"]["allow"] is False
+    assert lines[1]["fatal"] is True and lines[1]["error"].startswith("invalid JSON array element")
+
+    assert b'"fatal":true' in r.content
+
+    assert client.post("/v1/process:batch", params={"policy_id": "sha256:nope"}, content=b"").status_code == 404
+    monkeypatch.setenv("FUSIONINTEL_API_KEY", "secret")
+    assert client.post("/v1/process:batch", params={"policy_id": policy_id}, content=b"").status_code == 401
+
+
+def test_process_batch_with_async_sink_isolates_failing_items(monkeypatch, tmp_path) -> None:
+    audit_path = tmp_path / "audit.jsonl"
+    monkeypatch.setenv("FUSIONINTEL_AUDIT_LOG_PATH", str(audit_path))
+    monkeypatch.setenv("FUSIONINTEL_AUDIT_ASYNC", "1")
+    run_pipeline = main_module._run_pipeline
+
+    def flaky(envelope, policy):
+        if envelope.artifact_id == "boom":
+            raise RuntimeError("evaluator crashed")
+        return run_pipeline(envelope, policy)
+
+    monkeypatch.setattr(main_module, "_run_pipeline", flaky)
+    envelopes = [dict(_base_envelope(), artifact_id=a) for a in ("ok-0", "boom", "ok-2")]
+    with TestClient(app) as c:
+        policy_id = c.put("/v1/policies", json=_base_policy()).json()["policy_id"]
+        r = c.post("/v1/process:batch", params={"policy_id": policy_id}, json=envelopes)
+    lines = _batch_lines(r)
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert lines[0]["audit_reasons"] == ["audit_enqueued"] and lines[2]["audit_reasons"] == ["audit_enqueued"]
+    assert lines[1] == {"index": 1, "error": "processing failed: RuntimeError"}
+    assert len(audit_path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_process_fast_matches_process_and_validates_targeted_fields() -> None:
+    for jurisdiction in ("US", "CN"):
+        env = _base_envelope()
+        env["jurisdiction_tags"]["jurisdiction"] = jurisdiction
+        env["payload"] = {"deep": [{"k": list(range(50))}] * 20}
+        body = {"policy": _base_policy(), "envelope": env}
+        slow = client.post("/v1/process", json=body, headers={"x-request-id": "r"}).json()
+        fast = client.post("/v1/process:fast", json=body, headers={"x-request-id": "r"})
+        assert fast.status_code == 200
+        assert fast.headers["content-type"] == "application/json"
+        assert fast.json() == slow
+
+    policy_id = client.put("/v1/policies", json=_base_policy()).json()["policy_id"]
+    r = client.post("/v1/process:fast", json={"policy_id": policy_id, "envelope": _base_envelope()})
+    assert r.json()["layer5"]["action"] == "deliver"
+    r = client.post("/v1/process:fast", json={"policy_id": "sha256:nope", "envelope": _base_envelope()})
+    assert r.status_code == 404
+
+    env = _base_envelope()
+    env["jurisdiction_tags"]["sanctions_flags"] = "SDN"
+    r = client.post("/v1/process:fast", json={"policy": {"layer4": []}, "envelope": env, "options": {"enforce_layer4": 1}})
+    assert r.status_code == 422
+    assert r.json()["detail"] == [
+        "policy.layer4: expected object",
+        "options.enforce_layer4: expected boolean",
+        "envelope.jurisdiction_tags.sanctions_flags: expected list of strings",
+    ]
+    assert client.post("/v1/process:fast", content=b"{nope").status_code == 422
+    assert client.post("/v1/process:fast", json=[1]).json()["detail"] == ["body: expected object"]